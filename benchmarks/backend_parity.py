@@ -0,0 +1,56 @@
+"""Label parity, latency and memory of the onnx backend vs the torch backend.
+
+Exits non-zero when any label differs or a score drifts by more than
+--tolerance, so it can gate a re-export of a real model (the test suite
+checks parity on a tiny model: tests/test_backend_parity.py).
+
+Run from the repository root after exporting:
+    python -m src.models.export_onnx --model <name> --output models/onnx
+    python -m benchmarks.backend_parity --model <name> --onnx-path models/onnx
+"""
+import argparse
+import sys
+
+from benchmarks.quantization_report import load_rss_delta, measure
+from src.config import model_config
+from src.models.evaluation import compare_models
+from src.models.sentiment_analyzer import SentimentAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Torch model name or local path")
+    parser.add_argument("--onnx-path", default=model_config.ONNX_MODEL_PATH)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    torch_analyzer, torch_rss = load_rss_delta(lambda: SentimentAnalyzer(args.model, backend="torch"))
+    onnx_analyzer, onnx_rss = load_rss_delta(lambda: SentimentAnalyzer(args.onnx_path, backend="onnx"))
+
+    parity = compare_models(torch_analyzer, onnx_analyzer)
+    rows = {
+        "torch": {**measure(torch_analyzer, args.repeats), "rss_mb": torch_rss / 1e6},
+        "onnx": {**measure(onnx_analyzer, args.repeats), "rss_mb": onnx_rss / 1e6}
+    }
+
+    print(f"{'backend':>8} {'p50 ms':>8} {'p95 ms':>8} {'texts/sec':>10} {'+RSS MB':>8}")
+    for name, row in rows.items():
+        print(
+            f"{name:>8} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+            f"{row['texts_per_sec']:>10.1f} {row['rss_mb']:>8.1f}"
+        )
+
+    print(f"\nLabel agreement: {parity['agreement']:.1%} over {parity['samples']} samples")
+    print(f"Score drift: max {parity['max_score_diff']:.2e}, mean {parity['mean_score_diff']:.2e}")
+    for item in parity["disagreements"]:
+        print(f"  {item['reference']} -> {item['candidate']}: {item['text']}")
+
+    if parity["agreement"] < 1.0 or parity["max_score_diff"] > args.tolerance:
+        print(f"FAIL: backends differ (tolerance {args.tolerance})")
+        sys.exit(1)
+    print("OK: backends agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Throughput of SentimentAnalyzer.analyze_batch against batch size.
+
+Run from the repository root:
+    python -m benchmarks.batch_throughput --texts 512 --batch-sizes 1 8 32 64
+"""
+import argparse
+import time
+from typing import Dict, List
+
+from src.config import twitter_config
+from src.models.sentiment_analyzer import SentimentAnalyzer
+
+
+def make_texts(count: int) -> List[str]:
+    """Cycle the mock tweets to build a workload of the requested size"""
+    samples = twitter_config.MOCK_TWEETS
+    return [samples[i % len(samples)] for i in range(count)]
+
+
+def run_benchmark(
+    analyzer: SentimentAnalyzer,
+    texts: List[str],
+    batch_sizes: List[int],
+    repeats: int = 3
+) -> List[Dict[str, float]]:
+    """Measure texts/sec for each batch size (best of `repeats` runs)"""
+    analyzer.analyze_batch(texts[:8])  # Warm up kernels and allocator
+
+    rows = []
+    for batch_size in batch_sizes:
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            analyzer.analyze_batch(texts, batch_size=batch_size)
+            best = min(best, time.perf_counter() - start)
+        rows.append({
+            "batch_size": batch_size,
+            "seconds": best,
+            "texts_per_sec": len(texts) / best
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Model name or local path")
+    parser.add_argument("--texts", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(args.model)
+    analyzer.cache = analyzer.persistent_cache = None  # Measure the model, not the caches
+    rows = run_benchmark(analyzer, make_texts(args.texts), args.batch_sizes, args.repeats)
+
+    baseline = rows[0]["texts_per_sec"]
+    print(f"{'batch':>6} {'seconds':>9} {'texts/sec':>10} {'speedup':>8}")
+    for row in rows:
+        print(
+            f"{row['batch_size']:>6} {row['seconds']:>9.3f} "
+            f"{row['texts_per_sec']:>10.1f} {row['texts_per_sec'] / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Padding waste and tokens/sec per length bucket in analyze_batch.
+
+Run from the repository root:
+    python -m benchmarks.bucket_padding --texts 1024 --batch-size 32
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from src.config import model_config, twitter_config
+from src.models.sentiment_analyzer import SentimentAnalyzer
+
+
+def make_texts(count: int, seed: int = 42) -> List[str]:
+    """Mock tweets cut or joined to lengths spread over 5-280 characters"""
+    rng = random.Random(seed)
+    corpus = " ".join(twitter_config.MOCK_TWEETS)
+    texts = []
+    for _ in range(count):
+        length = rng.randint(5, 280)
+        start = rng.randint(0, len(corpus) - length)
+        texts.append(corpus[start:start + length])
+    return texts
+
+
+def report(analyzer: SentimentAnalyzer, texts: List[str], batch_size: int, bucket: bool):
+    """Run one pass and print the per-bucket stats it recorded"""
+    start = time.perf_counter()
+    analyzer.analyze_batch(texts, batch_size=batch_size, bucket_by_length=bucket)
+    elapsed = time.perf_counter() - start
+
+    title = f"bucketed {model_config.BUCKET_BOUNDARIES}" if bucket else "unbucketed"
+    print(f"\n{title}: {len(texts) / elapsed:.1f} texts/sec")
+    print(f"{'bucket':>8} {'texts':>6} {'batches':>8} {'padding':>8} {'tokens/sec':>11}")
+    for stats in analyzer.last_batch_stats:
+        print(
+            f"{stats['bucket']:>8} {stats['texts']:>6} {stats['batches']:>8} "
+            f"{stats['padding_ratio']:>8.1%} {stats['tokens_per_sec']:>11.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Model name or local path")
+    parser.add_argument("--texts", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=model_config.BATCH_SIZE)
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(args.model)
+    analyzer.cache = analyzer.persistent_cache = None  # Measure the model, not the caches
+    texts = make_texts(args.texts)
+    analyzer.analyze_batch(texts[:8])  # Warm up
+
+    report(analyzer, texts, args.batch_size, bucket=False)
+    report(analyzer, texts, args.batch_size, bucket=True)
+
+
+if __name__ == "__main__":
+    main()
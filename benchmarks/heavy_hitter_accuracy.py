@@ -0,0 +1,94 @@
+"""Accuracy versus memory of Space-Saving heavy hitters against exact counts.
+
+Draws a Zipf-distributed hashtag stream, counts it exactly with a Counter
+and with Space-Saving summaries of several capacities, and reports the
+memory each holds, top-k recall, the largest count error among the top k
+and the guaranteed bound total / capacity. The merged row splits the
+stream across workers, summarizes each part and merges the summaries.
+
+Run from the repository root:
+    python -m benchmarks.heavy_hitter_accuracy --items 1000000 --capacities 100 500 1000 5000
+"""
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Tuple
+
+import numpy as np
+
+from src.analytics.heavy_hitters import SpaceSaving
+
+
+def zipf_stream(items: int, vocabulary: int, exponent: float, seed: int = 7) -> list:
+    """Hashtags whose frequency falls off as rank ** -exponent"""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, vocabulary + 1) ** exponent
+    # Shuffle so hashtag names carry no rank information
+    ranks = rng.permutation(vocabulary)[rng.choice(vocabulary, size=items, p=weights / weights.sum())]
+    return [f"#tag{rank}" for rank in ranks.tolist()]
+
+
+def measured(build: Callable[[], object]) -> Tuple[object, int, float]:
+    """Build a structure; returns it, the bytes it keeps allocated and seconds taken"""
+    # Timed without tracing, which slows allocation-heavy code unevenly
+    start = time.perf_counter()
+    build()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, seconds
+
+
+def build_summary(stream: list, capacity: int) -> SpaceSaving:
+    """One summary of the whole stream"""
+    summary = SpaceSaving(capacity)
+    summary.update(stream)
+    return summary
+
+
+def build_merged(stream: list, capacity: int, workers: int) -> SpaceSaving:
+    """Summaries of interleaved parts of the stream, merged"""
+    merged = SpaceSaving(capacity)
+    for part in range(workers):
+        merged.merge(build_summary(stream[part::workers], capacity))
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=200_000, help="Distinct hashtags")
+    parser.add_argument("--exponent", type=float, default=1.1, help="Zipf exponent")
+    parser.add_argument("--capacities", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4, help="Parts for the merged rows")
+    args = parser.parse_args()
+
+    stream = zipf_stream(args.items, args.vocabulary, args.exponent)
+    exact, exact_bytes, exact_seconds = measured(lambda: Counter(stream))
+    truth = [item for item, _ in exact.most_common(args.top_k)]
+    print(f"{args.items:,} hashtags, {len(exact):,} distinct, Zipf s={args.exponent}")
+    print(f"{'structure':<22} {'counters':>9} {'memory KB':>10} {'items/s':>10} "
+          f"{'recall@' + str(args.top_k):>10} {'max err':>8} {'bound':>8}")
+    print(f"{'Counter (exact)':<22} {len(exact):>9,} {exact_bytes / 1024:>10,.0f} "
+          f"{args.items / exact_seconds:>10,.0f} {1.0:>10.2f} {0:>8} {0:>8}")
+
+    for capacity in args.capacities:
+        for label, build in [
+            (f"SpaceSaving({capacity})", lambda: build_summary(stream, capacity)),
+            (f"  merged x{args.workers}", lambda: build_merged(stream, capacity, args.workers)),
+        ]:
+            summary, retained, seconds = measured(build)
+            reported = [item for item, _ in summary.most_common(args.top_k)]
+            recall = len(set(reported) & set(truth)) / len(truth)
+            max_error = max(summary.counts[item] - exact[item] for item in reported)
+            print(f"{label:<22} {len(summary):>9,} {retained / 1024:>10,.0f} "
+                  f"{args.items / seconds:>10,.0f} {recall:>10.2f} {max_error:>8,} "
+                  f"{summary.total // capacity:>8,}")
+
+
+if __name__ == "__main__":
+    main()
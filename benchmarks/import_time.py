@@ -0,0 +1,73 @@
+"""Cold-start seconds per module, each measured in a fresh interpreter.
+
+Also times the first prediction after import (lazy model load + warmup),
+which is the cost the lazy analyzer moves off the import path.
+
+Run from the repository root:
+    python -m benchmarks.import_time --repeats 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List, Optional
+
+MODULES = [
+    "src.config",
+    "src.models.sentiment_analyzer",
+    "src.data.twitter_client",
+    "src.api.main",
+]
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+WARMUP_SNIPPET = """
+import time
+from src.models.sentiment_analyzer import sentiment_analyzer
+start = time.perf_counter()
+sentiment_analyzer.warmup()
+print(time.perf_counter() - start)
+"""
+
+
+def time_snippet(snippet: str) -> Optional[float]:
+    """Seconds printed by a snippet run in a fresh interpreter, or None if it failed"""
+    result = subprocess.run(
+        [sys.executable, "-c", snippet],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def report(name: str, samples: List[Optional[float]]):
+    """Print min/median for one measurement"""
+    timings = [t for t in samples if t is not None]
+    if not timings:
+        print(f"{name:<34} {'failed':>9}")
+        return
+    print(f"{name:<34} {min(timings):>9.3f} {statistics.median(timings):>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", action="store_true", help="Also time the first model load")
+    args = parser.parse_args()
+
+    print(f"{'module':<34} {'min s':>9} {'median s':>9}")
+    for module in MODULES:
+        report(module, [time_snippet(IMPORT_SNIPPET.format(module=module)) for _ in range(args.repeats)])
+    if args.warmup:
+        report("sentiment_analyzer.warmup()", [time_snippet(WARMUP_SNIPPET) for _ in range(args.repeats)])
+
+
+if __name__ == "__main__":
+    main()
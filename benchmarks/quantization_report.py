@@ -0,0 +1,105 @@
+"""Accuracy parity, latency and memory of dynamic-int8 vs fp32 CPU inference.
+
+Exits non-zero when label agreement with fp32 falls below --min-agreement,
+so it can gate a change to the quantization settings.
+
+Run from the repository root:
+    python -m benchmarks.quantization_report --min-agreement 0.95
+"""
+import argparse
+import io
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+import torch
+
+from src.models.evaluation import LABELED_SAMPLES, compare_models
+from src.models.sentiment_analyzer import SentimentAnalyzer
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (Linux)"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def load_rss_delta(factory: Callable[[], SentimentAnalyzer]) -> Tuple[SentimentAnalyzer, int]:
+    """Build an analyzer and return it with the RSS it added"""
+    before = rss_bytes()
+    analyzer = factory()
+    analyzer.cache = analyzer.persistent_cache = None  # Measure the model, not the caches
+    return analyzer, rss_bytes() - before
+
+
+def measure(analyzer: SentimentAnalyzer, repeats: int) -> Dict[str, float]:
+    """Single-text latency and batched throughput on the labeled set"""
+    texts = [text for text, _ in LABELED_SAMPLES]
+    analyzer.analyze_batch(texts[:4])  # Warm up
+
+    latencies = []
+    for _ in range(repeats):
+        for text in texts:
+            start = time.perf_counter()
+            analyzer.analyze_batch([text])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        analyzer.analyze_batch(texts)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": statistics.quantiles(latencies, n=20)[-1] * 1000,
+        "texts_per_sec": len(texts) * repeats / batch_seconds
+    }
+
+
+def weights_mb(analyzer: SentimentAnalyzer) -> float:
+    """Serialized size of the torch model's state dict"""
+    buffer = io.BytesIO()
+    torch.save(analyzer.backend.model.state_dict(), buffer)
+    return buffer.tell() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Model name or local path")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    fp32, fp32_rss = load_rss_delta(lambda: SentimentAnalyzer(args.model))
+    int8, int8_rss = load_rss_delta(lambda: SentimentAnalyzer(args.model, quantize="dynamic-int8"))
+
+    parity = compare_models(fp32, int8)
+    rows = {
+        "fp32": {**measure(fp32, args.repeats), "weights_mb": weights_mb(fp32), "rss_mb": fp32_rss / 1e6},
+        "dynamic-int8": {**measure(int8, args.repeats), "weights_mb": weights_mb(int8), "rss_mb": int8_rss / 1e6}
+    }
+
+    print(f"{'mode':>13} {'p50 ms':>8} {'p95 ms':>8} {'texts/sec':>10} {'weights MB':>11} {'+RSS MB':>8}")
+    for mode, row in rows.items():
+        print(
+            f"{mode:>13} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['texts_per_sec']:>10.1f} "
+            f"{row['weights_mb']:>11.1f} {row['rss_mb']:>8.1f}"
+        )
+
+    print(f"\nLabel agreement: {parity['agreement']:.1%} over {parity['samples']} samples")
+    print(f"Accuracy fp32 {parity['reference_accuracy']:.1%}, int8 {parity['candidate_accuracy']:.1%}")
+    print(f"Score drift: max {parity['max_score_diff']:.4f}, mean {parity['mean_score_diff']:.4f}")
+    for item in parity["disagreements"]:
+        print(f"  {item['reference']} -> {item['candidate']}: {item['text']}")
+
+    if parity["agreement"] < args.min_agreement:
+        print(f"FAIL: agreement below {args.min_agreement:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
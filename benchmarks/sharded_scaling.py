@@ -0,0 +1,60 @@
+"""Throughput of sharded offline scoring at 1, 2, 4 and 8 worker processes.
+
+Writes a synthetic JSONL archive, scores it with score_sharded at each
+worker count and reports wall-clock rows/sec (including per-worker model
+load) and scoring rows/sec (slowest shard, model already loaded), with
+speedup and parallel efficiency relative to the first worker count.
+
+Run from the repository root:
+    python -m benchmarks.sharded_scaling --rows 20000 --workers 1 2 4 8
+"""
+import argparse
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from benchmarks.bucket_padding import make_texts
+from src.data.sharded_scoring import score_sharded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Model name or local path")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.rows} rows")
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = Path(tmp) / "tweets.jsonl"
+        with open(input_path, "w", encoding="utf-8") as f:
+            for index, text in enumerate(make_texts(args.rows)):
+                f.write(json.dumps({"id": index, "text": text}) + "\n")
+
+        print(f"{'workers':>7} {'threads':>7} {'wall s':>8} {'wall rows/s':>11} "
+              f"{'score rows/s':>12} {'speedup':>8} {'efficiency':>10}")
+        baseline = None
+        for workers in args.workers:
+            summary = score_sharded(
+                input_path,
+                Path(tmp) / f"scored-{workers}.jsonl",
+                workers=workers,
+                chunk_size=args.chunk_size,
+                resume=False,
+                model_name=args.model,
+                cache=False  # Measure the model, not the caches
+            )
+            scoring_rate = summary["rows"] / max(summary["shard_seconds"])
+            baseline = baseline or (scoring_rate, workers)
+            speedup = scoring_rate / baseline[0]
+            print(
+                f"{workers:>7} {summary['torch_threads']:>7} {summary['seconds']:>8.1f} "
+                f"{summary['rows_per_sec']:>11.0f} {scoring_rate:>12.0f} "
+                f"{speedup:>7.2f}x {speedup * baseline[1] / workers:>10.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Split per-text inference cost into tokenize, collate and forward time.
+
+Tokenization is timed cold (empty token cache) and warm (every text
+cached), so the value of the pre-tokenization cache is visible next to
+the forward pass it feeds.
+
+Run from the repository root:
+    python -m benchmarks.tokenizer_forward --texts 1024 --batch-sizes 1 8 32
+"""
+import argparse
+import time
+from typing import Callable
+
+from benchmarks.bucket_padding import make_texts
+from src.config import model_config
+from src.models.sentiment_analyzer import SentimentAnalyzer
+from src.models.tokenization import PreTokenizer
+
+
+def best_of(repeats: int, fn: Callable[[], None]) -> float:
+    """Fastest wall time of fn over `repeats` runs"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="Model name or local path")
+    parser.add_argument("--texts", type=int, default=1024)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(args.model)
+    analyzer.warmup()
+    texts = make_texts(args.texts)
+
+    print(f"{'batch':>6} {'tok cold us':>12} {'tok warm us':>12} {'collate us':>11} {'forward us':>11}")
+    for batch_size in args.batch_sizes:
+        chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+        def tokenize_cold():
+            pretokenizer = PreTokenizer(analyzer.tokenizer, model_config.MAX_LENGTH)
+            for chunk in chunks:
+                pretokenizer.encode(chunk)
+
+        warm = PreTokenizer(analyzer.tokenizer, model_config.MAX_LENGTH, cache_size=len(texts))
+        encoded = [warm.encode(chunk) for chunk in chunks]
+        collated = [warm.collate(ids) for ids in encoded]
+
+        timings = {
+            "cold": best_of(args.repeats, tokenize_cold),
+            "warm": best_of(args.repeats, lambda: [warm.encode(chunk) for chunk in chunks]),
+            "collate": best_of(args.repeats, lambda: [warm.collate(ids) for ids in encoded]),
+            "forward": best_of(args.repeats, lambda: [analyzer.backend.predict(x) for x in collated])
+        }
+        per_text = {name: seconds / len(texts) * 1e6 for name, seconds in timings.items()}
+        print(
+            f"{batch_size:>6} {per_text['cold']:>12.1f} {per_text['warm']:>12.1f} "
+            f"{per_text['collate']:>11.1f} {per_text['forward']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
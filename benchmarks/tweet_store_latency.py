@@ -0,0 +1,126 @@
+"""Query latency of the SQLite tweet store at 1M stored tweets.
+
+Fills a fresh database with synthetic scored tweets spread over 30 days,
+then times the queries /api/tweets issues (newest page, sentiment and
+date filters, deep pages by OFFSET and by keyset cursor, lookups by id)
+and prints p50/p95.
+
+Run from the repository root:
+    python -m benchmarks.tweet_store_latency --rows 1000000 --explain
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+from src.data.tweet_db import TweetDatabase, encode_cursor
+
+SENTIMENTS = ["positive", "neutral", "negative"]
+QUERIES = ["AI", "machine learning", "data science", "robotics", "quantum"]
+
+
+def synthetic_tweets(count: int, seed: int = 7) -> Iterator[Dict]:
+    """Scored tweets with created_at spread evenly over the last 30 days"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    span = timedelta(days=30).total_seconds()
+    for index in range(count):
+        yield {
+            "id": str(10**15 + index),
+            "text": f"Synthetic tweet {index} about {rng.choice(QUERIES)}",
+            "author_id": str(rng.randint(1, 50_000)),
+            "created_at": now - timedelta(seconds=rng.random() * span),
+            "retweets": rng.randint(0, 500),
+            "likes": rng.randint(0, 1000),
+            "sentiment": rng.choices(SENTIMENTS, weights=[45, 35, 20])[0],
+            "confidence": round(rng.uniform(0.5, 1.0), 3),
+            "query": rng.choice(QUERIES),
+            "source": "benchmark",
+            "collected_at": now
+        }
+
+
+def populate(db: TweetDatabase, rows: int, batch: int = 50_000) -> float:
+    """Insert `rows` synthetic tweets; returns rows/sec"""
+    start = time.perf_counter()
+    pending: List[Dict] = []
+    for tweet in synthetic_tweets(rows):
+        pending.append(tweet)
+        if len(pending) >= batch:
+            db.insert_many(pending)
+            pending = []
+    db.insert_many(pending)
+    return rows / (time.perf_counter() - start)
+
+
+def timings_ms(fn: Callable[[], object], repeats: int) -> List[float]:
+    """Wall time of each call in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--path", default=None, help="Database file (default: a temp file)")
+    parser.add_argument("--explain", action="store_true", help="Print each query plan")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = TweetDatabase(args.path or str(Path(tmp) / "tweets.sqlite"))
+        if db.count() < args.rows:
+            rate = populate(db, args.rows - db.count())
+            print(f"Inserted {args.rows} tweets at {rate:,.0f} rows/sec")
+        stats = db.stats()
+        print(f"{stats['rows']:,} rows, {stats['file_bytes'] / 1e6:.0f} MB\n")
+
+        day_ago = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+        sample_id = str(10**15 + args.rows // 2)
+        deep = db.query(limit=1, offset=args.rows // 2 - 1)[0]
+        deep_cursor = encode_cursor(deep["created_at"], deep["id"])
+        cases = {
+            "newest 20": lambda: db.query(limit=20),
+            "sentiment=negative, 20": lambda: db.query(sentiment="negative", limit=20),
+            "query=robotics, 20": lambda: db.query(query="robotics", limit=20),
+            "last 24h, 100": lambda: db.query(start_date=day_ago, limit=100),
+            "negative + last 7d, 100": lambda: db.query(sentiment="negative", start_date=week_ago, limit=100),
+            "offset 10k, 20": lambda: db.query(limit=20, offset=10_000),
+            "offset rows/2, 20": lambda: db.query(limit=20, offset=args.rows // 2),
+            "cursor at rows/2, 20": lambda: db.page(limit=20, cursor=deep_cursor),
+            "count negative": lambda: db.count(sentiment="negative"),
+            "count last 24h": lambda: db.count(start_date=day_ago),
+            "get by id": lambda: db.get(sample_id)
+        }
+
+        print(f"{'query':<26} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, fn in cases.items():
+            samples = sorted(timings_ms(fn, args.repeats))
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(f"{name:<26} {statistics.median(samples):>8.2f} {p95:>8.2f}")
+
+        if args.explain:
+            conn = db._connection()
+            print()
+            for sql, params in [
+                ("SELECT * FROM tweets ORDER BY created_at DESC, id DESC LIMIT 20", ()),
+                ("SELECT * FROM tweets WHERE sentiment = ? ORDER BY created_at DESC, id DESC LIMIT 20",
+                 ("negative",)),
+                ("SELECT * FROM tweets WHERE created_at >= ? ORDER BY created_at DESC, id DESC LIMIT 100",
+                 (day_ago,)),
+            ]:
+                plan = " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+                print(f"{sql}\n    -> {plan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Bounded-memory heavy hitters (Space-Saving) for trending hashtags and topics.
+
+A summary keeps at most `capacity` counters. An unseen item arriving when
+all counters are taken replaces the item with the smallest count and
+inherits that count as its error. Reported counts never underestimate;
+each overestimates by at most its recorded error, which is bounded by
+total / capacity. Every item that occurs more often than total / capacity
+is therefore present, so capacity = ceil(1 / error) guarantees error * total.
+
+Summaries are mergeable: merging those of two streams (per-minute buckets,
+or workers scoring different shards) gives a summary of the combined
+stream with the same guarantee, relative to the combined total.
+"""
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.config import analytics_config
+
+
+def capacity_for(error: float = None, max_counters: int = None) -> int:
+    """Counters needed to overestimate by at most error * total, capped at max_counters"""
+    error = error or analytics_config.HEAVY_HITTER_ERROR
+    max_counters = max_counters or analytics_config.HEAVY_HITTER_MAX_COUNTERS
+    return max(1, min(math.ceil(1 / error), max_counters))
+
+
+class SpaceSaving:
+    """Space-Saving summary: top items with at most `capacity` counters"""
+
+    __slots__ = ("capacity", "total", "counts", "errors", "_heap")
+
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity or capacity_for()
+        self.total = 0
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+        # One (count, item) entry per tracked item; an entry's count may lag
+        # behind the item's (increments don't touch the heap) and is fixed up
+        # lazily when it reaches the top
+        self._heap: List[Tuple[int, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self.counts
+
+    def _min(self) -> Tuple[int, Any]:
+        """Smallest (count, item), with the heap top made current"""
+        while True:
+            count, item = self._heap[0]
+            current = self.counts[item]
+            if current == count:
+                return count, item
+            heapq.heapreplace(self._heap, (current, item))
+
+    def min_count(self) -> int:
+        """Count an untracked item may have had: the smallest count once full, else 0"""
+        return self._min()[0] if len(self.counts) >= self.capacity else 0
+
+    def add(self, item: Any, count: int = 1):
+        """Count `count` occurrences of item"""
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+        else:
+            floor, victim = self._min()
+            del self.counts[victim]
+            del self.errors[victim]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+            heapq.heapreplace(self._heap, (floor + count, item))
+
+    def update(self, items: Iterable[Any]):
+        """Count one occurrence of each item"""
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: "SpaceSaving"):
+        """Fold another summary in; items missing from a full side may have had its min count"""
+        if not other.counts:
+            self.total += other.total
+            return
+        self_floor = self.min_count() if self.counts else 0
+        other_floor = other.min_count()
+        merged = {}
+        for item in self.counts.keys() | other.counts.keys():
+            merged[item] = (
+                self.counts.get(item, self_floor) + other.counts.get(item, other_floor),
+                self.errors.get(item, self_floor) + other.errors.get(item, other_floor)
+            )
+        kept = heapq.nlargest(self.capacity, merged.items(), key=lambda entry: entry[1][0])
+        self.total += other.total
+        self.counts = {item: count for item, (count, _) in kept}
+        self.errors = {item: error for item, (_, error) in kept}
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def most_common(self, n: int = None) -> List[Tuple[Any, int]]:
+        """(item, estimated count) pairs, highest first, like Counter.most_common"""
+        if n is None:
+            return sorted(self.counts.items(), key=lambda entry: entry[1], reverse=True)
+        return heapq.nlargest(n, self.counts.items(), key=lambda entry: entry[1])
+
+    def top(self, n: int = None) -> List[Dict[str, Any]]:
+        """Top items with their count, error bound and whether they are certainly in the top n"""
+        ranked = self.most_common()
+        # An item is guaranteed if its lower bound beats the (n+1)-th estimate
+        cutoff = ranked[n][1] if n is not None and n < len(ranked) else 0
+        return [
+            {
+                "item": item,
+                "count": count,
+                "error": self.errors[item],
+                "guaranteed": count - self.errors[item] >= cutoff
+            }
+            for item, count in ranked[:n]
+        ]
+
+    def max_error(self) -> int:
+        """Largest possible overestimate of any reported count"""
+        return self.min_count()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, for shipping summaries between workers"""
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "items": [[item, count, self.errors[item]] for item, count in self.counts.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        """Summary from to_dict output"""
+        summary = cls(data["capacity"])
+        summary.total = data["total"]
+        for item, count, error in data["items"]:
+            summary.counts[item] = count
+            summary.errors[item] = error
+        summary._heap = [(count, item) for item, count in summary.counts.items()]
+        heapq.heapify(summary._heap)
+        return summary
@@ -0,0 +1,196 @@
+"""Incremental rolling-window sentiment and topic aggregates.
+
+Every tweet is added once to a per-minute and a per-hour bucket holding
+sentiment counts, a confidence sum and topic/hashtag counts. A window
+query sums the buckets it covers, so its cost depends on the number of
+buckets (60 for an hour of minutes, 168 for a week of hours), not on the
+number of tweets. A window is the last seconds // width buckets, ending
+with the current (partial) one: minute buckets while the window fits in
+the minute retention, hour buckets beyond that. Topic and hashtag counts
+are Space-Saving summaries, so each bucket's memory is capped no matter
+how many distinct hashtags the stream carries.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.analytics.heavy_hitters import SpaceSaving
+from src.config import analytics_config
+
+TOPIC_KEYWORDS = {
+    "Artificial Intelligence": ["artificial intelligence", "artificialintelligence", "ai"],
+    "Machine Learning": ["machine learning", "machinelearning", "ml"],
+    "Deep Learning": ["deep learning", "deeplearning"],
+    "Neural Networks": ["neural network", "neural networks"],
+    "Natural Language Processing": ["natural language processing", "nlp", "chatbot", "chatbots"],
+    "Computer Vision": ["computer vision", "computervision"],
+    "Data Science": ["data science", "datascience", "big data", "bigdata"],
+    "AI Ethics": ["ai ethics", "ethics", "ethical", "regulation", "bias", "biases"],
+    "Quantum Computing": ["quantum computing", "quantum"],
+    "Robotics": ["robotics", "robot", "robots", "automation"],
+    "Healthcare": ["healthcare", "diagnostic", "diagnostics"],
+}
+
+_TOPIC_PATTERNS = {
+    topic: re.compile(r"(?<![\w])(?:" + "|".join(re.escape(k) for k in keywords) + r")(?![\w])")
+    for topic, keywords in TOPIC_KEYWORDS.items()
+}
+_HASHTAG_PATTERN = re.compile(r"#(\w+)")
+
+
+def extract_topics(text: str) -> List[str]:
+    """Topics whose keywords appear in the text (hashtags included, case-insensitive)"""
+    lowered = (text or "").lower().replace("#", " ")
+    return [topic for topic, pattern in _TOPIC_PATTERNS.items() if pattern.search(lowered)]
+
+
+def extract_hashtags(tweet: Dict[str, Any]) -> List[str]:
+    """Lowercased hashtags from the tweet's hashtags field, or parsed from its text"""
+    hashtags = tweet.get("hashtags")
+    if hashtags is None:
+        hashtags = _HASHTAG_PATTERN.findall(tweet.get("text") or "")
+    return list(dict.fromkeys("#" + tag.lstrip("#").lower() for tag in hashtags if tag))
+
+
+def _epoch(value: Any) -> Optional[float]:
+    """Unix seconds from an ISO string, datetime or number"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.timestamp()
+
+
+class Bucket:
+    """Aggregates for one time slice"""
+
+    __slots__ = ("tweets", "sentiment", "confidence_sum", "topics", "hashtags")
+
+    def __init__(self):
+        self.tweets = 0
+        self.sentiment: Counter = Counter()
+        self.confidence_sum = 0.0
+        self.topics = SpaceSaving()
+        self.hashtags = SpaceSaving()
+
+    def add(self, sentiment: str, confidence: float, topics: List[str], hashtags: List[str]):
+        """Count one tweet"""
+        self.tweets += 1
+        self.sentiment[sentiment] += 1
+        self.confidence_sum += confidence
+        self.topics.update(topics)
+        self.hashtags.update(hashtags)
+
+    def merge(self, other: "Bucket"):
+        """Add another bucket's counts to this one"""
+        self.tweets += other.tweets
+        self.sentiment.update(other.sentiment)
+        self.confidence_sum += other.confidence_sum
+        self.topics.merge(other.topics)
+        self.hashtags.merge(other.hashtags)
+
+
+class RollingAggregator:
+    """Per-minute and per-hour buckets answering last-N-seconds queries"""
+
+    def __init__(self, minute_retention: int = None, hour_retention: int = None):
+        self.minute_retention = (minute_retention or analytics_config.MINUTE_RETENTION_MINUTES) * 60
+        self.hour_retention = (hour_retention or analytics_config.HOUR_RETENTION_HOURS) * 3600
+        self._tiers = {60: {}, 3600: {}}  # bucket width (s) -> {bucket start: Bucket}
+        self._lock = threading.Lock()
+        self.tweets_added = 0
+        self.tweets_expired = 0
+
+    def _retention(self, width: int) -> int:
+        """Seconds of history kept by the tier with this bucket width"""
+        return self.minute_retention if width == 60 else self.hour_retention
+
+    def add(self, tweet: Dict[str, Any], now: float = None):
+        """Count one scored tweet in the buckets for its created_at (or now)"""
+        self.add_many([tweet], now)
+
+    def add_many(self, tweets: Iterable[Dict[str, Any]], now: float = None):
+        """Count scored tweets; ones older than the hour retention are ignored"""
+        now = now or time.time()
+        prepared = []
+        for tweet in tweets:
+            at = _epoch(tweet.get("created_at")) or now
+            prepared.append((
+                min(at, now),
+                (tweet.get("sentiment") or "unknown").lower(),
+                tweet.get("confidence") or 0.0,
+                extract_topics(tweet.get("text")),
+                extract_hashtags(tweet)
+            ))
+
+        with self._lock:
+            for at, sentiment, confidence, topics, hashtags in prepared:
+                if at < now - self.hour_retention:
+                    self.tweets_expired += 1
+                    continue
+                self.tweets_added += 1
+                for width, buckets in self._tiers.items():
+                    if at < now - self._retention(width):
+                        continue
+                    start = int(at // width) * width
+                    bucket = buckets.get(start)
+                    if bucket is None:
+                        bucket = buckets[start] = Bucket()
+                    bucket.add(sentiment, confidence, topics, hashtags)
+            self._prune(now)
+
+    def _prune(self, now: float):
+        """Drop buckets that fell out of their tier's retention"""
+        for width, buckets in self._tiers.items():
+            oldest = now - self._retention(width) - width
+            for start in [s for s in buckets if s < oldest]:
+                del buckets[start]
+
+    def window(self, seconds: int, now: float = None) -> Bucket:
+        """Sum of the buckets covering the last `seconds`, in O(buckets)"""
+        now = now or time.time()
+        width = 60 if seconds <= self.minute_retention else 3600
+        # The bucket holding now - seconds is mostly outside the window
+        first = int((now - seconds) // width) * width + width
+        total = Bucket()
+        with self._lock:
+            self._prune(now)
+            buckets = self._tiers[width]
+            for start in range(first, int(now // width) * width + 1, width):
+                bucket = buckets.get(start)
+                if bucket is not None:
+                    total.merge(bucket)
+        return total
+
+    def trending(self, seconds: int, top_k: int = None, now: float = None) -> Dict[str, Any]:
+        """Top topics/hashtags, sentiment distribution and mean confidence for a window"""
+        top_k = top_k or analytics_config.TRENDING_TOP_K
+        total = self.window(seconds, now)
+        return {
+            "trending_topics": [{"topic": t, "count": c} for t, c in total.topics.most_common(top_k)],
+            "top_hashtags": [{"hashtag": h, "count": c} for h, c in total.hashtags.most_common(top_k)],
+            "sentiment_distribution": dict(total.sentiment),
+            # Hashtag/topic counts may overestimate by up to this much
+            "max_count_error": max(total.topics.max_error(), total.hashtags.max_error()),
+            "tweets": total.tweets,
+            "average_confidence": round(total.confidence_sum / total.tweets, 4) if total.tweets else 0.0
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Bucket counts per tier and tweet counters"""
+        with self._lock:
+            return {
+                "minute_buckets": len(self._tiers[60]),
+                "hour_buckets": len(self._tiers[3600]),
+                "tweets_added": self.tweets_added,
+                "tweets_expired": self.tweets_expired
+            }
+
+
+# Singleton instance
+rolling_aggregator = RollingAggregator()
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+from src.api.inference_pool import PoolSaturatedError
+from src.utils.logger import project_logger
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-text requests into batched model calls
+
+    Requests are held for at most `max_wait_ms` after the first one arrives,
+    or until `max_batch_size` are queued, then run as one call to the
+    `process_batch` coroutine. Batches are dispatched without waiting for
+    earlier ones, so several can be in flight on the inference pool. Each
+    caller's future resolves with its own result.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[str]], Awaitable[List[Dict[str, Any]]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        self.logger = project_logger
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: asyncio.Queue = None
+        self._task: asyncio.Task = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+        # Fill metrics
+        self.batches = 0
+        self.requests = 0
+        self.last_batch_size = 0
+        self.batch_size_counts: Dict[int, int] = {}
+        self.total_wait_ms = 0.0
+        self.saturated_batches = 0  # Rejected by a full inference pool (answered with 503)
+
+    async def start(self):
+        """Start the background collection loop"""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(
+                f"Micro-batcher started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait_ms})"
+            )
+
+    async def stop(self):
+        """Stop the collection loop and fail any requests still waiting"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    async def submit(self, text: str) -> Dict[str, Any]:
+        """Queue a text and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self._queue.put((text, future, loop.time()))
+        return await future
+
+    async def _run(self):
+        """Collect requests into batches until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._dispatch(batch, loop.time()))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future, float]], now: float):
+        """Run one batch and resolve each request's future"""
+        self.batches += 1
+        self.requests += len(batch)
+        self.last_batch_size = len(batch)
+        self.batch_size_counts[len(batch)] = self.batch_size_counts.get(len(batch), 0) + 1
+        self.total_wait_ms += sum(now - queued_at for _, _, queued_at in batch) * 1000
+
+        try:
+            results = await self.process_batch([text for text, _, _ in batch])
+        except Exception as e:
+            if isinstance(e, PoolSaturatedError):
+                # Expected backpressure under load: counted, not logged as a failure
+                self.saturated_batches += 1
+                self.logger.debug(f"Batch of {len(batch)} requests rejected: {e}")
+            else:
+                self.logger.error(f"Batch of {len(batch)} requests failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():  # The client may have gone away
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batching settings and fill metrics"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "requests": self.requests,
+            "last_batch_size": self.last_batch_size,
+            "average_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "average_fill_ratio": (
+                round(self.requests / (self.batches * self.max_batch_size), 3)
+                if self.batches else 0.0
+            ),
+            "average_queue_wait_ms": (
+                round(self.total_wait_ms / self.requests, 2) if self.requests else 0.0
+            ),
+            "batch_size_histogram": dict(sorted(self.batch_size_counts.items())),
+            "saturated_batches": self.saturated_batches,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches_in_flight": len(self._in_flight)
+        }
@@ -0,0 +1,83 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.utils.logger import project_logger
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the inference queue is full"""
+
+
+class InferencePool:
+    """Bounded thread pool that keeps model inference off the event loop
+
+    Torch releases the GIL inside forward passes, so threads give real
+    parallelism without duplicating the model weights per worker. Each
+    worker caps torch intra-op threads so that workers * threads does not
+    oversubscribe the available cores.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 8, torch_threads: int = 0):
+        self.logger = project_logger
+        self.workers = workers
+        self.max_pending = max_pending
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // workers)
+
+        self._executor: ThreadPoolExecutor = None
+
+        # Counters are only touched from the event loop thread
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self):
+        """Create the worker threads"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="inference",
+                initializer=self._init_worker
+            )
+            self.logger.info(
+                f"Inference pool started ({self.workers} workers, "
+                f"{self.torch_threads} torch threads each, max_pending={self.max_pending})"
+            )
+
+    def shutdown(self):
+        """Wait for running jobs and stop the workers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _init_worker(self):
+        """Limit torch intra-op threads for this worker"""
+        import torch
+        torch.set_num_threads(self.torch_threads)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on a worker, or raise PoolSaturatedError if the queue is full"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PoolSaturatedError(f"{self.pending} inference jobs already pending")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, fn, *args)
+            self.completed += 1
+            return result
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool settings and queue counters"""
+        return {
+            "workers": self.workers,
+            "torch_threads_per_worker": self.torch_threads,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,63 @@
+"""Per-endpoint request metrics for the API.
+
+A plain ASGI middleware (rather than BaseHTTPMiddleware, which wraps every
+response in an extra task and stream) counts requests by route template
+and status, tracks requests in flight and records latency until the last
+body byte is sent, so streamed responses are timed to completion.
+"""
+import time
+from typing import Any, Dict
+
+from starlette.routing import Match
+
+from src.utils.metrics import metrics
+
+UNMATCHED = "<unmatched>"
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "path", "status")
+)
+http_in_flight = metrics.gauge(
+    "http_requests_in_flight", "HTTP requests being served", ("method", "path")
+)
+http_latency = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response completes",
+    ("method", "path")
+)
+
+
+class RequestMetricsMiddleware:
+    """Record request count, in-flight count and latency per (method, route)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _route_path(self, scope: Dict[str, Any]) -> str:
+        """Route template for the request (e.g. /api/tweets/{tweet_id}), so ids don't become labels"""
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match != Match.NONE:
+                return getattr(route, "path", UNMATCHED)
+        return UNMATCHED
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = (scope["method"], self._route_path(scope))
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        http_in_flight.inc(labels)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_latency.observe(time.perf_counter() - started, labels)
+            http_in_flight.dec(labels)
+            http_requests.inc((*labels, str(status[0])))
@@ -1,19 +1,61 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-import pandas as pd
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from datetime import datetime, timedelta
 import uvicorn
-import random
+import asyncio
+import time
 from typing import List, Dict, Any
-import json
+from src.api.batcher import MicroBatcher
+from src.api.inference_pool import InferencePool, PoolSaturatedError
+from src.api.instrumentation import RequestMetricsMiddleware, http_in_flight, http_latency, http_requests
+from src.api.prefork import process_memory
+from src.api.streaming import TweetBroadcaster, format_ndjson, format_sse
+from src.analytics.rolling import rolling_aggregator
+from src.config import analytics_config
+from src.data.mock_twitter import MockTwitterData
+from src.data.parquet_store import parquet_store
+from src.data.tweet_db import normalize_timestamp, tweet_db
+from src.models.sentiment_analyzer import sentiment_analyzer, stage_latency, texts_scored
+from src.utils.logger import project_logger
+from src.utils.metrics import metrics
 
-# ========== CONFIGURATION (No imports needed) ==========
+logger = project_logger
+
+# ========== CONFIGURATION ==========
 class APIConfig:
     """API configuration"""
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = True
     CORS_ORIGINS: list = ["http://localhost:8501", "http://127.0.0.1:8501"]
+    
+    # Micro-batching for /api/analyze
+    ANALYZE_MAX_BATCH_SIZE: int = 32  # Flush once this many requests are queued
+    ANALYZE_MAX_WAIT_MS: float = 5.0  # Max time the first request waits for company
+    
+    # Inference worker pool
+    INFERENCE_WORKERS: int = 2
+    INFERENCE_MAX_PENDING: int = 8  # Queued + running batches before returning 503
+    INFERENCE_TORCH_THREADS: int = 0  # Intra-op threads per worker (0 = cores / workers)
+    INFERENCE_RETRY_AFTER_SECONDS: int = 1
+    
+    # /api/tweets page size (pages continue with next_cursor)
+    MAX_PAGE_SIZE: int = 1000
+    
+    # Parquet archive reads
+    ARCHIVE_MAX_LIMIT: int = 1000
+    
+    # Mock tweets stored at startup when the tweet database is empty
+    MOCK_SEED_TWEETS: int = 500
+    
+    # Live tweet stream (/api/stream/tweets)
+    STREAM_POLL_INTERVAL_SECONDS: float = 0.5  # How often the shared tailer checks for new tweets
+    STREAM_BATCH_LIMIT: int = 500  # Rows read per poll / catch-up query
+    STREAM_QUEUE_SIZE: int = 100  # Batches buffered per client before it is disconnected
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    MOCK_STREAM_INTERVAL_SECONDS: float = 5.0  # New mock tweets stored this often (0 = off)
+    MOCK_STREAM_BATCH: int = 3
 
 class TwitterConfig:
     """Twitter configuration (using mock data)"""
@@ -27,92 +69,9 @@ api_config = APIConfig()
 twitter_config = TwitterConfig()
 
 # ========== MOCK DATA GENERATOR ==========
-class MockTwitterData:
-    """Generate realistic mock Twitter data"""
-    
-    def __init__(self):
-        self.users = [
-            "TechEnthusiast42", "AIAnalyst", "DataSciencePro", "FutureTechWatch",
-            "MLResearcher", "AIEthicist", "StartupFounder", "TechJournalist",
-            "AcademicResearcher", "IndustryExpert"
-        ]
-        
-        self.hashtags = [
-            "#ArtificialIntelligence", "#MachineLearning", "#AI", "#DeepLearning",
-            "#DataScience", "#Tech", "#Innovation", "#FutureTech", "#NLP", "#Robotics"
-        ]
-        
-        self.topics = [
-            "AI in healthcare", "Machine learning algorithms", "Natural language processing",
-            "Computer vision", "Robotics", "AI ethics", "Quantum computing",
-            "Neural networks", "Big data", "Automation"
-        ]
-    
-    def generate_tweet(self, tweet_id: int) -> Dict:
-        """Generate a single mock tweet"""
-        user = random.choice(self.users)
-        topic = random.choice(self.topics)
-        hashtag = random.choice(self.hashtags)
-        
-        tweet_templates = [
-            f"Exciting developments in {topic} recently! {hashtag}",
-            f"New research paper on {topic} shows promising results. {hashtag}",
-            f"Discussion: What are the ethical implications of {topic}? {hashtag}",
-            f"Just attended a great conference about {topic}. Amazing insights! {hashtag}",
-            f"Industry leaders are investing heavily in {topic}. {hashtag}",
-            f"Concerns about {topic} need to be addressed by policymakers. {hashtag}",
-            f"Breakthrough in {topic} could change everything. {hashtag}",
-            f"My thoughts on the future of {topic}. {hashtag}",
-            f"Recent advancements in {topic} are impressive. {hashtag}",
-            f"How will {topic} impact our daily lives? {hashtag}"
-        ]
-        
-        # Generate random date within last 7 days
-        days_ago = random.randint(0, 7)
-        hours_ago = random.randint(0, 23)
-        minutes_ago = random.randint(0, 59)
-        
-        created_at = datetime.now() - timedelta(
-            days=days_ago, 
-            hours=hours_ago, 
-            minutes=minutes_ago
-        )
-        
-        # Generate sentiment with realistic distribution
-        sentiment_roll = random.random()
-        if sentiment_roll < 0.45:  # 45% positive
-            sentiment = "positive"
-            confidence = round(random.uniform(0.75, 0.98), 2)
-        elif sentiment_roll < 0.8:  # 35% neutral
-            sentiment = "neutral"
-            confidence = round(random.uniform(0.7, 0.9), 2)
-        else:  # 20% negative
-            sentiment = "negative"
-            confidence = round(random.uniform(0.75, 0.95), 2)
-        
-        return {
-            "id": str(tweet_id),
-            "text": random.choice(tweet_templates),
-            "created_at": created_at.isoformat(),
-            "user": {
-                "name": user,
-                "screen_name": user.lower(),
-                "followers_count": random.randint(100, 10000)
-            },
-            "retweet_count": random.randint(0, 500),
-            "favorite_count": random.randint(0, 1000),
-            "hashtags": [hashtag],
-            "sentiment": sentiment,
-            "confidence": confidence,
-            "source": "mock_data"
-        }
-    
-    def generate_tweets(self, count: int = 50) -> List[Dict]:
-        """Generate multiple mock tweets"""
-        return [self.generate_tweet(i) for i in range(1000, 1000 + count)]
-
-# Initialize mock data generator
-mock_generator = MockTwitterData()
+# Seeded tweets get ids from 1000; live mock tweets need ids that don't collide with them
+mock_generator = MockTwitterData(start_id=1000)
+mock_stream_generator = MockTwitterData(start_id=int(time.time() * 1000))
 
 # ========== FASTAPI APP ==========
 app = FastAPI(
@@ -132,6 +91,130 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so it times everything including CORS handling
+app.add_middleware(RequestMetricsMiddleware)
+
+# Run model inference on worker threads so it never blocks the event loop
+inference_pool = InferencePool(
+    workers=api_config.INFERENCE_WORKERS,
+    max_pending=api_config.INFERENCE_MAX_PENDING,
+    torch_threads=api_config.INFERENCE_TORCH_THREADS
+)
+
+async def run_analyze_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """Score a batch of texts on the inference pool"""
+    return await inference_pool.run(sentiment_analyzer.analyze_batch, texts)
+
+# Coalesce concurrent /api/analyze calls into batched model calls
+analyze_batcher = MicroBatcher(
+    run_analyze_batch,
+    max_batch_size=api_config.ANALYZE_MAX_BATCH_SIZE,
+    max_wait_ms=api_config.ANALYZE_MAX_WAIT_MS
+)
+
+async def warmup_model():
+    """Load weights on a worker so /api/health answers while the model loads"""
+    try:
+        await inference_pool.run(sentiment_analyzer.warmup)
+    except Exception as e:
+        # The first request retries the load
+        logger.error(f"Model warmup failed: {e}")
+
+def cache_lookup_counts() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters of each enabled cache tier"""
+    caches = {
+        "prediction": sentiment_analyzer.cache,
+        "persistent": sentiment_analyzer.persistent_cache,
+        "token": sentiment_analyzer.pretokenizer
+    }
+    return {
+        name: {"hits": cache.hits, "misses": cache.misses}
+        for name, cache in caches.items() if cache is not None
+    }
+
+def collect_component_metrics():
+    """Cache, batching and inference pool counters for /metrics"""
+    for name, counts in cache_lookup_counts().items():
+        for result in ("hits", "misses"):
+            yield ("cache_lookups_total", "counter", "Cache lookups by tier and result",
+                   {"cache": name, "result": result}, counts[result])
+    pool = inference_pool.stats()
+    yield ("inference_pool_pending", "gauge", "Inference batches queued or running", {}, pool["pending"])
+    yield ("inference_pool_rejected_total", "counter", "Inference batches rejected with 503", {}, pool["rejected"])
+    batching = analyze_batcher.stats()
+    yield ("analyze_batches_total", "counter", "Model batches formed from /api/analyze calls", {}, batching["batches"])
+    yield ("analyze_batch_queue_depth", "gauge", "/api/analyze calls waiting for a batch", {}, batching["queue_depth"])
+    yield ("tweet_stream_subscribers", "gauge", "Connected tweet stream clients", {},
+           tweet_broadcaster.stats()["subscribers"])
+
+metrics.add_collector(collect_component_metrics)
+
+def fetch_stream_rows(seq: int, limit: int) -> List[Dict[str, Any]]:
+    """Tweets stored after `seq`, in the /api/tweets shape, for the stream"""
+    return [{"seq": row["seq"], "tweet": tweet_db.to_api(row)} for row in tweet_db.since(seq, limit)]
+
+# One database tailer shared by every /api/stream/tweets client
+tweet_broadcaster = TweetBroadcaster(
+    fetch_stream_rows,
+    tweet_db.latest_seq,
+    poll_interval=api_config.STREAM_POLL_INTERVAL_SECONDS,
+    batch_limit=api_config.STREAM_BATCH_LIMIT,
+    queue_size=api_config.STREAM_QUEUE_SIZE
+)
+
+def aggregate_stream_rows(rows: List[Dict[str, Any]]):
+    """Feed newly stored tweets into the rolling trending aggregates"""
+    rolling_aggregator.add_many(row["tweet"] for row in rows)
+
+tweet_broadcaster.add_listener(aggregate_stream_rows)
+
+def backfill_rolling_aggregates(max_seq: int):
+    """Load tweets stored before the broadcaster started into the aggregates"""
+    start = datetime.now() - timedelta(hours=analytics_config.HOUR_RETENTION_HOURS)
+    batch = []
+    for row in tweet_db.iter_created_since(start, max_seq=max_seq):
+        batch.append(tweet_db.to_api(row))
+        if len(batch) >= 5000:
+            rolling_aggregator.add_many(batch)
+            batch = []
+    rolling_aggregator.add_many(batch)
+
+async def produce_mock_tweets():
+    """Store a few fresh mock tweets periodically so the stream has live data"""
+    while True:
+        await asyncio.sleep(api_config.MOCK_STREAM_INTERVAL_SECONDS)
+        tweets = mock_stream_generator.generate_tweets(api_config.MOCK_STREAM_BATCH, max_age_seconds=0)
+        try:
+            await asyncio.to_thread(tweet_db.insert_many, tweets)
+        except Exception as e:
+            logger.error(f"Storing mock stream tweets failed: {e}")
+
+def seed_tweet_db():
+    """Fill an empty tweet database with mock tweets so /api/tweets has data"""
+    if twitter_config.USE_MOCK_DATA and tweet_db.count() == 0:
+        tweet_db.insert_many(mock_generator.generate_tweets(api_config.MOCK_SEED_TWEETS))
+
+@app.on_event("startup")
+async def startup():
+    inference_pool.start()
+    await analyze_batcher.start()
+    await asyncio.to_thread(seed_tweet_db)
+    await tweet_broadcaster.start()
+    # Rows after the broadcaster's starting point reach the aggregates through it
+    await asyncio.to_thread(backfill_rolling_aggregates, tweet_broadcaster.last_seq)
+    app.state.mock_producer_task = None
+    if twitter_config.USE_MOCK_DATA and api_config.MOCK_STREAM_INTERVAL_SECONDS > 0:
+        app.state.mock_producer_task = asyncio.create_task(produce_mock_tweets())
+    app.state.warmup_task = asyncio.create_task(warmup_model())
+
+@app.on_event("shutdown")
+async def shutdown():
+    if app.state.mock_producer_task is not None:
+        app.state.mock_producer_task.cancel()
+    await tweet_broadcaster.stop()
+    await analyze_batcher.stop()
+    inference_pool.shutdown()
+
 # ========== API ENDPOINTS ==========
 @app.get("/")
 async def root():
@@ -147,7 +230,10 @@ async def root():
             "tweets": "/api/tweets",
             "analyze": "/api/analyze",
             "trending": "/api/trending",
-            "stats": "/api/stats"
+            "stats": "/api/stats",
+            "metrics": "/metrics",
+            "archive": "/api/archive/tweets",
+            "stream": "/api/stream/tweets"
         }
     }
 
@@ -158,55 +244,95 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "service": "twitter-sentiment-api",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "model_loaded": sentiment_analyzer.is_loaded
     }
 
 @app.get("/api/tweets")
 async def get_tweets(
     limit: int = 20,
+    cursor: str = None,
     sentiment: str = None,
     start_date: str = None,
     end_date: str = None
 ):
     """
-    Get tweets with sentiment analysis
-    - limit: Number of tweets to return (default: 20, max: 100)
+    Get tweets with sentiment analysis, newest first
+    - limit: Number of tweets per page (default: 20, max: 1000)
+    - cursor: next_cursor from the previous page
     - sentiment: Filter by sentiment (positive, neutral, negative)
     - start_date: Filter tweets after this date (ISO format)
     - end_date: Filter tweets before this date (ISO format)
     """
     # Validate limit
-    if limit > 100:
-        limit = 100
-    
-    # Generate mock tweets
-    tweets = mock_generator.generate_tweets(limit)
-    
-    # Apply filters if provided
-    if sentiment:
-        tweets = [t for t in tweets if t["sentiment"] == sentiment.lower()]
+    limit = max(1, min(limit, api_config.MAX_PAGE_SIZE))
     
-    if start_date:
+    # Unparseable dates are ignored, as before
+    dates = {}
+    for name, value in (("start_date", start_date), ("end_date", end_date)):
         try:
-            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            tweets = [t for t in tweets if datetime.fromisoformat(t["created_at"]) >= start_dt]
-        except:
-            pass
+            dates[name] = normalize_timestamp(value)
+        except ValueError:
+            dates[name] = None
     
-    if end_date:
-        try:
-            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            tweets = [t for t in tweets if datetime.fromisoformat(t["created_at"]) <= end_dt]
-        except:
-            pass
+    try:
+        rows, next_cursor = await asyncio.to_thread(
+            tweet_db.page, sentiment=sentiment, limit=limit, cursor=cursor, **dates
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    tweets = [tweet_db.to_api(row) for row in rows]
     
     return {
         "count": len(tweets),
         "tweets": tweets,
+        "next_cursor": next_cursor,
         "query": twitter_config.SEARCH_QUERY,
         "generated_at": datetime.now().isoformat()
     }
 
+@app.get("/api/stream/tweets")
+async def stream_tweets(
+    format: str = "sse",
+    since: int = None,
+    tail: int = None,
+    follow: bool = True,
+    sentiment: str = None,
+    last_event_id: str = Header(None)
+):
+    """
+    Push newly stored tweets and per-batch sentiment deltas as they arrive
+    - format: "sse" (text/event-stream) or "ndjson"
+    - since: Resume after this event id (the Last-Event-ID header takes precedence)
+    - tail: Start roughly this many tweets back instead (default: only new tweets)
+    - follow: false to return the catch-up events and close
+    - sentiment: Only push tweets with this sentiment
+    """
+    if format not in ("sse", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be sse or ndjson")
+    if last_event_id is not None:
+        if not last_event_id.isdigit():
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be an event id")
+        since = int(last_event_id)
+    if since is None:
+        latest = await asyncio.to_thread(tweet_db.latest_seq)
+        since = max(0, latest - tail) if tail else latest
+    
+    formatter = format_sse if format == "sse" else format_ndjson
+    
+    async def body():
+        async for event in tweet_broadcaster.events(
+            since, follow=follow, sentiment=sentiment,
+            heartbeat_seconds=api_config.STREAM_HEARTBEAT_SECONDS
+        ):
+            yield formatter(event)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/analyze")
 async def analyze_text(text: str):
     """
@@ -216,25 +342,20 @@ async def analyze_text(text: str):
     if not text or len(text.strip()) == 0:
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     
-    # Mock sentiment analysis (in real app, use ML model)
-    words = text.lower().split()
-    
-    # Simple keyword-based sentiment (for demo)
-    positive_words = ["good", "great", "excellent", "amazing", "love", "best", "positive", "happy"]
-    negative_words = ["bad", "terrible", "worst", "hate", "negative", "sad", "awful", "problem"]
-    
-    positive_count = sum(1 for word in words if word in positive_words)
-    negative_count = sum(1 for word in words if word in negative_words)
+    try:
+        result = await analyze_batcher.submit(text)
+    except PoolSaturatedError:
+        raise HTTPException(
+            status_code=503,
+            detail="Inference queue is full, retry later",
+            headers={"Retry-After": str(api_config.INFERENCE_RETRY_AFTER_SECONDS)}
+        )
+    if result["label"] == "ERROR":
+        raise HTTPException(status_code=500, detail="Sentiment analysis failed")
     
-    if positive_count > negative_count:
-        sentiment = "positive"
-        confidence = round(random.uniform(0.7, 0.95), 2)
-    elif negative_count > positive_count:
-        sentiment = "negative"
-        confidence = round(random.uniform(0.7, 0.95), 2)
-    else:
-        sentiment = "neutral"
-        confidence = round(random.uniform(0.6, 0.85), 2)
+    sentiment = result["label"].lower()
+    confidence = round(result["score"], 2)
+    words = text.lower().split()
     
     # Detect hashtags
     hashtags = [word for word in words if word.startswith("#")]
@@ -246,79 +367,178 @@ async def analyze_text(text: str):
         "hashtags": hashtags,
         "word_count": len(words),
         "analyzed_at": datetime.now().isoformat(),
-        "model": "mock_sentiment_analyzer_v1"
+        "model": sentiment_analyzer.model_name
     }
 
 @app.get("/api/trending")
-async def get_trending():
-    """Get trending topics and sentiment distribution"""
-    
-    # Generate trending topics
-    topics = [
-        {"topic": "Artificial Intelligence", "count": random.randint(30, 60)},
-        {"topic": "Machine Learning", "count": random.randint(25, 55)},
-        {"topic": "Data Science", "count": random.randint(20, 50)},
-        {"topic": "AI Ethics", "count": random.randint(15, 40)},
-        {"topic": "Deep Learning", "count": random.randint(10, 35)},
-        {"topic": "Neural Networks", "count": random.randint(8, 30)},
-        {"topic": "Natural Language Processing", "count": random.randint(5, 25)},
-        {"topic": "Computer Vision", "count": random.randint(5, 20)},
-        {"topic": "Quantum Computing", "count": random.randint(3, 15)},
-        {"topic": "Robotics", "count": random.randint(3, 15)}
-    ]
+async def get_trending(window: str = "24h"):
+    """
+    Get trending topics and sentiment distribution
+    - window: 1h, 24h or 7d
+    """
+    if window not in analytics_config.TRENDING_WINDOWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"window must be one of {list(analytics_config.TRENDING_WINDOWS)}"
+        )
     
-    # Sort by count (descending)
-    topics.sort(key=lambda x: x["count"], reverse=True)
+    # Summed from per-minute/per-hour buckets, independent of the number of tweets
+    trending = await asyncio.to_thread(
+        rolling_aggregator.trending, analytics_config.TRENDING_WINDOWS[window]
+    )
     
     # Sentiment distribution
     sentiment_distribution = {
-        "positive": random.randint(40, 60),
-        "neutral": random.randint(25, 45),
-        "negative": random.randint(10, 30)
+        label: trending["sentiment_distribution"].get(label, 0)
+        for label in ("positive", "neutral", "negative")
     }
     
     total = sum(sentiment_distribution.values())
     
     return {
-        "trending_topics": topics[:5],  # Top 5
+        "trending_topics": trending["trending_topics"],
+        "top_hashtags": trending["top_hashtags"],
+        "max_count_error": trending["max_count_error"],
         "sentiment_distribution": sentiment_distribution,
         "sentiment_percentages": {
-            "positive": round(sentiment_distribution["positive"] / total * 100, 1),
-            "neutral": round(sentiment_distribution["neutral"] / total * 100, 1),
-            "negative": round(sentiment_distribution["negative"] / total * 100, 1)
+            label: round(count / total * 100, 1) if total else 0.0
+            for label, count in sentiment_distribution.items()
         },
-        "total_tweets_analyzed": random.randint(1000, 10000),
-        "time_period": "last 24 hours",
+        "average_confidence": trending["average_confidence"],
+        "total_tweets_analyzed": trending["tweets"],
+        "time_period": f"last {window}",
+        "window": window,
         "generated_at": datetime.now().isoformat()
     }
 
 @app.get("/api/stats")
 async def get_stats():
-    """Get API usage statistics"""
+    """Get API usage statistics (for this worker process)"""
+    # Per-endpoint counts, errors, in-flight and latency percentiles
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    def endpoint(method: str, path: str) -> Dict[str, Any]:
+        return endpoints.setdefault(f"{method} {path}", {"requests": 0, "errors": 0, "statuses": {}})
+    
+    for (method, path, status), count in http_requests.values().items():
+        entry = endpoint(method, path)
+        entry["requests"] += count
+        entry["statuses"][status] = count
+        if status.startswith("5"):
+            entry["errors"] += count
+    in_flight = http_in_flight.values()
+    for (method, path), value in in_flight.items():
+        endpoint(method, path)["in_flight"] = value
+    latency_values = http_latency.values()
+    for (method, path), merged in latency_values.items():
+        endpoint(method, path)["latency"] = http_latency.summarize(*merged)
+    
+    # Overall latency across endpoints
+    all_counts, all_seconds, all_requests = [0] * (len(http_latency.buckets) + 1), 0.0, 0
+    for counts, seconds, count in latency_values.values():
+        all_counts = [a + b for a, b in zip(all_counts, counts)]
+        all_seconds += seconds
+        all_requests += count
+    overall = http_latency.summarize(all_counts, all_seconds, all_requests)
+    
+    scored = texts_scored.values()
+    stage_values = stage_latency.values()
+    uptime_seconds = time.time() - metrics.started_at
     return {
-        "total_requests": random.randint(100, 1000),
-        "tweets_analyzed": random.randint(500, 5000),
-        "average_response_time_ms": round(random.uniform(50, 200), 2),
-        "uptime": "99.8%",
-        "active_since": (datetime.now() - timedelta(days=7)).isoformat(),
-        "endpoints": {
-            "health": "/api/health",
-            "tweets": "/api/tweets",
-            "analyze": "/api/analyze",
-            "trending": "/api/trending",
-            "stats": "/api/stats"
-        }
+        "total_requests": all_requests,
+        "requests_in_flight": sum(in_flight.values()),
+        "tweets_analyzed": int(sum(scored.values())),
+        "average_response_time_ms": overall["mean_ms"],
+        "latency": overall,
+        "uptime_seconds": round(uptime_seconds, 1),
+        "active_since": datetime.fromtimestamp(metrics.started_at).isoformat(),
+        "endpoints": dict(sorted(endpoints.items())),
+        "inference": {
+            "texts": {source: int(count) for (source,), count in scored.items()},
+            "stages": {
+                stage: {
+                    **stage_latency.summarize(*stage_values[(stage,)]),
+                    "total_seconds": round(stage_values[(stage,)][1], 3)
+                }
+                for stage in ("tokenize", "collate", "forward", "postprocess") if (stage,) in stage_values
+            }
+        },
+        "cache_hit_rates": {
+            name: round(counts["hits"] / (counts["hits"] + counts["misses"]), 4)
+            if counts["hits"] + counts["misses"] else 0.0
+            for name, counts in cache_lookup_counts().items()
+        },
+        "analyze_batching": analyze_batcher.stats(),
+        "inference_pool": inference_pool.stats(),
+        "prediction_cache": sentiment_analyzer.cache.stats() if sentiment_analyzer.cache else None,
+        "persistent_cache": (
+            sentiment_analyzer.persistent_cache.stats()
+            if sentiment_analyzer.persistent_cache else None
+        ),
+        "tweet_stream": tweet_broadcaster.stats(),
+        "rolling_aggregates": rolling_aggregator.stats(),
+        "process_memory": process_memory()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of this worker's metrics"""
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@app.get("/api/archive/tweets")
+async def get_archived_tweets(
+    limit: int = 100,
+    sentiment: str = None,
+    query: str = None,
+    start_date: str = None,
+    end_date: str = None,
+    columns: str = None
+):
+    """
+    Read scored tweets from the Parquet archive, newest first
+    - limit: Number of tweets to return (default: 100, max: 1000)
+    - sentiment / query / start_date / end_date: Pushed down to the Parquet scan
+    - columns: Comma-separated columns to return (default: all)
+    """
+    limit = max(1, min(limit, api_config.ARCHIVE_MAX_LIMIT))
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    if selected:
+        unknown = [c for c in selected if c not in parquet_store.schema.names]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {unknown}")
+    try:
+        row_filter = parquet_store.build_filter(sentiment, query, start_date, end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be ISO format")
+    
+    def read_archive():
+        # One scan keeps a running top-`limit` and counts sentiments as it goes
+        table, counts = parquet_store.newest(limit, columns=selected, filter=row_filter)
+        return table.to_pylist(), counts
+    
+    tweets, sentiment_distribution = await asyncio.to_thread(read_archive)
+    return {
+        "count": len(tweets),
+        "tweets": tweets,
+        "sentiment_distribution": sentiment_distribution,
+        "source": "parquet",
+        "generated_at": datetime.now().isoformat()
     }
 
 @app.get("/api/tweets/{tweet_id}")
 async def get_tweet_by_id(tweet_id: str):
     """Get a specific tweet by ID"""
-    # For demo, generate a tweet with the given ID
-    tweet = mock_generator.generate_tweet(int(tweet_id) if tweet_id.isdigit() else 9999)
-    tweet["id"] = tweet_id  # Use the requested ID
+    row = await asyncio.to_thread(tweet_db.get, tweet_id)
+    if row is None:
+        return JSONResponse(
+            status_code=404,
+            content={"tweet": None, "requested_id": tweet_id, "found": False}
+        )
     
     return {
-        "tweet": tweet,
+        "tweet": tweet_db.to_api(row),
         "requested_id": tweet_id,
         "found": True
     }
@@ -0,0 +1,145 @@
+"""Preload-then-fork API server sharing model weights across workers.
+
+The parent loads the model once, freezes the GC, binds the socket and forks
+the workers. Each worker inherits the weights copy-on-write, so N workers
+cost roughly one copy of the model instead of N. Per-worker RSS/PSS is
+logged periodically; PSS splits shared pages between the processes that
+map them, so summing PSS gives the true total.
+
+Run from the repository root (Linux only):
+    python -m src.api.prefork --workers 4 --port 8000
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Dict, List
+
+from src.utils.logger import project_logger
+
+logger = project_logger
+
+
+def process_memory(pid: int = None) -> Dict[str, int]:
+    """RSS, PSS, shared and private bytes of a process, from /proc smaps_rollup"""
+    pid = pid or os.getpid()
+    fields = {"Rss": 0, "Pss": 0, "Shared_Clean": 0, "Shared_Dirty": 0,
+              "Private_Clean": 0, "Private_Dirty": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, rest = line.partition(":")
+                if name in fields:
+                    fields[name] = int(rest.split()[0]) * 1024
+    except OSError:
+        return {}
+    return {
+        "pid": pid,
+        "rss_bytes": fields["Rss"],
+        "pss_bytes": fields["Pss"],
+        "shared_bytes": fields["Shared_Clean"] + fields["Shared_Dirty"],
+        "private_bytes": fields["Private_Clean"] + fields["Private_Dirty"]
+    }
+
+
+def log_memory_report(worker_pids: List[int]):
+    """Log RSS/PSS per worker and the totals"""
+    reports = [process_memory(os.getpid())] + [process_memory(pid) for pid in worker_pids]
+    reports = [r for r in reports if r]
+    for report in reports:
+        role = "parent" if report["pid"] == os.getpid() else "worker"
+        logger.info(
+            f"{role} {report['pid']}: rss={report['rss_bytes'] / 1e6:.1f}MB "
+            f"pss={report['pss_bytes'] / 1e6:.1f}MB shared={report['shared_bytes'] / 1e6:.1f}MB "
+            f"private={report['private_bytes'] / 1e6:.1f}MB"
+        )
+    logger.info(
+        f"total: rss={sum(r['rss_bytes'] for r in reports) / 1e6:.1f}MB "
+        f"pss={sum(r['pss_bytes'] for r in reports) / 1e6:.1f}MB"
+    )
+
+
+def run_worker(sock: socket.socket):
+    """Serve the app on an inherited socket (runs in the forked child)"""
+    import uvicorn
+    from src.api.main import app
+
+    config = uvicorn.Config(app, log_level="info")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(workers: int, host: str, port: int, report_interval: float = 60.0):
+    """Load the model, fork workers and supervise them until signalled"""
+    from src.api.main import app  # noqa: F401  (import before fork so workers share it)
+    from src.models.sentiment_analyzer import sentiment_analyzer
+
+    # Load weights without running a forward pass: torch must not start its
+    # intra-op thread pool before fork
+    sentiment_analyzer.load()
+
+    # Move everything allocated so far out of GC tracking so collections in
+    # the workers don't write to (and un-share) these pages
+    gc.collect()
+    gc.freeze()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock)
+            finally:
+                os._exit(0)
+        children.append(pid)
+    logger.info(f"Forked {workers} workers on {host}:{port}: {children}")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    next_report = time.monotonic() + min(report_interval, 15.0)
+    while children:
+        pid, _ = os.waitpid(-1, os.WNOHANG)
+        if pid:
+            children.remove(pid)
+            if not stopping:
+                logger.warning(f"Worker {pid} exited")
+            continue
+        if not stopping and time.monotonic() >= next_report:
+            log_memory_report(children)
+            next_report = time.monotonic() + report_interval
+        time.sleep(0.5)
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--report-interval", type=float, default=60.0,
+                        help="Seconds between per-worker memory reports")
+    args = parser.parse_args()
+    serve(args.workers, args.host, args.port, args.report_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Set
+
+from src.utils.logger import project_logger
+
+# Pushed to a subscriber whose queue overflowed; its stream ends and the
+# client reconnects with Last-Event-ID to catch up from the database
+OVERFLOW = object()
+
+
+class TweetBroadcaster:
+    """Tail newly stored tweets once and fan them out to every stream client
+
+    A single background task polls `fetch_since(seq, limit)` for rows past
+    the last insertion sequence number it saw and puts each batch on the
+    bounded queue of every subscriber, so N connected clients cost one
+    database poll rather than N. Clients resuming from an older event id
+    catch up straight from the database before switching to the live feed.
+    Listeners (e.g. aggregators) get every batch on a worker thread.
+    """
+
+    def __init__(
+        self,
+        fetch_since: Callable[[int, int], List[Dict[str, Any]]],
+        latest_seq: Callable[[], int],
+        poll_interval: float = 0.5,
+        batch_limit: int = 500,
+        queue_size: int = 100
+    ):
+        self.logger = project_logger
+        self.fetch_since = fetch_since
+        self.latest_seq = latest_seq
+        self.poll_interval = poll_interval
+        self.batch_limit = batch_limit
+        self.queue_size = queue_size
+
+        self.last_seq = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self._task: asyncio.Task = None
+
+        # Counters are only touched from the event loop thread
+        self.polls = 0
+        self.tweets_broadcast = 0
+        self.overflows = 0
+
+    async def start(self):
+        """Start tailing from the newest stored tweet"""
+        if self._task is None:
+            self.last_seq = await asyncio.to_thread(self.latest_seq)
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"Tweet broadcaster started at seq {self.last_seq}")
+
+    async def stop(self):
+        """Stop tailing"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        """Poll for new rows and fan each batch out until cancelled"""
+        while True:
+            try:
+                rows = await asyncio.to_thread(self.fetch_since, self.last_seq, self.batch_limit)
+            except Exception as e:
+                self.logger.error(f"Tweet broadcaster poll failed: {e}")
+                rows = []
+            self.polls += 1
+            if rows:
+                self.last_seq = rows[-1]["seq"]
+                self.tweets_broadcast += len(rows)
+                for listener in self._listeners:
+                    try:
+                        await asyncio.to_thread(listener, rows)
+                    except Exception as e:
+                        self.logger.error(f"Tweet broadcaster listener failed: {e}")
+                for queue in list(self._subscribers):
+                    try:
+                        queue.put_nowait(rows)
+                    except asyncio.QueueFull:
+                        self._drop(queue)
+            # A full batch means more rows are waiting
+            if len(rows) < self.batch_limit:
+                await asyncio.sleep(self.poll_interval)
+
+    def _drop(self, queue: asyncio.Queue):
+        """Disconnect a subscriber that fell too far behind"""
+        self._subscribers.discard(queue)
+        self.overflows += 1
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(OVERFLOW)
+
+    def add_listener(self, listener: Callable[[List[Dict[str, Any]]], None]):
+        """Call listener(rows) with every new batch"""
+        self._listeners.append(listener)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue that receives every batch broadcast from now on"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop delivering batches to a queue"""
+        self._subscribers.discard(queue)
+
+    async def events(
+        self,
+        since: int,
+        follow: bool = True,
+        sentiment: str = None,
+        heartbeat_seconds: float = 15.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Tweet, aggregate and control events for every row after `since`
+
+        Catches up from the database first; with follow=False it ends with
+        an "end" event carrying the last id, otherwise it stays on the live
+        feed, emitting "heartbeat" events while idle.
+        """
+        # Subscribe before catching up so nothing stored meanwhile is missed
+        queue = self.subscribe() if follow else None
+        seq = since
+        try:
+            while True:
+                rows = await asyncio.to_thread(self.fetch_since, seq, self.batch_limit)
+                if rows:
+                    seq = rows[-1]["seq"]
+                    for event in self._batch_events(rows, sentiment):
+                        yield event
+                if len(rows) < self.batch_limit:
+                    break
+
+            if not follow:
+                yield {"type": "end", "id": seq}
+                return
+
+            while True:
+                try:
+                    rows = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield {"type": "heartbeat", "id": seq}
+                    continue
+                if rows is OVERFLOW:
+                    yield {"type": "reset", "id": seq, "reason": "client too slow, resume from id"}
+                    return
+                rows = [row for row in rows if row["seq"] > seq]
+                if rows:
+                    seq = rows[-1]["seq"]
+                    for event in self._batch_events(rows, sentiment):
+                        yield event
+        finally:
+            if queue is not None:
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _batch_events(rows: List[Dict[str, Any]], sentiment: str = None) -> List[Dict[str, Any]]:
+        """One event per matching tweet, then the batch's aggregate delta"""
+        if sentiment:
+            matching = [row for row in rows if row["tweet"].get("sentiment") == sentiment.lower()]
+        else:
+            matching = rows
+        events = [{"type": "tweet", "id": row["seq"], "tweet": row["tweet"]} for row in matching]
+
+        counts: Dict[str, int] = {}
+        confidence_sum = 0.0
+        for row in matching:
+            label = row["tweet"].get("sentiment") or "unknown"
+            counts[label] = counts.get(label, 0) + 1
+            confidence_sum += row["tweet"].get("confidence") or 0.0
+        if matching:
+            events.append({
+                "type": "aggregate",
+                "id": rows[-1]["seq"],
+                "delta": {
+                    "tweets": len(matching),
+                    "sentiment": counts,
+                    "confidence_sum": round(confidence_sum, 4)
+                }
+            })
+        return events
+
+    def stats(self) -> Dict[str, Any]:
+        """Subscriber count, position and counters"""
+        return {
+            "subscribers": len(self._subscribers),
+            "last_seq": self.last_seq,
+            "polls": self.polls,
+            "tweets_broadcast": self.tweets_broadcast,
+            "overflows": self.overflows,
+            "running": self._task is not None
+        }
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Server-Sent Events frame; the id lets EventSource resume with Last-Event-ID"""
+    if event["type"] == "heartbeat":
+        return ": heartbeat\n\n"
+    data = json.dumps({k: v for k, v in event.items() if k not in ("type", "id")}, default=str)
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+def format_ndjson(event: Dict[str, Any]) -> str:
+    """One JSON object per line"""
+    return json.dumps(event, default=str) + "\n"
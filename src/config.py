@@ -1,11 +1,59 @@
+import os
+
+class ModelConfig:
+    """Sentiment model configuration"""
+    MODEL_NAME: str = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+    MODEL_PATH: str = "models/sentiment"
+    MAX_LENGTH: int = 512  # Tokens kept per text; longer texts are truncated
+    TOKEN_CACHE_SIZE: int = 50_000  # Token ID lists kept by the pre-tokenizer
+    QUANTIZE: str = None  # None (fp32) or "dynamic-int8" for CPU inference
+
+    # Inference backend: "torch" or "onnx" (onnxruntime on CPU)
+    BACKEND: str = "torch"
+    ONNX_MODEL_PATH: str = "models/onnx"  # Written by src.models.export_onnx
+
+    # Batched inference
+    BATCH_SIZE: int = 32  # Texts per forward pass in analyze_batch
+    BUCKET_BY_LENGTH: bool = True  # Group texts by token length to cut padding
+    BUCKET_BOUNDARIES: list = [16, 32, 48, 64]  # Upper token length of each bucket
+
+    # Prediction cache (keyed by normalized text + model name)
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_SIZE: int = 100_000  # Entries kept before LRU eviction
+    CACHE_TTL_SECONDS: int = 24 * 60 * 60
+
+    # Persistent prediction cache shared by workers and kept across restarts
+    PERSISTENT_CACHE_ENABLED: bool = False
+    PERSISTENT_CACHE_PATH: str = "data/prediction_cache.sqlite"
+    PERSISTENT_CACHE_MAX_ROWS: int = 5_000_000
+
+
 class TwitterConfig:
     """Twitter API configuration - Mock version"""
     USE_MOCK_DATA: bool = True  # Set to True to use mock data
     
+    # Credentials come from the environment, never from source
+    BEARER_TOKEN: str = os.getenv("TWITTER_BEARER_TOKEN")
+    API_KEY: str = os.getenv("TWITTER_API_KEY")
+    API_SECRET: str = os.getenv("TWITTER_API_SECRET")
+    ACCESS_TOKEN: str = os.getenv("TWITTER_ACCESS_TOKEN")
+    ACCESS_SECRET: str = os.getenv("TWITTER_ACCESS_SECRET")
+    
+    # Async collector (src.data.async_collector); point API_BASE_URL at
+    # src.data.replay_server to run against recorded responses
+    API_BASE_URL: str = os.getenv("TWITTER_API_BASE_URL", "https://api.twitter.com")
+    COLLECTOR_CONCURRENCY: int = 8  # Queries fetched at once (and pooled connections)
+    COLLECTOR_MAX_PAGES: int = 10  # next_token pages followed per query
+    COLLECTOR_INCREMENTAL: bool = True  # Only ask for tweets newer than each query's watermark
+    COLLECTOR_MAX_RETRIES: int = 5  # Per request, on 429/5xx/connection errors
+    COLLECTOR_TIMEOUT_SECONDS: float = 10.0
+    # Default budget per endpoint until rate-limit headers say otherwise: (requests, window seconds)
+    RATE_LIMITS = {"/2/tweets/search/recent": (450, 900)}
+    
     # Mock search parameters
     SEARCH_QUERY: str = "artificial intelligence OR machine learning OR AI"
     MAX_TWEETS: int = 50
-    LANGUAGE: str = "en"
+    LANGUAGE: str = "en"  # Added to queries as a lang: operator; None for all languages
     
     # Mock tweet data
     MOCK_TWEETS = [
@@ -19,4 +67,60 @@ class TwitterConfig:
         "The integration of AI in education shows promising results.",
         "Quantum computing will accelerate AI development exponentially.",
         "We need more regulation for responsible AI development."
-    ]
\ No newline at end of file
+    ]
+    
+    def validate(self):
+        """Raise if the credentials needed for live API calls are missing"""
+        if not self.BEARER_TOKEN:
+            raise ValueError("TWITTER_BEARER_TOKEN is not set")
+
+class PipelineConfig:
+    """Collect -> pre-inference filter -> score -> persist stages (src.data.pipeline)"""
+    QUEUE_SIZE: int = 1_000  # Items buffered in front of each stage before upstream waits
+    FILTER_WORKERS: int = 1
+    PREFILTER_MIN_CHARS: int = 5  # Shorter texts (without URLs and @mentions) are not scored
+    PREFILTER_DUPLICATE_WINDOW: int = 100_000  # Recent texts whose result exact repeats reuse
+    SCORE_WORKERS: int = 1  # Concurrent analyze_batch calls (each on its own thread)
+    SCORE_BATCH: int = 64  # Tweets per analyze_batch call
+    PERSIST_WORKERS: int = 1
+    PERSIST_BATCH: int = 500  # Tweets per storage write
+
+class ScoringConfig:
+    """Offline (re)scoring of tweet archives"""
+    CHUNK_SIZE: int = 5_000  # Rows read, scored and written per step
+    CHECKPOINT_SUFFIX: str = ".ckpt"  # Resume state kept next to the output file
+
+    # Sharded backfills (src.data.sharded_scoring)
+    WORKERS: int = 4  # Scoring processes, one shard each
+    TORCH_THREADS: int = 0  # Torch threads per worker; 0 = cpu_count // WORKERS
+
+class StorageConfig:
+    """Tweet storage"""
+    # Columnar archive (src.data.parquet_store), partitioned by collected_date/query
+    PARQUET_PATH: str = "data/tweets_parquet"
+    PARQUET_COMPRESSION: str = "zstd"
+    ARCHIVE_ENABLED: bool = True  # Stored tweets are also appended to the archive
+
+    # Queryable store behind /api/tweets (src.data.tweet_db)
+    TWEET_DB_PATH: str = "data/tweets.sqlite"
+
+    # Bloom filter of stored tweet IDs in front of the store (src.data.dedup)
+    DEDUP_CAPACITY: int = 5_000_000  # IDs before the error rate degrades (grows with the store)
+    DEDUP_ERROR_RATE: float = 0.001  # Share of new IDs that still cost a database lookup
+
+class AnalyticsConfig:
+    """Rolling aggregates behind /api/trending"""
+    MINUTE_RETENTION_MINUTES: int = 120  # Per-minute buckets kept (windows up to this are minute-exact)
+    HOUR_RETENTION_HOURS: int = 168  # Per-hour buckets kept (7 days)
+    TRENDING_WINDOWS = {"1h": 3600, "24h": 86400, "7d": 604800}
+    TRENDING_TOP_K: int = 5
+    HEAVY_HITTER_ERROR: float = 0.001  # Hashtag/topic counts overestimate by at most this fraction of a window's tweets
+    HEAVY_HITTER_MAX_COUNTERS: int = 1000  # Memory cap: counters per bucket summary, overrides the error bound
+
+# Create config instances
+model_config = ModelConfig()
+twitter_config = TwitterConfig()
+pipeline_config = PipelineConfig()
+scoring_config = ScoringConfig()
+storage_config = StorageConfig()
+analytics_config = AnalyticsConfig()
@@ -3,6 +3,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import requests
+import json
 from datetime import datetime
 import time
 import random
@@ -12,6 +13,8 @@ class DashboardConfig:
     HOST: str = "localhost"
     PORT: int = 8501
     TITLE: str = "Twitter Sentiment Analysis Dashboard - Daouda Tandian"
+    MAX_LIVE_TWEETS: int = 1000  # Streamed + paged tweets kept in the session
+    TWEETS_PER_PAGE: int = 20  # Tweets drawn per page of the Recent Tweets tab
 
 dashboard_config = DashboardConfig()
 
@@ -93,6 +96,7 @@ with st.sidebar:
     
     # Data Settings
     st.subheader("📊 Data Settings")
+    data_source = st.radio("Data Source", ["Live API", "Parquet Archive"], horizontal=True)
     tweet_limit = st.slider("Tweets to Display", 10, 100, 30)
     refresh_rate = st.slider("Auto-refresh (seconds)", 10, 300, 60)
     
@@ -125,25 +129,109 @@ st.markdown('<p class="creator-credit">Created by <strong>Daouda Tandian</strong
 st.caption(f"Real-time sentiment analysis powered by FastAPI • Last update: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 # ========== DATA FETCHING ==========
+def fetch_tweets_page(api_url: str, limit: int, cursor: str = None, sentiment: str = None):
+    """One page of /api/tweets and the cursor for the next one"""
+    params = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    if sentiment:
+        params["sentiment"] = sentiment
+    response = requests.get(f"{api_url}/api/tweets", params=params, timeout=5)
+    if response.status_code != 200:
+        return [], None
+    page = response.json()
+    return page.get("tweets", []), page.get("next_cursor")
+
+def fetch_stream_updates(api_url: str, since: int = None, sentiment: str = None):
+    """Tweets stored after stream event id `since` and the id to resume from next time
+
+    Uses the catch-up mode of /api/stream/tweets, so each refresh transfers
+    only new tweets instead of the whole page again. With since=None it
+    returns the current stream position.
+    """
+    params = {"format": "ndjson", "follow": "false"}
+    if since is not None:
+        params["since"] = since
+    if sentiment:
+        params["sentiment"] = sentiment
+    response = requests.get(f"{api_url}/api/stream/tweets", params=params, timeout=10)
+    if response.status_code != 200:
+        return [], since
+    tweets, last_id = [], since
+    for line in response.iter_lines():
+        if not line:
+            continue
+        event = json.loads(line)
+        if event["type"] == "tweet":
+            tweets.append(event["tweet"])
+        last_id = event.get("id", last_id)
+    return tweets, last_id
+
 @st.cache_data(ttl=30)  # Cache for 30 seconds
-def fetch_data(api_url: str, limit: int = 30):
-    """Fetch data from API"""
+def fetch_trending(api_url: str):
+    """Fetch trending data from the API"""
     try:
-        # Fetch tweets
-        tweets_response = requests.get(f"{api_url}/api/tweets?limit={limit}", timeout=5)
-        tweets = tweets_response.json() if tweets_response.status_code == 200 else {"tweets": []}
-        
-        # Fetch trending data
         trending_response = requests.get(f"{api_url}/api/trending", timeout=5)
-        trending = trending_response.json() if trending_response.status_code == 200 else {}
-        
-        return tweets.get("tweets", []), trending
+        return trending_response.json() if trending_response.status_code == 200 else {}
     except Exception as e:
         st.error(f"⚠️ Error fetching data: {str(e)}")
+        return {}
+
+ARCHIVE_COLUMNS = "id,text,author_id,created_at,retweets,likes,sentiment,confidence"
+
+@st.cache_data(ttl=30)
+def fetch_archive(api_url: str, limit: int = 30, sentiment: str = None):
+    """Fetch scored tweets from the Parquet archive (columns and filter pushed down)"""
+    try:
+        params = {"limit": limit, "columns": ARCHIVE_COLUMNS}
+        if sentiment:
+            params["sentiment"] = sentiment
+        response = requests.get(f"{api_url}/api/archive/tweets", params=params, timeout=10)
+        if response.status_code != 200:
+            return [], {}
+        archive = response.json()
+        
+        # Same shape as /api/tweets so the views below work unchanged
+        tweets = [{
+            **tweet,
+            "user": {"name": tweet.get("author_id"), "screen_name": tweet.get("author_id")},
+            "retweet_count": tweet.get("retweets"),
+            "favorite_count": tweet.get("likes")
+        } for tweet in archive.get("tweets", [])]
+        distribution = archive.get("sentiment_distribution")
+        return tweets, {"sentiment_distribution": distribution} if distribution else {}
+    except Exception as e:
+        st.error(f"⚠️ Error fetching archive: {str(e)}")
         return [], {}
 
 # Fetch data
-tweets, trending = fetch_data(api_url, tweet_limit)
+sentiment_param = sentiment_filter.lower() if sentiment_filter != "All" else None
+page_key = (data_source, api_url, tweet_limit, sentiment_param)
+if data_source == "Parquet Archive":
+    tweets, trending = fetch_archive(api_url, tweet_limit, sentiment_param)
+else:
+    trending = fetch_trending(api_url)
+    try:
+        if st.session_state.get("page_key") != page_key:
+            # Take the stream position first so tweets stored while the page loads arrive as updates
+            _, stream_id = fetch_stream_updates(api_url, None, sentiment_param)
+            first_page, next_cursor = fetch_tweets_page(api_url, tweet_limit, sentiment=sentiment_param)
+            st.session_state.update(
+                page_key=page_key, live_tweets=first_page, next_cursor=next_cursor, stream_id=stream_id
+            )
+        else:
+            # Later runs only fetch what was stored since the last one
+            new_tweets, st.session_state.stream_id = fetch_stream_updates(
+                api_url, st.session_state.stream_id, sentiment_param
+            )
+            if new_tweets:
+                new_ids = {t.get("id") for t in new_tweets}
+                st.session_state.live_tweets = (
+                    new_tweets[::-1] + [t for t in st.session_state.live_tweets if t.get("id") not in new_ids]
+                )[:dashboard_config.MAX_LIVE_TWEETS]
+    except Exception as e:
+        st.error(f"⚠️ Error fetching data: {str(e)}")
+    tweets = st.session_state.live_tweets if st.session_state.get("page_key") == page_key else []
 
 # Apply sentiment filter
 if sentiment_filter != "All":
@@ -358,8 +446,19 @@ with tab3:
         if search_query:
             filtered_tweets = [t for t in tweets if search_query.lower() in t.get('text', '').lower()]
         
+        # Draw one page at a time; every tweet is several widgets
+        per_page = dashboard_config.TWEETS_PER_PAGE
+        num_pages = max(1, -(-len(filtered_tweets) // per_page))
+        display_page = 1
+        if num_pages > 1:
+            display_page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, step=1)
+        start = (display_page - 1) * per_page
+        page_tweets = filtered_tweets[start:start + per_page]
+        if num_pages > 1:
+            st.caption(f"Showing {start + 1}-{start + len(page_tweets)} of {len(filtered_tweets)}")
+        
         # Display tweets
-        for i, tweet in enumerate(filtered_tweets[:20]):
+        for i, tweet in enumerate(page_tweets):
             with st.container():
                 col1, col2 = st.columns([4, 1])
                 
@@ -408,6 +507,19 @@ with tab3:
                     st.caption(f"{confidence:.0%} confidence")
                 
                 st.divider()
+        
+        # Fetch only the next page instead of re-downloading everything loaded so far
+        if data_source == "Live API" and st.session_state.get("next_cursor"):
+            if st.button("⬇️ Load more", use_container_width=True):
+                try:
+                    older, st.session_state.next_cursor = fetch_tweets_page(
+                        api_url, tweet_limit, st.session_state.next_cursor, sentiment_param
+                    )
+                    loaded_ids = {t.get("id") for t in st.session_state.live_tweets}
+                    st.session_state.live_tweets += [t for t in older if t.get("id") not in loaded_ids]
+                except Exception as e:
+                    st.error(f"⚠️ Error fetching more tweets: {str(e)}")
+                st.rerun()
     else:
         st.info("No tweets to display. Start the API server to see tweets.")
 
@@ -542,6 +654,7 @@ with footer_col1:
 with footer_col2:
     if st.button("Clear Cache"):
         st.cache_data.clear()
+        st.session_state.pop("page_key", None)
         st.rerun()
 
 with footer_col3:
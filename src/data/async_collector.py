@@ -0,0 +1,488 @@
+"""Concurrent tweet collection over one pooled async HTTP client.
+
+Each query runs as its own task, following next_token pages. Requests draw
+from a token bucket per endpoint that is refilled over the rate-limit
+window and corrected from the x-rate-limit-* headers of every response,
+so a 429 (or an exhausted budget) only parks the requests for that
+endpoint until its reset time instead of sleeping the whole process.
+Fetched pages flow through a src.data.pipeline of fetch -> dedup ->
+pre-inference filter -> batched scoring -> persist stages joined by
+bounded queues, so fetching, inference and storage writes overlap and a
+slow stage pauses the ones before it. Queries carry a lang: operator, so
+language is filtered by the API rather than after download. Runs are
+incremental: each query asks only for tweets newer than its stored
+watermark (since_id), and the dedup stage drops tweets that are already
+stored (e.g. returned by overlapping queries) before they are scored.
+With --store, scored tweets go to the tweet database and, unless
+ARCHIVE_ENABLED is off, the Parquet archive (src.data.parquet_store).
+
+Run from the repository root (against the replay server, see
+src.data.replay_server):
+    TWITTER_API_BASE_URL=http://127.0.0.1:8900 TWITTER_BEARER_TOKEN=replay \\
+        python -m src.data.async_collector "AI" "machine learning" --store
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+import httpx
+
+from src.config import pipeline_config, storage_config, twitter_config
+from src.data.dedup import TweetDeduplicator
+from src.data.parquet_store import ParquetTweetStore, parquet_store
+from src.data.pipeline import Pipeline, Stage
+from src.data.text_filters import PreInferenceFilter, with_language
+from src.data.tweet_db import TweetDatabase, tweet_db
+from src.utils.logger import project_logger
+
+SEARCH_RECENT = "/2/tweets/search/recent"
+TWEET_FIELDS = "created_at,public_metrics,author_id,lang"
+USER_FIELDS = "name,username,public_metrics"
+
+class FetchRetriesExhausted(Exception):
+    """Raised when a request still fails (429, 5xx or connection error) after every retry"""
+
+
+class TokenBucket:
+    """Request budget for one endpoint: `capacity` requests per `window` seconds
+
+    Until the endpoint has answered, tokens refill continuously at
+    capacity / window. After that the server's fixed window is followed:
+    x-rate-limit-remaining sets the tokens, and the budget refills to
+    x-rate-limit-limit at x-rate-limit-reset. A 429 blocks until the reset.
+    """
+
+    def __init__(self, capacity: int, window_seconds: float):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.tokens = float(capacity)
+        self.reset_at = None  # time.monotonic() of the server's next window, once known
+        self.blocked_until = 0.0  # time.monotonic() before which nothing is sent
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        """Add the tokens earned since the last update"""
+        if self.reset_at is None:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.capacity / self.window_seconds)
+        elif now >= self.reset_at:
+            self.tokens = float(self.capacity)
+            self.reset_at = None
+        self._updated = now
+
+    def _wait_for_token(self, now: float) -> float:
+        """Seconds until the next token is available"""
+        if self.reset_at is not None:
+            return self.reset_at - now
+        return (1 - self.tokens) * self.window_seconds / self.capacity
+
+    async def acquire(self):
+        """Wait until a request may be sent, then spend one token"""
+        # Waiters queue on the lock, so they are served in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    wait = self.blocked_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                else:
+                    wait = self._wait_for_token(now)
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+
+    def block_for(self, seconds: float):
+        """Send nothing for the next `seconds`"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: httpx.Headers):
+        """Adopt the server's x-rate-limit-limit / -remaining / -reset (epoch seconds)"""
+        try:
+            limit = int(headers["x-rate-limit-limit"])
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset = float(headers["x-rate-limit-reset"])
+        except (KeyError, ValueError):
+            return
+        now = time.monotonic()
+        self._refill(now)
+        if limit > 0:
+            self.capacity = limit
+        # The server's count wins; with requests in flight it can be briefly
+        # optimistic, and the resulting 429 is retried after the reset
+        self.tokens = float(remaining)
+        self.reset_at = now + max(0.0, reset - time.time())
+        if remaining <= 0:
+            self.block_for(self.reset_at - now)
+
+    def stats(self) -> Dict[str, Any]:
+        """Capacity, current tokens and time spent waiting"""
+        return {
+            "capacity": self.capacity,
+            "tokens": round(self.tokens, 2),
+            "blocked_for_seconds": round(max(0.0, self.blocked_until - time.monotonic()), 2),
+            "waited_seconds": round(self.waited_seconds, 2)
+        }
+
+
+def parse_search_page(body: Dict[str, Any], query: str) -> List[Dict[str, Any]]:
+    """Tweets of one search response in the shape TwitterClient.search_tweets returns (unscored)"""
+    users = {user["id"]: user for user in body.get("includes", {}).get("users", [])}
+    collected_at = datetime.now().isoformat()
+    tweets = []
+    for item in body.get("data") or []:
+        metrics = item.get("public_metrics") or {}
+        user = users.get(item.get("author_id"))
+        tweet = {
+            "id": str(item["id"]),
+            "text": item.get("text", "")[:500],
+            "author_id": str(item["author_id"]) if item.get("author_id") else None,
+            "created_at": item.get("created_at"),
+            "retweets": metrics.get("retweet_count", 0),
+            "likes": metrics.get("like_count", 0),
+            "replies": metrics.get("reply_count", 0),
+            "lang": item.get("lang"),
+            "query": query,
+            "source": "twitter",
+            "collected_at": collected_at
+        }
+        if user:
+            tweet["user"] = {
+                "name": user.get("name"),
+                "screen_name": user.get("username"),
+                "followers_count": (user.get("public_metrics") or {}).get("followers_count")
+            }
+        tweets.append(tweet)
+    return tweets
+
+
+class AsyncTwitterCollector:
+    """Runs many search queries concurrently and scores what they return in batches"""
+
+    def __init__(
+        self,
+        base_url: str = None,
+        bearer_token: str = None,
+        concurrency: int = None,
+        max_pages: int = None,
+        transport: httpx.AsyncBaseTransport = None,
+        incremental: bool = None,
+        db: TweetDatabase = None,
+        archive: ParquetTweetStore = None
+    ):
+        self.logger = project_logger
+        self.base_url = base_url or twitter_config.API_BASE_URL
+        self.bearer_token = bearer_token or twitter_config.BEARER_TOKEN
+        self.concurrency = concurrency or twitter_config.COLLECTOR_CONCURRENCY
+        self.max_pages = max_pages or twitter_config.COLLECTOR_MAX_PAGES
+        self.transport = transport  # e.g. httpx.ASGITransport(app) to skip the network
+        if incremental is None:
+            incremental = twitter_config.COLLECTOR_INCREMENTAL
+        self.incremental = incremental
+        self.db = db or tweet_db
+        if archive is None and storage_config.ARCHIVE_ENABLED:
+            archive = parquet_store
+        self.archive = archive
+        self.deduplicator = TweetDeduplicator(self.db)
+        self.prefilter = PreInferenceFilter()
+        self.newest_ids: Dict[str, str] = {}  # Newest tweet ID returned per query this run
+        self.paginated: Set[str] = set()  # Queries whose last page had no next_token this run
+
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.client: Optional[httpx.AsyncClient] = None
+        self.recorded: Dict[str, List[Dict[str, Any]]] = {}
+        self.record = False
+
+        self.requests = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.pages = 0
+        self.tweets_fetched = 0
+        self.tweets_scored = 0
+
+    async def __aenter__(self) -> "AsyncTwitterCollector":
+        if not self.bearer_token:
+            twitter_config.validate()
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.bearer_token}"},
+            timeout=twitter_config.COLLECTOR_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency
+            ),
+            transport=self.transport
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    def store(self, tweets: List[Dict[str, Any]]) -> int:
+        """Persist sink: append scored tweets to the archive, then insert them into the database"""
+        # Archive first: if the database write fails the batch is fetched again
+        # (its watermark holds) and archived twice, rather than never archived
+        # because the dedup stage finds it already stored
+        if self.archive is not None:
+            self.archive.append(tweets)
+        return self.db.insert_many(tweets)
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """The token bucket for an endpoint, created from RATE_LIMITS on first use"""
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            capacity, window = twitter_config.RATE_LIMITS.get(endpoint, (15, 900))
+            bucket = self.buckets[endpoint] = TokenBucket(capacity, window)
+        return bucket
+
+    async def get(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET an endpoint within its rate limit, retrying 429s, 5xx and connection errors"""
+        bucket = self.bucket(endpoint)
+        last_failure = None
+        for attempt in range(twitter_config.COLLECTOR_MAX_RETRIES + 1):
+            await bucket.acquire()
+            self.requests += 1
+            try:
+                response = await self.client.get(endpoint, params=params)
+            except httpx.TransportError as e:
+                last_failure = f"{type(e).__name__}: {e}"
+                self.logger.warning(f"{endpoint} request failed ({e}), retrying")
+                self.retries += 1
+                await asyncio.sleep(min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0))
+                continue
+
+            bucket.update_from_headers(response.headers)
+            if response.status_code == 429:
+                last_failure = "HTTP 429"
+                self.rate_limited += 1
+                self.retries += 1
+                if "x-rate-limit-reset" not in response.headers:
+                    # No reset time given: back off exponentially
+                    bucket.block_for(min(60.0, 2 ** attempt))
+                else:
+                    bucket.block_for(max(0.0, float(response.headers["x-rate-limit-reset"]) - time.time()))
+                self.logger.warning(f"{endpoint} rate limited, waiting for reset")
+                continue
+            if response.status_code >= 500:
+                last_failure = f"HTTP {response.status_code}"
+                self.retries += 1
+                await asyncio.sleep(min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0))
+                continue
+
+            response.raise_for_status()
+            body = response.json()
+            if self.record:
+                self.recorded.setdefault(endpoint, []).append({
+                    "params": {k: params.get(k) for k in ("query", "pagination_token")},
+                    "status": response.status_code,
+                    "body": body
+                })
+            return body
+        raise FetchRetriesExhausted(
+            f"{endpoint} still failing after {twitter_config.COLLECTOR_MAX_RETRIES} retries (last: {last_failure})"
+        )
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 100,
+        max_pages: int = None,
+        since_id: str = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Pages of unscored tweets for a query (newer than since_id), following next_token"""
+        params = {
+            "query": with_language(query),
+            "max_results": max(10, min(max_results, 100)),
+            "tweet.fields": TWEET_FIELDS,
+            "expansions": "author_id",
+            "user.fields": USER_FIELDS
+        }
+        if since_id:
+            params["since_id"] = since_id
+        for _ in range(max_pages or self.max_pages):
+            body = await self.get(SEARCH_RECENT, params)
+            self.pages += 1
+            # Pages run newest to oldest, so the first page holds the newest id
+            newest_id = body.get("meta", {}).get("newest_id")
+            if newest_id and query not in self.newest_ids:
+                self.newest_ids[query] = newest_id
+            yield parse_search_page(body, query)
+            next_token = body.get("meta", {}).get("next_token")
+            if not next_token:
+                self.paginated.add(query)
+                return
+            params["pagination_token"] = next_token
+        self.logger.warning(
+            f"Stopped {query!r} after {max_pages or self.max_pages} pages with more available; "
+            f"its watermark stays put (raise COLLECTOR_MAX_PAGES to catch up)"
+        )
+
+    def build_pipeline(
+        self,
+        sink: Callable[[List[Dict[str, Any]]], Any] = None,
+        counts: Dict[str, int] = None,
+        completed: List[str] = None,
+        failed: Set[str] = None
+    ) -> Pipeline:
+        """fetch -> dedup -> prefilter -> score (-> persist) stages, each with its own workers and queue"""
+        from src.models.sentiment_analyzer import sentiment_analyzer
+
+        async def fetch(queries: List[str]):
+            # One query per batch; pages are forwarded as they arrive
+            for query in queries:
+                since_id = None
+                if self.incremental:
+                    since_id = await asyncio.to_thread(self.db.get_watermark, query)
+                async for tweets in self.search(query, since_id=since_id):
+                    self.tweets_fetched += len(tweets)
+                    if counts is not None:
+                        counts[query] = counts.get(query, 0) + len(tweets)
+                    yield tweets
+                # Only a query read to its last page may advance its watermark
+                if completed is not None and query in self.paginated:
+                    completed.append(query)
+
+        def guarded(fn: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]):
+            """Stage function that notes the queries of a batch it fails on (the pipeline drops the batch)"""
+            def run(tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+                try:
+                    return fn(tweets)
+                except Exception:
+                    if failed is not None:
+                        failed.update(tweet["query"] for tweet in tweets)
+                    raise
+            return run
+
+        def drop_duplicates(tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            return self.deduplicator.filter_new(tweets)[0]
+
+        def score(tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            # Repeated texts (retweets, copy-paste posts) are kept and reuse their first result
+            results = self.prefilter.score([t["text"] for t in tweets], sentiment_analyzer.analyze_batch)
+            scored = []
+            for tweet, result in zip(tweets, results):
+                if result["label"] == "ERROR":
+                    # Not stored, and its query's watermark holds so it is fetched again
+                    if failed is not None:
+                        failed.add(tweet["query"])
+                    continue
+                tweet["sentiment"] = result["label"]
+                tweet["confidence"] = result["score"]
+                scored.append(tweet)
+            self.tweets_scored += len(scored)
+            return scored
+
+        def persist(tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            sink(tweets)
+            return tweets
+
+        queue_size = pipeline_config.QUEUE_SIZE
+        stages = [
+            # Queries waiting for a fetcher
+            Stage("fetch", fetch, workers=self.concurrency, queue_size=max(queue_size, self.concurrency)),
+            Stage("dedup", guarded(drop_duplicates), batch_size=queue_size, queue_size=queue_size, threaded=True),
+            Stage("prefilter", guarded(self.prefilter.filter), workers=pipeline_config.FILTER_WORKERS,
+                  batch_size=queue_size, queue_size=queue_size),
+            Stage("score", guarded(score), workers=pipeline_config.SCORE_WORKERS,
+                  batch_size=pipeline_config.SCORE_BATCH, queue_size=queue_size, threaded=True)
+        ]
+        if sink is not None:
+            stages.append(Stage("persist", guarded(persist), workers=pipeline_config.PERSIST_WORKERS,
+                                batch_size=pipeline_config.PERSIST_BATCH, queue_size=queue_size, threaded=True))
+        return Pipeline(stages)
+
+    async def collect(
+        self,
+        queries: List[str],
+        sink: Callable[[List[Dict[str, Any]]], Any] = None
+    ) -> Dict[str, Any]:
+        """Fetch every query concurrently and score/store tweets as they arrive; returns a summary"""
+        counts = {query: 0 for query in queries}
+        completed: List[str] = []
+        failed: Set[str] = set()
+        self.newest_ids = {}
+        self.paginated = set()
+        self.deduplicator.reset_run()
+        self.prefilter.reset_run()
+        pipeline = self.build_pipeline(sink, counts, completed, failed)
+        pipeline_stats = await pipeline.run(queries)
+
+        # Advance watermarks only for queries fetched to the last page with
+        # every batch stored, so a cut-short or failed run fetches the
+        # missing tweets again next time
+        advanced = [query for query in completed if query not in failed and query in self.newest_ids]
+        if failed:
+            self.logger.error(f"Watermarks kept for {sorted(failed)}: a batch failed after fetching")
+        if sink is not None and self.incremental:
+            for query in advanced:
+                await asyncio.to_thread(self.db.set_watermark, query, self.newest_ids[query])
+
+        dedup = self.deduplicator.stats()
+        # The score stage's own throughput prices the texts the pre-filter kept away from it
+        prefilter = self.prefilter.stats(pipeline_stats["stages"]["score"]["items_per_busy_sec"])
+        seconds = pipeline.wall_seconds
+        summary = {
+            "queries": counts,
+            "tweets_fetched": self.tweets_fetched,
+            "duplicates_skipped": dedup["duplicates"],
+            "duplicate_ratio": dedup["duplicate_ratio"],
+            "dropped_before_inference": prefilter["dropped"],
+            "repeats_reused": prefilter["duplicates"]["reused"],
+            "tweets_scored": self.tweets_scored,
+            "pages": self.pages,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "seconds": round(seconds, 2),
+            "tweets_per_sec": round(self.tweets_scored / seconds, 1) if seconds else 0.0,
+            "buckets": {endpoint: bucket.stats() for endpoint, bucket in self.buckets.items()},
+            "dedup": dedup,
+            "prefilter": prefilter,
+            "watermarks": {query: self.newest_ids[query] for query in advanced},
+            "failed_queries": sorted(failed),
+            "pipeline": pipeline_stats
+        }
+        self.logger.info(
+            f"Collected {self.tweets_scored} tweets for {len(queries)} queries in {seconds:.1f}s "
+            f"({self.requests} requests, {self.rate_limited} rate limited, "
+            f"{dedup['duplicate_ratio']:.1%} duplicates skipped, "
+            f"{prefilter['dropped']} dropped before inference, "
+            f"{prefilter['duplicates']['reused']} repeats reused, "
+            f"bottleneck: {pipeline_stats['bottleneck']})"
+        )
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("queries", nargs="*", default=[twitter_config.SEARCH_QUERY])
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--store", action="store_true", help="Store scored tweets in the database and archive")
+    parser.add_argument("--record", default=None, help="Save responses as a replay fixture (JSON)")
+    args = parser.parse_args()
+
+    async def run():
+        async with AsyncTwitterCollector(
+            base_url=args.base_url, concurrency=args.concurrency, max_pages=args.max_pages
+        ) as collector:
+            collector.record = bool(args.record)
+            summary = await collector.collect(args.queries, collector.store if args.store else None)
+            if args.record:
+                with open(args.record, "w", encoding="utf-8") as f:
+                    json.dump({"endpoints": collector.recorded}, f, indent=1)
+            return summary
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Tweet-ID deduplication: a Bloom filter in front of the tweet store.
+
+Most tweets in an incremental run are new, and for those the filter
+answers "definitely not seen" from memory. Only IDs the filter reports as
+possibly seen (real duplicates plus a configurable false-positive rate)
+are confirmed against the database in one batched lookup, so new tweets
+never cost a query and a false positive never drops a tweet.
+"""
+import hashlib
+import math
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from src.config import storage_config
+from src.data.tweet_db import TweetDatabase, tweet_db
+from src.utils.logger import project_logger
+
+
+class BloomFilter:
+    """Bit array with k hash positions per item; no false negatives"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Optimal size and hash count for `capacity` items at `error_rate`
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        """k bit positions by double hashing one 128-bit digest"""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        """Set the item's bits"""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def expected_error_rate(self) -> float:
+        """False-positive rate at the current fill"""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, fill and false-positive rate"""
+        return {
+            "capacity": self.capacity,
+            "items": self.count,
+            "bytes": len(self.bits),
+            "hashes": self.hashes,
+            "target_error_rate": self.error_rate,
+            "expected_error_rate": round(self.expected_error_rate(), 6)
+        }
+
+
+class TweetDeduplicator:
+    """Splits tweets into new ones and ones already stored or already accepted this run"""
+
+    def __init__(self, db: TweetDatabase = None, capacity: int = None, error_rate: float = None):
+        self.logger = project_logger
+        self.db = db or tweet_db
+        self.capacity = capacity or storage_config.DEDUP_CAPACITY
+        self.error_rate = error_rate or storage_config.DEDUP_ERROR_RATE
+        self.bloom: BloomFilter = None
+        # Accepted but possibly not stored yet (scoring and persisting run later)
+        self.pending: Set[str] = set()
+
+        self.checked = 0
+        self.duplicates = 0
+        self.bloom_hits = 0
+        self.false_positives = 0
+
+    def load(self):
+        """Build the filter from every stored tweet ID"""
+        stored = self.db.count()
+        # Leave room to grow before the error rate degrades
+        self.bloom = BloomFilter(max(self.capacity, stored * 2), self.error_rate)
+        for tweet_id in self.db.iter_ids():
+            self.bloom.add(tweet_id)
+        self.logger.info(f"Dedup filter loaded with {stored} tweet ids ({len(self.bloom.bits) / 1e6:.1f} MB)")
+
+    def filter_new(self, tweets: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """New tweets (in order) and the number of duplicates dropped"""
+        if self.bloom is None:
+            self.load()
+        self.checked += len(tweets)
+
+        # Only ids the filter may have seen need a database lookup
+        maybe_seen = [str(t["id"]) for t in tweets if str(t["id"]) in self.bloom]
+        self.bloom_hits += len(maybe_seen)
+        stored = self.db.existing_ids(maybe_seen) if maybe_seen else set()
+        self.false_positives += sum(1 for tweet_id in maybe_seen
+                                    if tweet_id not in stored and tweet_id not in self.pending)
+
+        new = []
+        for tweet in tweets:
+            tweet_id = str(tweet["id"])
+            if tweet_id in stored or tweet_id in self.pending:
+                continue
+            self.pending.add(tweet_id)
+            self.bloom.add(tweet_id)
+            new.append(tweet)
+        self.duplicates += len(tweets) - len(new)
+        return new, len(tweets) - len(new)
+
+    def reset_run(self):
+        """Forget this run's accepted ids (they are stored by now)"""
+        self.pending.clear()
+        self.checked = self.duplicates = self.bloom_hits = self.false_positives = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the current run and the filter's state"""
+        return {
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "duplicate_ratio": round(self.duplicates / self.checked, 4) if self.checked else 0.0,
+            "db_lookups": self.bloom_hits,
+            "false_positives": self.false_positives,
+            "bloom": self.bloom.stats() if self.bloom else None
+        }
@@ -1,97 +1,253 @@
-import random
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import List, Dict
+"""Seeded mock tweet generator for the API, demos and load tests.
+
+Tweets are drawn in bulk with NumPy: one vectorized draw per column
+(template/topic/hashtag, user, timestamp, metrics, sentiment) instead of a
+loop of random calls per tweet. Texts come from a precomputed table of
+every template/topic/hashtag combination, so Arrow and DataFrame output
+carry them as dictionary-encoded columns without building one string per
+row. The same seed gives the same tweets (timestamps are offsets from the
+time of generation); ids are sequential from start_id.
+
+Run from the repository root:
+    python -m src.data.mock_twitter --count 1000000 --seed 7 --output mock.parquet
+    python -m src.data.mock_twitter --stream --rate 2000 --batch-size 500 --duration 60
+"""
+import argparse
 import json
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.utils.logger import project_logger
+
+USERS = [
+    "TechEnthusiast42", "AIAnalyst", "DataSciencePro", "FutureTechWatch",
+    "MLResearcher", "AIEthicist", "StartupFounder", "TechJournalist",
+    "AcademicResearcher", "IndustryExpert"
+]
+
+HASHTAGS = [
+    "#ArtificialIntelligence", "#MachineLearning", "#AI", "#DeepLearning",
+    "#DataScience", "#Tech", "#Innovation", "#FutureTech", "#NLP", "#Robotics"
+]
+
+TOPICS = [
+    "AI in healthcare", "Machine learning algorithms", "Natural language processing",
+    "Computer vision", "Robotics", "AI ethics", "Quantum computing",
+    "Neural networks", "Big data", "Automation"
+]
+
+TEMPLATES = [
+    "Exciting developments in {topic} recently! {hashtag}",
+    "New research paper on {topic} shows promising results. {hashtag}",
+    "Discussion: What are the ethical implications of {topic}? {hashtag}",
+    "Just attended a great conference about {topic}. Amazing insights! {hashtag}",
+    "Industry leaders are investing heavily in {topic}. {hashtag}",
+    "Concerns about {topic} need to be addressed by policymakers. {hashtag}",
+    "Breakthrough in {topic} could change everything. {hashtag}",
+    "My thoughts on the future of {topic}. {hashtag}",
+    "Recent advancements in {topic} are impressive. {hashtag}",
+    "How will {topic} impact our daily lives? {hashtag}"
+]
+
+# Realistic sentiment mix, and the confidence range drawn for each label
+SENTIMENTS = ["positive", "neutral", "negative"]
+SENTIMENT_WEIGHTS = [0.45, 0.35, 0.20]
+CONFIDENCE_LOW = np.array([0.75, 0.70, 0.75])
+CONFIDENCE_HIGH = np.array([0.98, 0.90, 0.95])
+
+SOURCE = "mock_data"
+MAX_AGE_SECONDS = 7 * 24 * 60 * 60  # created_at falls within the last week
+
 
 class MockTwitterData:
-    """Generate realistic mock Twitter data for testing"""
-    
-    def __init__(self, num_tweets: int = 100):
+    """Generate realistic mock Twitter data in bulk"""
+
+    def __init__(self, num_tweets: int = 100, seed: int = None, start_id: int = 1000):
+        self.logger = project_logger
         self.num_tweets = num_tweets
-        self.users = [
-            "TechEnthusiast42", "AIAnalyst", "DataSciencePro", "FutureTechWatch",
-            "MLResearcher", "AIEthicist", "StartupFounder", "TechJournalist",
-            "AcademicResearcher", "IndustryExpert"
+        self.rng = np.random.default_rng(seed)
+        self.next_id = start_id
+        self.users = USERS
+        self.hashtags = HASHTAGS
+        self.topics = TOPICS
+        # Text for every (template, topic, hashtag), indexed by the flattened combination
+        self.texts = [
+            template.format(topic=topic, hashtag=hashtag)
+            for template in TEMPLATES for topic in TOPICS for hashtag in HASHTAGS
         ]
-        
-        self.hashtags = [
-            "#ArtificialIntelligence", "#MachineLearning", "#AI", "#DeepLearning",
-            "#DataScience", "#Tech", "#Innovation", "#FutureTech", "#NLP", "#Robotics"
-        ]
-        
-        self.topics = [
-            "AI in healthcare", "Machine learning algorithms", "Natural language processing",
-            "Computer vision", "Robotics", "AI ethics", "Quantum computing",
-            "Neural networks", "Big data", "Automation"
+
+    def _draw(self, count: int, max_age_seconds: float = MAX_AGE_SECONDS) -> Dict[str, np.ndarray]:
+        """One vectorized draw per column: indices into the lookup tables plus numeric values"""
+        rng = self.rng
+        ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        self.next_id += count
+
+        hashtag = rng.integers(0, len(HASHTAGS), count)
+        text = (rng.integers(0, len(TEMPLATES), count) * len(TOPICS)
+                + rng.integers(0, len(TOPICS), count)) * len(HASHTAGS) + hashtag
+        sentiment = rng.choice(len(SENTIMENTS), size=count, p=SENTIMENT_WEIGHTS)
+        confidence = CONFIDENCE_LOW[sentiment] + (CONFIDENCE_HIGH - CONFIDENCE_LOW)[sentiment] * rng.random(count)
+
+        now = np.datetime64(datetime.now(timezone.utc).replace(tzinfo=None), "us")
+        age_us = (rng.random(count) * max_age_seconds * 1e6).astype(np.int64)
+        return {
+            "id": ids,
+            "text": text,
+            "created_at": now - age_us.astype("timedelta64[us]"),
+            "user": rng.integers(0, len(USERS), count),
+            "followers_count": rng.integers(100, 10_001, count),
+            "retweet_count": rng.integers(0, 501, count),
+            "favorite_count": rng.integers(0, 1_001, count),
+            "hashtag": hashtag,
+            "sentiment": sentiment,
+            "confidence": np.round(confidence, 2)
+        }
+
+    def generate_tweets(self, num_tweets: int = None, max_age_seconds: float = MAX_AGE_SECONDS) -> List[Dict]:
+        """Mock tweets as API-style dicts (created_at within max_age_seconds of now)"""
+        if num_tweets is None:
+            num_tweets = self.num_tweets
+        columns = self._draw(num_tweets, max_age_seconds)
+        texts, users, hashtags = self.texts, USERS, HASHTAGS
+        # Plain Python values column by column; the per-tweet loop only assembles dicts
+        rows = zip(
+            columns["id"].tolist(),
+            columns["text"].tolist(),
+            np.datetime_as_string(columns["created_at"], unit="us", timezone="UTC").tolist(),
+            columns["user"].tolist(),
+            columns["followers_count"].tolist(),
+            columns["retweet_count"].tolist(),
+            columns["favorite_count"].tolist(),
+            columns["hashtag"].tolist(),
+            columns["sentiment"].tolist(),
+            columns["confidence"].tolist()
+        )
+        return [
+            {
+                "id": str(tweet_id),
+                "text": texts[text],
+                "created_at": created,
+                "user": {
+                    "name": users[user],
+                    "screen_name": users[user].lower(),
+                    "followers_count": followers
+                },
+                "retweet_count": retweets,
+                "favorite_count": favorites,
+                "hashtags": [hashtags[hashtag]],
+                "sentiment": SENTIMENTS[sentiment],
+                "confidence": confidence,
+                "source": SOURCE
+            }
+            for tweet_id, text, created, user, followers, retweets, favorites, hashtag, sentiment, confidence in rows
         ]
-    
+
     def generate_tweet(self) -> Dict:
         """Generate a single mock tweet"""
-        user = random.choice(self.users)
-        topic = random.choice(self.topics)
-        hashtag = random.choice(self.hashtags)
-        
-        tweets = [
-            f"Exciting developments in {topic} recently! {hashtag}",
-            f"New research paper on {topic} shows promising results. {hashtag}",
-            f"Discussion: What are the ethical implications of {topic}? {hashtag}",
-            f"Just attended a great conference about {topic}. Amazing insights! {hashtag}",
-            f"Industry leaders are investing heavily in {topic}. {hashtag}",
-            f"Concerns about {topic} need to be addressed by policymakers. {hashtag}",
-            f"Breakthrough in {topic} could change everything. {hashtag}",
-            f"My thoughts on the future of {topic}. {hashtag}",
-            f"Recent advancements in {topic} are impressive. {hashtag}",
-            f"How will {topic} impact our daily lives? {hashtag}"
-        ]
-        
-        # Generate random date within last 7 days
-        days_ago = random.randint(0, 7)
-        hours_ago = random.randint(0, 23)
-        minutes_ago = random.randint(0, 59)
-        
-        created_at = datetime.now() - timedelta(
-            days=days_ago, 
-            hours=hours_ago, 
-            minutes=minutes_ago
-        )
-        
-        return {
-            "id": str(random.randint(1000000000000000000, 9999999999999999999)),
-            "text": random.choice(tweets),
-            "created_at": created_at.isoformat(),
-            "user": {
-                "name": user,
-                "screen_name": user.lower(),
-                "followers_count": random.randint(100, 10000)
-            },
-            "retweet_count": random.randint(0, 500),
-            "favorite_count": random.randint(0, 1000),
-            "hashtags": [hashtag],
-            "sentiment": random.choice(["positive", "neutral", "negative"])
-        }
-    
-    def generate_tweets(self, num_tweets: int = None) -> List[Dict]:
-        """Generate multiple mock tweets"""
+        return self.generate_tweets(1)[0]
+
+    def to_arrow(self, num_tweets: int = None, max_age_seconds: float = MAX_AGE_SECONDS) -> pa.Table:
+        """Mock tweets as an Arrow table; repeated strings are dictionary-encoded"""
         if num_tweets is None:
             num_tweets = self.num_tweets
-        
-        return [self.generate_tweet() for _ in range(num_tweets)]
-    
-    def to_dataframe(self, num_tweets: int = None) -> pd.DataFrame:
-        """Convert mock tweets to pandas DataFrame"""
-        tweets = self.generate_tweets(num_tweets)
-        return pd.DataFrame(tweets)
-    
+        columns = self._draw(num_tweets, max_age_seconds)
+        user = columns["user"].astype(np.int8)
+
+        def encoded(indices: np.ndarray, values: List[str]) -> pa.DictionaryArray:
+            return pa.DictionaryArray.from_arrays(pa.array(indices), pa.array(values))
+
+        return pa.table({
+            "id": pa.array(columns["id"]).cast(pa.string()),
+            "text": encoded(columns["text"].astype(np.int16), self.texts),
+            "created_at": pa.array(columns["created_at"], pa.timestamp("us", tz="UTC")),
+            "user_name": encoded(user, USERS),
+            "screen_name": encoded(user, [name.lower() for name in USERS]),
+            "followers_count": pa.array(columns["followers_count"], pa.int32()),
+            "retweet_count": pa.array(columns["retweet_count"], pa.int32()),
+            "favorite_count": pa.array(columns["favorite_count"], pa.int32()),
+            "hashtag": encoded(columns["hashtag"].astype(np.int8), HASHTAGS),
+            "sentiment": encoded(columns["sentiment"].astype(np.int8), SENTIMENTS),
+            "confidence": pa.array(columns["confidence"], pa.float32()),
+            "source": encoded(np.zeros(num_tweets, dtype=np.int8), [SOURCE])
+        })
+
+    def to_dataframe(self, num_tweets: int = None, max_age_seconds: float = MAX_AGE_SECONDS) -> pd.DataFrame:
+        """Mock tweets as a DataFrame (string columns are categoricals)"""
+        return self.to_arrow(num_tweets, max_age_seconds).to_pandas()
+
+    def stream(
+        self,
+        batch_size: int = 1000,
+        rate: float = None,
+        total: int = None,
+        output: str = "records"
+    ) -> Iterator[Union[List[Dict], pd.DataFrame, pa.Table]]:
+        """Batches of fresh tweets ("records", "dataframe" or "arrow"), paced to `rate` tweets/sec
+
+        Runs until `total` tweets were produced, or forever when total is
+        None. Pacing follows a fixed schedule, so time spent by the
+        consumer between batches does not lower the rate.
+        """
+        make = {"records": self.generate_tweets, "dataframe": self.to_dataframe, "arrow": self.to_arrow}[output]
+        produced = 0
+        started = time.perf_counter()
+        while total is None or produced < total:
+            count = batch_size if total is None else min(batch_size, total - produced)
+            if rate:
+                delay = started + produced / rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            yield make(count, 0)
+            produced += count
+
     def save_to_json(self, filename: str = "mock_tweets.json"):
         """Save mock tweets to JSON file"""
         tweets = self.generate_tweets()
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(tweets, f, indent=2, default=str)
 
-# Usage example
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50, help="Tweets to generate")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Write to .parquet, .csv or .json (default: print a sample)")
+    parser.add_argument("--stream", action="store_true", help="Generate fresh batches at --rate until --duration")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Tweets per second when streaming")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to stream")
+    args = parser.parse_args()
+
+    mock = MockTwitterData(num_tweets=args.count, seed=args.seed)
+    if args.stream:
+        started = time.perf_counter()
+        produced = 0
+        for batch in mock.stream(args.batch_size, args.rate, total=int(args.rate * args.duration), output="arrow"):
+            produced += batch.num_rows
+        elapsed = time.perf_counter() - started
+        print(f"Streamed {produced} tweets in {elapsed:.1f}s ({produced / elapsed:,.0f} tweets/sec)")
+        return
+
+    started = time.perf_counter()
+    if args.output and args.output.endswith(".json"):
+        mock.save_to_json(args.output)
+    else:
+        table = mock.to_arrow()
+        if args.output and args.output.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            pq.write_table(table, args.output)
+        elif args.output:
+            table.to_pandas().to_csv(args.output, index=False)
+        else:
+            print(table.slice(0, 5).to_pandas())
+    elapsed = time.perf_counter() - started
+    print(f"Generated {args.count} mock tweets in {elapsed:.2f}s ({args.count / elapsed:,.0f} tweets/sec)")
+
+
 if __name__ == "__main__":
-    mock = MockTwitterData(num_tweets=50)
-    df = mock.to_dataframe()
-    print(f"Generated {len(df)} mock tweets")
-    print(df.head())
\ No newline at end of file
+    main()
@@ -0,0 +1,304 @@
+"""Columnar tweet archive: Parquet files partitioned by collection date and query.
+
+Each append writes new files under
+    <base>/collected_date=YYYY-MM-DD/query=<url-encoded query>/
+so runs never rewrite existing data. Reads go through pyarrow.dataset, so
+only the requested columns are decoded (projection) and partitions and
+row groups that cannot match the filter are skipped (predicate pushdown).
+The collector's --store sink and TwitterClient.save fill it alongside
+the tweet database (storage_config.ARCHIVE_ENABLED turns that off).
+
+Run from the repository root:
+    python -m src.data.parquet_store stats
+    python -m src.data.parquet_store compact
+"""
+import argparse
+import json
+import os
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.config import storage_config
+from src.utils.logger import project_logger
+
+TWEET_SCHEMA = pa.schema([
+    pa.field("id", pa.string(), nullable=False),
+    pa.field("text", pa.string()),
+    pa.field("author_id", pa.string()),
+    pa.field("created_at", pa.timestamp("us", tz="UTC")),
+    pa.field("retweets", pa.int32()),
+    pa.field("likes", pa.int32()),
+    pa.field("replies", pa.int32()),
+    pa.field("sentiment", pa.dictionary(pa.int8(), pa.string())),
+    pa.field("confidence", pa.float32()),
+    pa.field("collected_at", pa.timestamp("us", tz="UTC")),
+])
+
+PARTITION_SCHEMA = pa.schema([
+    pa.field("collected_date", pa.date32()),
+    pa.field("query", pa.string()),
+])
+
+METRIC_COLUMNS = ("retweets", "likes", "replies")
+
+# Partition value for tweets without a query; an empty hive value reads back as null
+NO_QUERY = "(none)"
+
+
+def _to_utc(value: Any) -> Optional[datetime]:
+    """ISO string or datetime to an aware UTC datetime (naive values are local time)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.astimezone(timezone.utc)
+
+
+class ParquetTweetStore:
+    """Append-only Parquet dataset of scored tweets with typed columns"""
+
+    def __init__(self, base_dir: str = None):
+        self.logger = project_logger
+        self.base_dir = Path(base_dir or storage_config.PARQUET_PATH)
+        self.partitioning = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+    @property
+    def schema(self) -> pa.Schema:
+        """File columns plus the partition columns"""
+        return pa.unify_schemas([TWEET_SCHEMA, PARTITION_SCHEMA])
+
+    def to_table(self, tweets: List[Dict[str, Any]]) -> pa.Table:
+        """Typed Arrow table (with partition columns) from search_tweets-style dicts"""
+        rows = []
+        for tweet in tweets:
+            collected_at = _to_utc(tweet.get("collected_at")) or datetime.now(timezone.utc)
+            row = {
+                "id": str(tweet["id"]),
+                "text": tweet.get("text"),
+                "author_id": str(tweet["author_id"]) if tweet.get("author_id") is not None else None,
+                "created_at": _to_utc(tweet.get("created_at")),
+                "sentiment": str(tweet["sentiment"]).lower() if tweet.get("sentiment") else None,
+                "confidence": tweet.get("confidence"),
+                "collected_at": collected_at,
+                "collected_date": collected_at.date(),
+                "query": tweet.get("query") or NO_QUERY
+            }
+            for column in METRIC_COLUMNS:
+                row[column] = tweet.get(column)
+            rows.append(row)
+        return pa.Table.from_pylist(rows, schema=self.schema)
+
+    def append(self, tweets: List[Dict[str, Any]]) -> int:
+        """Write tweets as new files in their date/query partitions"""
+        if not tweets:
+            return 0
+        table = self.to_table(tweets)
+        ds.write_dataset(
+            table,
+            self.base_dir,
+            format="parquet",
+            partitioning=self.partitioning,
+            basename_template=f"part-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            file_options=ds.ParquetFileFormat().make_write_options(compression=storage_config.PARQUET_COMPRESSION)
+        )
+        self.logger.info(f"Appended {table.num_rows} tweets to {self.base_dir}")
+        return table.num_rows
+
+    def dataset(self) -> Optional[ds.Dataset]:
+        """The whole archive as a lazy dataset, or None if nothing was written yet"""
+        if not self.base_dir.exists():
+            return None
+        return ds.dataset(
+            self.base_dir,
+            format="parquet",
+            schema=self.schema,
+            partitioning=self.partitioning
+        )
+
+    @staticmethod
+    def build_filter(
+        sentiment: str = None,
+        query: str = None,
+        start_date: str = None,
+        end_date: str = None
+    ) -> Optional[ds.Expression]:
+        """Filter expression over created_at, sentiment and the partition columns"""
+        conditions = []
+        if sentiment:
+            conditions.append(pc.field("sentiment") == sentiment.lower())
+        if query == "" or query == NO_QUERY:
+            # Older files wrote an empty partition value, which reads back as null
+            conditions.append((pc.field("query") == NO_QUERY) | pc.field("query").is_null())
+        elif query is not None:
+            conditions.append(pc.field("query") == query)
+        if start_date:
+            start = _to_utc(start_date)
+            # Partition pruning: nothing collected before the start can be newer than it
+            conditions.append(pc.field("collected_date") >= pa.scalar(start.date(), pa.date32()))
+            conditions.append(pc.field("created_at") >= pa.scalar(start, TWEET_SCHEMA.field("created_at").type))
+        if end_date:
+            end = _to_utc(end_date)
+            conditions.append(pc.field("created_at") <= pa.scalar(end, TWEET_SCHEMA.field("created_at").type))
+        if not conditions:
+            return None
+        expression = conditions[0]
+        for condition in conditions[1:]:
+            expression = expression & condition
+        return expression
+
+    def read(
+        self,
+        columns: List[str] = None,
+        filter: ds.Expression = None,
+        limit: int = None
+    ) -> pa.Table:
+        """Only `columns` of the rows matching `filter`, optionally the first `limit`"""
+        dataset = self.dataset()
+        if dataset is None:
+            schema = self.schema
+            return schema.empty_table() if columns is None else pa.schema(
+                [schema.field(name) for name in columns]
+            ).empty_table()
+        if limit is not None:
+            return dataset.head(limit, columns=columns, filter=filter)
+        return dataset.to_table(columns=columns, filter=filter)
+
+    def newest(
+        self,
+        limit: int,
+        columns: List[str] = None,
+        filter: ds.Expression = None
+    ) -> Tuple[pa.Table, Dict[str, int]]:
+        """The `limit` newest matching rows (by created_at) and per-sentiment counts, in one scan
+
+        Each batch is merged into a running top-`limit`, so memory stays
+        bounded by limit + one batch however much of the archive matches.
+        """
+        scan_columns = None if columns is None else list(dict.fromkeys(columns + ["created_at", "sentiment"]))
+        schema = self.schema if scan_columns is None else pa.schema([self.schema.field(name) for name in scan_columns])
+        top = schema.empty_table()
+        counts: Dict[str, int] = {}
+        dataset = self.dataset()
+        if dataset is None:
+            return (top if columns is None else top.select(columns)), counts
+
+        newest_first = [("created_at", "descending")]
+        for batch in dataset.to_batches(columns=scan_columns, filter=filter):
+            if batch.num_rows == 0:
+                continue
+            sentiments = batch.column(batch.schema.get_field_index("sentiment"))
+            if pa.types.is_dictionary(sentiments.type):
+                sentiments = sentiments.dictionary_decode()
+            for item in pc.value_counts(sentiments):
+                label = item["values"].as_py()
+                counts[label] = counts.get(label, 0) + item["counts"].as_py()
+            candidates = pa.concat_tables([top, pa.Table.from_batches([batch]).cast(top.schema)])
+            top = candidates.take(pc.select_k_unstable(candidates, k=limit, sort_keys=newest_first))
+
+        top = top.sort_by(newest_first)
+        return (top if columns is None else top.select(columns)), counts
+
+    def sentiment_counts(self, filter: ds.Expression = None) -> Dict[str, int]:
+        """Tweets per sentiment label, reading only the sentiment column"""
+        table = self.read(columns=["sentiment"], filter=filter)
+        if table.num_rows == 0:
+            return {}
+        counts = pc.value_counts(table.column("sentiment").combine_chunks().dictionary_decode())
+        return {item["values"].as_py(): item["counts"].as_py() for item in counts}
+
+    def partitions(self) -> List[Path]:
+        """Leaf partition directories"""
+        if not self.base_dir.exists():
+            return []
+        return sorted({path.parent for path in self.base_dir.rglob("*.parquet")})
+
+    @staticmethod
+    def _finish_compaction(journal: Path):
+        """Complete or roll back an interrupted compaction from its journal"""
+        entry = json.loads(journal.read_text())
+        partition = journal.parent
+        target = partition / entry["target"]
+        if target.exists():
+            # The merged file is in place: the sources are duplicates now
+            for name in entry["sources"]:
+                (partition / name).unlink(missing_ok=True)
+        else:
+            # Crashed before the rename: the sources are still the data
+            (partition / entry["temp"]).unlink(missing_ok=True)
+        journal.unlink()
+
+    def compact(self, collected_date: date = None) -> int:
+        """Rewrite each partition's small files as one file; returns files removed
+
+        Each partition is merged under a journal (hidden files, which
+        dataset reads skip): the merged file is written to a temp name and
+        renamed into place atomically, then the sources are deleted. A
+        crash at any point is resolved by the next compact(), which
+        finishes deleting the sources or discards the temp file.
+        """
+        removed = 0
+        for partition in self.partitions():
+            if collected_date and f"collected_date={collected_date.isoformat()}" not in partition.parts:
+                continue
+            for journal in partition.glob(".compact-*.json"):
+                self._finish_compaction(journal)
+            files = sorted(partition.glob("*.parquet"))
+            if len(files) < 2:
+                continue
+            token = uuid.uuid4().hex[:8]
+            target = partition / f"compacted-{token}.parquet"
+            temp = partition / f".compacted-{token}.parquet.tmp"
+            journal = partition / f".compact-{token}.json"
+            journal.write_text(json.dumps({
+                "target": target.name, "temp": temp.name, "sources": [path.name for path in files]
+            }))
+            table = pa.concat_tables([pq.read_table(path, schema=TWEET_SCHEMA) for path in files])
+            pq.write_table(table, temp, compression=storage_config.PARQUET_COMPRESSION)
+            os.replace(temp, target)
+            for path in files:
+                path.unlink()
+            journal.unlink()
+            removed += len(files) - 1
+        self.logger.info(f"Compacted {self.base_dir}: {removed} files removed")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Partition, file, row and byte counts"""
+        files = list(self.base_dir.rglob("*.parquet")) if self.base_dir.exists() else []
+        return {
+            "path": str(self.base_dir),
+            "partitions": len({path.parent for path in files}),
+            "files": len(files),
+            "rows": sum(pq.ParquetFile(path).metadata.num_rows for path in files),
+            "bytes": sum(path.stat().st_size for path in files)
+        }
+
+
+# Singleton instance
+parquet_store = ParquetTweetStore()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["stats", "compact"])
+    parser.add_argument("--path", default=storage_config.PARQUET_PATH)
+    parser.add_argument("--date", default=None, help="Only compact this collected_date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    store = ParquetTweetStore(args.path)
+    if args.command == "compact":
+        store.compact(date.fromisoformat(args.date) if args.date else None)
+    for name, value in store.stats().items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
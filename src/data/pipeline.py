@@ -0,0 +1,212 @@
+"""Staged asyncio pipeline with bounded queues between stages.
+
+Each stage runs `workers` tasks that take up to `batch_size` ready items
+from the stage's input queue, process them and put the results on the
+next stage's queue. Queues are bounded, so a slow stage makes the stages
+before it wait (backpressure) instead of buffering without limit, and
+every stage keeps working on its own items while the others do too:
+fetching continues during inference, and storage writes overlap both.
+
+A stage function may be
+  - a plain function, run on a worker thread when threaded=True (for
+    blocking work such as inference or database writes) or inline,
+  - a coroutine function returning a list of items,
+  - an async generator yielding lists, forwarded as they arrive (e.g.
+    one page of tweets at a time).
+
+Per-stage stats (items in/out, busy/idle/blocked seconds, queue depth)
+show where time goes: the bottleneck is the stage whose workers are busy
+most of the time while the stage after it sits idle.
+"""
+import asyncio
+import inspect
+import time
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Union
+
+from src.utils.logger import project_logger
+from src.utils.metrics import metrics
+
+# Tells a worker that no more input is coming
+_END = object()
+
+stage_items = metrics.counter("pipeline_items_total", "Items emitted by each pipeline stage", ("stage",))
+stage_batch_latency = metrics.histogram(
+    "pipeline_batch_seconds", "Time each pipeline stage spends per batch", ("stage",)
+)
+stage_queue_depth = metrics.gauge("pipeline_queue_depth", "Items waiting in each stage's input queue", ("stage",))
+
+
+class Stage:
+    """One pipeline step and its input queue"""
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[List[Any]], Any],
+        workers: int = 1,
+        batch_size: int = 1,
+        queue_size: int = 1000,
+        threaded: bool = False
+    ):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.threaded = threaded
+        self.queue: asyncio.Queue = None
+        self.next: "Stage" = None  # Set by Pipeline; None for the last stage
+
+        self.items_in = 0
+        self.items_out = 0
+        self.batches = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.idle_seconds = 0.0  # Waiting for input
+        self.blocked_seconds = 0.0  # Waiting for room in the next queue
+        self.max_depth = 0
+        self._depth_sum = 0
+
+    def stats(self, wall_seconds: float) -> Dict[str, Any]:
+        """Throughput, utilization and queue depth for a run of `wall_seconds`"""
+        capacity = self.workers * wall_seconds
+        return {
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "batches": self.batches,
+            "errors": self.errors,
+            "items_per_sec": round(self.items_in / wall_seconds, 1) if wall_seconds else 0.0,
+            # Items one busy worker gets through per second: the stage's capacity
+            "items_per_busy_sec": round(self.items_in / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "idle_seconds": round(self.idle_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "utilization": round(self.busy_seconds / capacity, 3) if capacity else 0.0,
+            "queue_size": self.queue_size,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.max_depth,
+            "mean_queue_depth": round(self._depth_sum / self.batches, 1) if self.batches else 0.0
+        }
+
+
+class Pipeline:
+    """Runs items from a source through stages connected by bounded queues"""
+
+    def __init__(self, stages: List[Stage]):
+        self.logger = project_logger
+        self.stages = stages
+        for stage, following in zip(stages, stages[1:]):
+            stage.next = following
+        self.wall_seconds = 0.0
+
+    async def _put(self, stage: Stage, items: Iterable[Any]) -> float:
+        """Hand items to the next stage (or drop them after the last); returns seconds spent waiting for room"""
+        target = stage.next
+        count = 0
+        started = time.perf_counter()
+        for item in items:
+            if target is not None:
+                await target.queue.put(item)
+                stage_queue_depth.inc((target.name,))
+            count += 1
+        blocked = time.perf_counter() - started if target is not None else 0.0
+        stage.blocked_seconds += blocked
+        stage.items_out += count
+        stage_items.inc((stage.name,), count)
+        return blocked
+
+    async def _take(self, stage: Stage) -> List[Any]:
+        """Up to batch_size ready items (waits for the first); _END is returned alone"""
+        started = time.perf_counter()
+        item = await stage.queue.get()
+        stage.idle_seconds += time.perf_counter() - started
+        if item is _END:
+            return [item]
+        stage._depth_sum += stage.queue.qsize() + 1
+        stage.max_depth = max(stage.max_depth, stage.queue.qsize() + 1)
+        batch = [item]
+        while len(batch) < stage.batch_size and not stage.queue.empty():
+            item = stage.queue.get_nowait()
+            if item is _END:
+                # Leave the end marker for the next take
+                stage.queue.put_nowait(item)
+                break
+            batch.append(item)
+        stage_queue_depth.dec((stage.name,), len(batch))
+        return batch
+
+    async def _process(self, stage: Stage, batch: List[Any]):
+        """Run the stage function over a batch and forward what it produces"""
+        started = time.perf_counter()
+        blocked = 0.0
+        try:
+            if stage.threaded:
+                blocked += await self._put(stage, await asyncio.to_thread(stage.fn, batch) or [])
+            elif inspect.isasyncgenfunction(stage.fn):
+                async for items in stage.fn(batch):
+                    blocked += await self._put(stage, items)
+            else:
+                result = stage.fn(batch)
+                if inspect.isawaitable(result):
+                    result = await result
+                blocked += await self._put(stage, result or [])
+        except Exception as e:
+            stage.errors += 1
+            self.logger.error(f"Pipeline stage {stage.name} failed on {len(batch)} items: {e}")
+        elapsed = time.perf_counter() - started - blocked
+        stage.busy_seconds += elapsed
+        stage_batch_latency.observe(elapsed, (stage.name,))
+
+    async def _worker(self, stage: Stage):
+        """Process batches until the end marker arrives"""
+        while True:
+            batch = await self._take(stage)
+            if batch[0] is _END:
+                return
+            stage.items_in += len(batch)
+            stage.batches += 1
+            await self._process(stage, batch)
+
+    async def _run_stage(self, stage: Stage):
+        """Run a stage's workers, then tell the next stage that input has ended"""
+        await asyncio.gather(*(self._worker(stage) for _ in range(stage.workers)))
+        if stage.next is not None:
+            for _ in range(stage.next.workers):
+                await stage.next.queue.put(_END)
+
+    async def run(self, source: Union[AsyncIterable[Any], Iterable[Any]]) -> Dict[str, Any]:
+        """Feed every source item (sync or async iterable) through the stages; returns per-stage stats"""
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(self._run_stage(stage)) for stage in self.stages]
+        try:
+            first = self.stages[0]
+            if hasattr(source, "__aiter__"):
+                async for item in source:
+                    await first.queue.put(item)
+                    stage_queue_depth.inc((first.name,))
+            else:
+                for item in source:
+                    await first.queue.put(item)
+                    stage_queue_depth.inc((first.name,))
+            for _ in range(first.workers):
+                await first.queue.put(_END)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        self.wall_seconds = time.perf_counter() - started
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage stats and the stage most likely limiting throughput"""
+        stages = {stage.name: stage.stats(self.wall_seconds) for stage in self.stages}
+        bottleneck = max(self.stages, key=lambda stage: stage.busy_seconds / stage.workers) if self.stages else None
+        return {
+            "seconds": round(self.wall_seconds, 3),
+            "stages": stages,
+            "bottleneck": bottleneck.name if bottleneck else None
+        }
@@ -0,0 +1,248 @@
+"""Local stand-in for the Twitter v2 search API that replays recorded responses.
+
+Responses come from a fixture written by `async_collector --record` (or a
+synthetic one built from the mock tweets) and are looked up by path, query
+and pagination_token; a lang: operator in the query (e.g. "(AI) lang:en")
+also matches the bare query and keeps that language only, and since_id
+trims each page to newer tweets. The server keeps its own rate limit per
+endpoint, sends x-rate-limit-* headers on every response and answers 429
+once the budget is spent; it can also answer the first N requests with
+429 and add latency, so collectors can be exercised without network
+access.
+
+Run from the repository root:
+    python -m src.data.replay_server --synthetic "AI" "machine learning" --limit 20 --window 5
+    python -m src.data.replay_server --fixture recorded.json --inject-429 3 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from src.config import twitter_config
+from src.data.text_filters import LANG_OPERATOR
+from src.utils.logger import project_logger
+
+SEARCH_RECENT = "/2/tweets/search/recent"
+
+
+def build_synthetic_fixture(
+    queries: List[str],
+    pages: int = 3,
+    per_page: int = 10,
+    seed: int = 7
+) -> Dict[str, Any]:
+    """Fixture in the recorded format with `pages` pages of mock tweets per query"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    entries = []
+    # Pages run newest to oldest, like the real API
+    next_id = 10**18 + len(queries) * pages * per_page + 1
+    for query in queries:
+        for page in range(pages):
+            data, users = [], []
+            for _ in range(per_page):
+                next_id -= 1
+                author = str(rng.randint(1, 10_000))
+                data.append({
+                    "id": str(next_id),
+                    # Distinct texts, so each costs a forward pass instead of reusing a repeat's result
+                    "text": f"{rng.choice(twitter_config.MOCK_TWEETS)} ({query} {next_id % 100_000})",
+                    "author_id": author,
+                    "created_at": (now - timedelta(seconds=rng.randint(0, 86_400))).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                    "lang": "en",
+                    "public_metrics": {
+                        "retweet_count": rng.randint(0, 100),
+                        "reply_count": rng.randint(0, 20),
+                        "like_count": rng.randint(0, 500),
+                        "quote_count": 0
+                    }
+                })
+                users.append({
+                    "id": author,
+                    "name": f"User {author}",
+                    "username": f"user{author}",
+                    "public_metrics": {"followers_count": rng.randint(0, 50_000)}
+                })
+            meta = {"result_count": per_page, "newest_id": data[0]["id"], "oldest_id": data[-1]["id"]}
+            if page + 1 < pages:
+                meta["next_token"] = f"{query}:{page + 1}"
+            entries.append({
+                "params": {"query": query, "pagination_token": f"{query}:{page}" if page else None},
+                "status": 200,
+                "body": {"data": data, "includes": {"users": users}, "meta": meta}
+            })
+    return {"endpoints": {SEARCH_RECENT: entries}}
+
+
+class RateWindow:
+    """Fixed-window request budget for one endpoint, as the real API reports it"""
+
+    def __init__(self, limit: int, window_seconds: float):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.reset_at = time.time() + window_seconds
+        self.used = 0
+
+    def take(self) -> Tuple[bool, Dict[str, str]]:
+        """Spend one request if any are left; returns (allowed, rate-limit headers)"""
+        now = time.time()
+        if now >= self.reset_at:
+            self.reset_at = now + self.window_seconds
+            self.used = 0
+        allowed = self.used < self.limit
+        if allowed:
+            self.used += 1
+        return allowed, {
+            "x-rate-limit-limit": str(self.limit),
+            "x-rate-limit-remaining": str(self.limit - self.used),
+            "x-rate-limit-reset": str(math.ceil(self.reset_at))
+        }
+
+
+def _split_language(query: str) -> Tuple[str, str]:
+    """Query without its lang: operator (and the parentheses it added), and the language"""
+    match = LANG_OPERATOR.search(query or "")
+    if match is None or match.group().startswith("-"):
+        return query, None
+    base = (query[:match.start()] + query[match.end():]).strip()
+    if base.startswith("(") and base.endswith(")"):
+        base = base[1:-1]
+    return base, match.group().split(":", 1)[1]
+
+
+def _in_language(body: Dict[str, Any], language: str) -> Dict[str, Any]:
+    """Page body keeping only tweets in `language` (pagination is unchanged)"""
+    data = [tweet for tweet in body["data"] if tweet.get("lang") == language]
+    page = {**body, "meta": {**body.get("meta", {}), "result_count": len(data)}, "data": data}
+    if not data:
+        page.pop("data")
+    return page
+
+
+def _newer_than(body: Dict[str, Any], since_id: str) -> Dict[str, Any]:
+    """Page body keeping only tweets newer than since_id; pagination stops once older ones appear"""
+    since = int(since_id)
+    data = [tweet for tweet in body["data"] if int(tweet["id"]) > since]
+    meta = {"result_count": len(data)}
+    if data:
+        meta["newest_id"] = max(data, key=lambda tweet: int(tweet["id"]))["id"]
+        meta["oldest_id"] = min(data, key=lambda tweet: int(tweet["id"]))["id"]
+    if len(data) == len(body["data"]) and "next_token" in body.get("meta", {}):
+        meta["next_token"] = body["meta"]["next_token"]
+    page = {**body, "meta": meta}
+    if data:
+        page["data"] = data
+    else:
+        page.pop("data", None)
+        page.pop("includes", None)
+    return page
+
+
+def create_app(
+    fixture: Dict[str, Any],
+    limit: int = 450,
+    window_seconds: float = 900,
+    inject_429: int = 0,
+    latency_ms: float = 0.0
+) -> FastAPI:
+    """Replay app serving `fixture` under a per-endpoint rate limit"""
+    logger = project_logger
+    responses: Dict[Tuple[str, str, Any], Dict[str, Any]] = {}
+    for path, entries in fixture.get("endpoints", {}).items():
+        for entry in entries:
+            params = entry.get("params", {})
+            responses[(path, params.get("query"), params.get("pagination_token"))] = entry
+
+    app = FastAPI(title="Twitter API replay server")
+    app.state.windows = {}
+    app.state.stats = {"requests": 0, "served": 0, "rate_limited": 0, "misses": 0}
+    app.state.inject_429 = inject_429
+
+    @app.get("/replay/stats")
+    async def replay_stats():
+        return app.state.stats
+
+    @app.get("/2/{path:path}")
+    async def replay(path: str, request: Request):
+        endpoint = f"/2/{path}"
+        stats = app.state.stats
+        stats["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+        window = app.state.windows.get(endpoint)
+        if window is None:
+            window = app.state.windows[endpoint] = RateWindow(limit, window_seconds)
+        allowed, headers = window.take()
+        if app.state.inject_429 > 0:
+            app.state.inject_429 -= 1
+            allowed = False
+            headers["x-rate-limit-remaining"] = "0"
+            headers["x-rate-limit-reset"] = str(math.ceil(time.time() + 1))
+        if not allowed:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                {"title": "Too Many Requests", "detail": "Too Many Requests", "status": 429},
+                status_code=429,
+                headers=headers
+            )
+
+        query = request.query_params.get("query")
+        token = request.query_params.get("pagination_token")
+        key = (endpoint, query, token)
+        entry = responses.get(key)
+        language = None
+        if entry is None:
+            # Fixtures built for the bare query also answer its lang:-restricted form
+            base, language = _split_language(query)
+            entry = responses.get((endpoint, base, token)) if language else None
+        if entry is None:
+            stats["misses"] += 1
+            logger.debug(f"No recorded response for {key}")
+            return JSONResponse({"meta": {"result_count": 0}}, headers=headers)
+        stats["served"] += 1
+        body = entry["body"]
+        if language and body.get("data"):
+            body = _in_language(body, language)
+        since_id = request.query_params.get("since_id")
+        if since_id and body.get("data"):
+            body = _newer_than(body, since_id)
+        return JSONResponse(body, status_code=entry.get("status", 200), headers=headers)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", default=None, help="Recorded responses (JSON from async_collector --record)")
+    parser.add_argument("--synthetic", nargs="*", default=None, metavar="QUERY",
+                        help="Serve generated pages for these queries instead of a fixture")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=450, help="Requests allowed per window and endpoint")
+    parser.add_argument("--window", type=float, default=900, help="Rate-limit window in seconds")
+    parser.add_argument("--inject-429", type=int, default=0, help="Answer the first N requests with 429")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            fixture = json.load(f)
+    else:
+        fixture = build_synthetic_fixture(args.synthetic or [twitter_config.SEARCH_QUERY], args.pages)
+    app = create_app(fixture, args.limit, args.window, args.inject_429, args.latency_ms)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
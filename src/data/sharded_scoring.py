@@ -0,0 +1,219 @@
+"""Multi-process sharded scoring for offline backfills.
+
+The input archive is cut into N contiguous byte ranges aligned to record
+boundaries, and each range is scored by its own spawned process running
+stream_scoring.score_file with a private SentimentAnalyzer. Each process
+caps torch at cpu_count // N threads so the workers don't oversubscribe
+the cores. Shard outputs are concatenated in input order, so the result
+has the same rows in the same order as a single-process run.
+
+Shards keep their own checkpoints, so rerunning the same command after
+an interruption resumes every unfinished shard.
+
+Run from the repository root:
+    python -m src.data.sharded_scoring data/tweets.csv data/tweets_scored.csv --workers 8
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.config import model_config, scoring_config
+from src.data.stream_scoring import detect_format, read_header, read_lines, score_file
+from src.utils.logger import project_logger
+
+logger = project_logger
+
+
+def shard_offsets(path: Path, shards: int) -> List[int]:
+    """shards + 1 byte offsets splitting the records of path into contiguous ranges"""
+    size = path.stat().st_size
+    fmt = detect_format(path)
+    start = read_header(path)[1] if fmt == "csv" else 0
+    targets = [start + (size - start) * i // shards for i in range(1, shards)]
+
+    boundaries = [start]
+    with open(path, "rb") as f:
+        if fmt == "jsonl":
+            # Seek to each target and skip to the next line start
+            for target in targets:
+                f.seek(max(target - 1, boundaries[-1]))
+                f.readline()
+                boundaries.append(max(f.tell(), boundaries[-1]))
+        else:
+            # Quoted fields may contain newlines, so CSV has to be parsed to find row starts
+            f.seek(start)
+            pending = iter(targets)
+            target = next(pending, None)
+            for _ in csv.reader(read_lines(f)):
+                if target is None:
+                    break
+                if f.tell() >= target:
+                    boundaries.append(f.tell())
+                    target = next(pending, None)
+    boundaries += [size] * (shards + 1 - len(boundaries))
+    return boundaries
+
+
+def _init_worker(torch_threads: int):
+    """Cap torch threads before the worker loads a model"""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(torch_threads)
+    import torch
+    torch.set_num_threads(torch_threads)
+
+
+def _score_shard(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Score one shard with a process-local analyzer (runs in the worker)"""
+    from src.models.sentiment_analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer(job["model_name"], quantize=job["quantize"], backend=job["backend"])
+    if not job["cache"]:
+        analyzer.cache = analyzer.persistent_cache = None  # Every row goes through the model
+    analyzer.warmup()  # Keep model load time out of the shard's rows/sec
+    return score_file(
+        job["input"],
+        job["output"],
+        text_column=job["text_column"],
+        chunk_size=job["chunk_size"],
+        batch_size=job["batch_size"],
+        resume=job["resume"],
+        analyzer=analyzer,
+        start_offset=job["start_offset"],
+        end_offset=job["end_offset"],
+        fieldnames=job["fieldnames"]
+    )
+
+
+def merge_shards(shard_paths: List[Path], output_path: Path):
+    """Concatenate shard outputs in order, keeping only the first CSV header"""
+    is_csv = detect_format(output_path) == "csv"
+    with open(output_path, "wb") as out:
+        for index, shard_path in enumerate(shard_paths):
+            with open(shard_path, "rb") as f:
+                if is_csv and index > 0:
+                    f.readline()
+                shutil.copyfileobj(f, out, 1024 * 1024)
+
+
+def score_sharded(
+    input_path: str,
+    output_path: str,
+    workers: int = None,
+    text_column: str = "text",
+    chunk_size: int = None,
+    batch_size: int = None,
+    torch_threads: int = None,
+    resume: bool = True,
+    keep_shards: bool = False,
+    model_name: str = None,
+    quantize: str = None,
+    backend: str = None,
+    cache: bool = True
+) -> Dict[str, Any]:
+    """Score input_path into output_path with `workers` processes, one shard each"""
+    input_path, output_path = Path(input_path), Path(output_path)
+    workers = workers or scoring_config.WORKERS
+    torch_threads = torch_threads or scoring_config.TORCH_THREADS or max(1, (os.cpu_count() or 1) // workers)
+    shard_dir = output_path.with_name(output_path.name + ".shards")
+    if not resume and shard_dir.exists():
+        shutil.rmtree(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    plan_path = shard_dir / "plan.json"
+    plan = json.loads(plan_path.read_text()) if plan_path.exists() else None
+    if not plan or plan["input"] != str(input_path) or plan["workers"] != workers:
+        plan = {"input": str(input_path), "workers": workers,
+                "offsets": shard_offsets(input_path, workers)}
+        plan_path.write_text(json.dumps(plan))
+    offsets = plan["offsets"]
+    fieldnames = read_header(input_path)[0] if detect_format(input_path) == "csv" else None
+
+    suffix = output_path.suffix
+    shard_paths = [shard_dir / f"shard-{index:04d}{suffix}" for index in range(workers)]
+    jobs = [{
+        "input": str(input_path),
+        "output": str(shard_paths[index]),
+        "text_column": text_column,
+        "chunk_size": chunk_size,
+        "batch_size": batch_size,
+        "resume": resume,
+        "start_offset": offsets[index],
+        "end_offset": offsets[index + 1],
+        "fieldnames": fieldnames,
+        "model_name": model_name or model_config.MODEL_NAME,
+        "quantize": quantize if quantize is not None else model_config.QUANTIZE,
+        "backend": backend or model_config.BACKEND,
+        "cache": cache
+    } for index in range(workers)]
+    logger.info(f"Scoring {input_path} in {workers} shards ({torch_threads} torch threads per worker)")
+
+    # spawn, not fork: each worker starts clean with its own torch thread pool
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(torch_threads,)
+    ) as executor:
+        shard_summaries = list(executor.map(_score_shard, jobs))
+
+    merge_shards(shard_paths, output_path)
+    if not keep_shards:
+        shutil.rmtree(shard_dir)
+
+    elapsed = time.perf_counter() - started
+    rows = sum(summary["rows"] for summary in shard_summaries)
+    logger.info(f"Finished {input_path}: {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/sec)")
+    return {
+        "input": str(input_path),
+        "output": str(output_path),
+        "workers": workers,
+        "torch_threads": torch_threads,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else 0.0,
+        "shard_rows": [summary["rows"] for summary in shard_summaries],
+        "shard_seconds": [summary["seconds"] for summary in shard_summaries]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV or JSONL file to score")
+    parser.add_argument("output", help="CSV or JSONL file to write")
+    parser.add_argument("--workers", type=int, default=scoring_config.WORKERS)
+    parser.add_argument("--torch-threads", type=int, default=None,
+                        help="Torch threads per worker (default: cpu_count // workers)")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--chunk-size", type=int, default=scoring_config.CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=None, help="Texts per forward pass")
+    parser.add_argument("--model", default=None, help="Model name or local path")
+    parser.add_argument("--no-resume", action="store_true", help="Discard shard checkpoints and start over")
+    parser.add_argument("--keep-shards", action="store_true", help="Keep per-shard outputs after merging")
+    args = parser.parse_args()
+
+    summary = score_sharded(
+        args.input,
+        args.output,
+        workers=args.workers,
+        text_column=args.text_column,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        torch_threads=args.torch_threads,
+        resume=not args.no_resume,
+        keep_shards=args.keep_shards,
+        model_name=args.model
+    )
+    for name, value in summary.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
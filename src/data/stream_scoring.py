@@ -0,0 +1,218 @@
+"""Stream-score large CSV/JSONL tweet archives with bounded memory.
+
+The input is read in chunks, each chunk is scored with one batched
+SentimentAnalyzer call, and results are appended to the output before the
+next chunk is read. A checkpoint next to the output records the input
+offset and output size after every chunk, so an interrupted run resumes
+where it stopped without duplicating rows.
+
+Run from the repository root:
+    python -m src.data.stream_scoring data/tweets.csv data/tweets_scored.csv
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from src.config import scoring_config
+from src.utils.logger import project_logger
+
+logger = project_logger
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def detect_format(path: Path) -> str:
+    """csv or jsonl, from the file suffix"""
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported file type {path.suffix!r}, expected one of {sorted(FORMATS)}")
+
+
+def read_lines(f) -> Iterator[str]:
+    """Decoded lines of a binary file; f.tell() stays an exact byte offset between records"""
+    while True:
+        line = f.readline()
+        if not line:
+            return
+        yield line.decode("utf-8")
+
+
+def read_header(path: Path) -> Tuple[List[str], int]:
+    """CSV column names and the byte offset of the first data row"""
+    with open(path, "rb") as f:
+        fieldnames = next(csv.reader(read_lines(f)))
+        return fieldnames, f.tell()
+
+
+def iter_chunks(
+    path: Path,
+    chunk_size: int,
+    offset: int = 0,
+    fieldnames: List[str] = None,
+    end_offset: int = None
+) -> Iterator[Tuple[List[Dict[str, Any]], int, List[str]]]:
+    """Yield (records, offset after the chunk, CSV header) for records in [offset, end_offset)"""
+    fmt = detect_format(path)
+    if fmt == "csv" and offset == 0:
+        fieldnames, offset = read_header(path)
+    if end_offset is not None and offset >= end_offset:
+        return
+    with open(path, "rb") as f:
+        f.seek(offset)
+        if fmt == "csv":
+            reader = csv.reader(read_lines(f))
+        else:
+            reader = (line for line in read_lines(f) if line.strip())
+
+        chunk = []
+        for row in reader:
+            chunk.append(dict(zip(fieldnames, row)) if fmt == "csv" else json.loads(row))
+            at_end = end_offset is not None and f.tell() >= end_offset
+            if len(chunk) >= chunk_size or at_end:
+                yield chunk, f.tell(), fieldnames
+                chunk = []
+            if at_end:
+                return
+        if chunk:
+            yield chunk, f.tell(), fieldnames
+
+
+def _load_checkpoint(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: Path, state: Dict[str, Any]):
+    """Write the checkpoint atomically"""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    text_column: str = "text",
+    chunk_size: int = None,
+    batch_size: int = None,
+    resume: bool = True,
+    analyzer=None,
+    start_offset: int = 0,
+    end_offset: int = None,
+    fieldnames: List[str] = None
+) -> Dict[str, Any]:
+    """Score every record of input_path into output_path, chunk by chunk
+
+    Adds "sentiment" and "confidence" fields (overwriting existing ones).
+    start_offset/end_offset restrict scoring to a byte range of the input
+    (a shard); a CSV range that skips the header needs its fieldnames.
+    Returns a summary with row counts and throughput.
+    """
+    if analyzer is None:
+        from src.models.sentiment_analyzer import sentiment_analyzer as analyzer
+
+    input_path, output_path = Path(input_path), Path(output_path)
+    chunk_size = chunk_size or scoring_config.CHUNK_SIZE
+    checkpoint_path = output_path.with_name(output_path.name + scoring_config.CHECKPOINT_SUFFIX)
+    out_format = detect_format(output_path)
+
+    state = {"input": str(input_path), "start_offset": start_offset, "end_offset": end_offset,
+             "offset": start_offset, "rows": 0, "output_bytes": 0, "fieldnames": fieldnames}
+    if resume and checkpoint_path.exists():
+        saved = _load_checkpoint(checkpoint_path)
+        if all(saved.get(key) == state[key] for key in ("input", "start_offset", "end_offset")):
+            state = saved
+            logger.info(f"Resuming {input_path} at row {state['rows']} (offset {state['offset']})")
+
+    # Drop anything written after the last checkpoint (e.g. a chunk cut off by a crash)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "a", encoding="utf-8"):
+        pass
+    os.truncate(output_path, state["output_bytes"])
+
+    started = time.perf_counter()
+    rows_at_start = state["rows"]
+    with open(output_path, "a", encoding="utf-8", newline="") as out:
+        writer = None
+        for records, offset, fieldnames in iter_chunks(
+            input_path, chunk_size, state["offset"], state["fieldnames"], end_offset
+        ):
+            chunk_started = time.perf_counter()
+            texts = [str(record.get(text_column) or "") for record in records]
+            results = analyzer.analyze_batch(texts, batch_size=batch_size)
+            for record, result in zip(records, results):
+                record["sentiment"] = result["label"]
+                record["confidence"] = result["score"]
+
+            if out_format == "csv":
+                if writer is None:
+                    columns = list(fieldnames or records[0].keys())
+                    columns += [c for c in ("sentiment", "confidence") if c not in columns]
+                    writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+                    if state["output_bytes"] == 0:
+                        writer.writeheader()
+                writer.writerows(records)
+            else:
+                out.writelines(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+            out.flush()
+            os.fsync(out.fileno())
+
+            state.update(
+                offset=offset,
+                rows=state["rows"] + len(records),
+                output_bytes=out.tell(),
+                fieldnames=fieldnames
+            )
+            _save_checkpoint(checkpoint_path, state)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Scored {state['rows']} rows "
+                f"({len(records) / (time.perf_counter() - chunk_started):.0f} rows/sec chunk, "
+                f"{(state['rows'] - rows_at_start) / elapsed:.0f} rows/sec overall)"
+            )
+
+    elapsed = time.perf_counter() - started
+    scored = state["rows"] - rows_at_start
+    logger.info(f"Finished {input_path}: {state['rows']} rows written to {output_path}")
+    return {
+        "input": str(input_path),
+        "output": str(output_path),
+        "rows": state["rows"],
+        "rows_this_run": scored,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(scored / elapsed, 1) if elapsed else 0.0,
+        "checkpoint": str(checkpoint_path)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="CSV or JSONL file to score")
+    parser.add_argument("output", help="CSV or JSONL file to write")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--chunk-size", type=int, default=scoring_config.CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=None, help="Texts per forward pass")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore any checkpoint and start over")
+    args = parser.parse_args()
+
+    summary = score_file(
+        args.input,
+        args.output,
+        text_column=args.text_column,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        resume=not args.no_resume
+    )
+    for name, value in summary.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
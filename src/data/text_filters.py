@@ -0,0 +1,190 @@
+"""Cheap checks that keep tweets away from the sentiment model.
+
+Language is filtered by the search API itself: `with_language` adds a
+`lang:` operator to the query, so other-language tweets are never
+downloaded. What is left goes through a PreInferenceFilter, which drops
+texts the model would waste time on (empty, URL-only, too short) and
+counts, per rule, how many texts and characters were kept out of
+inference. Exact repeats of a text earlier in the same run (retweets,
+copy-paste posts) are distinct tweets and are kept: PreInferenceFilter.score
+runs the model once per distinct text and gives every repeat the result of
+its first occurrence.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config import pipeline_config, twitter_config
+from src.models.prediction_cache import normalize_text
+from src.utils.metrics import metrics
+
+LANG_OPERATOR = re.compile(r"(?<![\w-])-?lang:\w+", re.IGNORECASE)
+URL = re.compile(r"https?://\S+|www\.\S+", re.IGNORECASE)
+MENTION = re.compile(r"@\w+")
+WORD = re.compile(r"\w")
+
+RULES = ("language", "empty", "url_only", "too_short")
+
+prefilter_checked = metrics.counter("prefilter_checked_total", "Texts checked before inference")
+prefilter_dropped = metrics.counter(
+    "prefilter_dropped_total", "Texts kept out of inference by each pre-filter rule", ("rule",)
+)
+prefilter_reused = metrics.counter(
+    "prefilter_reused_total", "Repeated texts given the result of their first occurrence"
+)
+
+
+def with_language(query: str, language: str = None) -> str:
+    """Query restricted to one language with a lang: operator (unchanged if it already has one)"""
+    language = twitter_config.LANGUAGE if language is None else language
+    if not language or LANG_OPERATOR.search(query):
+        return query
+    # Parenthesized because AND binds tighter than OR: "a OR b lang:en" only limits b
+    return f"({query}) lang:{language}"
+
+
+class PreInferenceFilter:
+    """Drops tweets not worth scoring, scores repeats once, and counts what each saved"""
+
+    def __init__(
+        self,
+        language: str = None,
+        min_chars: int = None,
+        duplicate_window: int = None
+    ):
+        # Language normally comes from the lang: operator; this catches anything that slips through
+        self.language = twitter_config.LANGUAGE if language is None else language
+        self.min_chars = pipeline_config.PREFILTER_MIN_CHARS if min_chars is None else min_chars
+        self.duplicate_window = duplicate_window or pipeline_config.PREFILTER_DUPLICATE_WINDOW
+        # Results for the digests of recently scored texts, oldest first
+        self._recent: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_run()
+
+    def rule_for(self, tweet: Dict[str, Any]) -> Optional[str]:
+        """Name of the first rule that drops the tweet, or None to keep it"""
+        if self.language and tweet.get("lang") not in (None, self.language):
+            return "language"
+        text = (tweet.get("text") or "").strip()
+        if not text:
+            return "empty"
+        without_urls = URL.sub("", text)
+        if not WORD.search(without_urls):
+            return "url_only"
+        if len(" ".join(MENTION.sub("", without_urls).split())) < self.min_chars:
+            return "too_short"
+        return None
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).digest()
+
+    def filter(self, tweets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tweets worth scoring, in order"""
+        kept = []
+        dropped = {}
+        with self._lock:
+            self.checked += len(tweets)
+            for tweet in tweets:
+                rule = self.rule_for(tweet)
+                if rule is None:
+                    kept.append(tweet)
+                    continue
+                dropped[rule] = dropped.get(rule, 0) + 1
+                self.dropped[rule] += 1
+                self.chars_saved[rule] += len(tweet.get("text") or "")
+        prefilter_checked.inc((), len(tweets))
+        for rule, count in dropped.items():
+            prefilter_dropped.inc((rule,), count)
+        return kept
+
+    def score(
+        self,
+        texts: List[str],
+        analyze: Callable[[List[str]], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """One result per text, in order; `analyze` only sees texts not scored earlier this run
+
+        A repeat of a text scored before (in this call or an earlier one
+        since reset_run) gets that result instead of another forward pass.
+        Failed (ERROR) results are not remembered, so a repeat is retried.
+        """
+        digests = [self._digest(text) for text in texts]
+        results: Dict[bytes, Dict[str, Any]] = {}
+        pending: Dict[bytes, str] = {}  # First occurrence of each text to score
+        reused_chars = 0
+        with self._lock:
+            for digest, text in zip(digests, texts):
+                if digest in results or digest in pending:
+                    reused_chars += len(text)
+                elif digest in self._recent:
+                    self._recent.move_to_end(digest)
+                    results[digest] = self._recent[digest]
+                    reused_chars += len(text)
+                else:
+                    pending[digest] = text
+
+        if pending:
+            for digest, result in zip(pending, analyze(list(pending.values()))):
+                results[digest] = result
+            self._remember([(digest, results[digest]) for digest in pending])
+
+        reused = len(texts) - len(pending)
+        with self._lock:
+            self.reused += reused
+            self.reused_chars += reused_chars
+        prefilter_reused.inc((), reused)
+        return [results[digest] for digest in digests]
+
+    def _remember(self, scored: List[Tuple[bytes, Dict[str, Any]]]):
+        """Keep successful results for repeats later in the run, up to duplicate_window texts"""
+        with self._lock:
+            for digest, result in scored:
+                if result.get("label") == "ERROR":
+                    continue
+                self._recent[digest] = result
+                self._recent.move_to_end(digest)
+            while len(self._recent) > self.duplicate_window:
+                self._recent.popitem(last=False)
+
+    def reset_run(self):
+        """Forget earlier results and zero the counters
+
+        Call at the start of each run, so results are reused within a run
+        only (across runs the prediction cache, if enabled, serves repeats).
+        """
+        with self._lock:
+            self._recent.clear()
+        self.checked = 0
+        self.dropped = {rule: 0 for rule in RULES}
+        self.chars_saved = {rule: 0 for rule in RULES}
+        self.reused = 0
+        self.reused_chars = 0
+
+    def stats(self, texts_per_second: float = None) -> Dict[str, Any]:
+        """Texts and characters kept out of inference, per drop rule and for reused repeats
+
+        With the model's measured texts_per_second, also the inference
+        seconds each saved (an upper bound for repeats, some of which the
+        prediction cache would have answered).
+        """
+        dropped = sum(self.dropped.values())
+        rules = {}
+        for rule in RULES:
+            rules[rule] = {"dropped": self.dropped[rule], "chars": self.chars_saved[rule]}
+            if texts_per_second:
+                rules[rule]["inference_seconds_saved"] = round(self.dropped[rule] / texts_per_second, 3)
+        duplicates = {"reused": self.reused, "chars": self.reused_chars}
+        if texts_per_second:
+            duplicates["inference_seconds_saved"] = round(self.reused / texts_per_second, 3)
+        return {
+            "checked": self.checked,
+            "dropped": dropped,
+            "dropped_ratio": round(dropped / self.checked, 4) if self.checked else 0.0,
+            "inference_saved": dropped + self.reused,
+            "rules": rules,
+            "duplicates": duplicates
+        }
+
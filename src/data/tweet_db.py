@@ -0,0 +1,344 @@
+"""SQLite tweet store backing /api/tweets.
+
+Timestamps are stored as fixed-width UTC strings (YYYY-MM-DDTHH:MM:SS.ffffffZ),
+so string order is time order and date filters are plain indexed range
+scans. Composite indexes put created_at after each filter column, which
+lets "newest N with sentiment X" read the index in order and stop at LIMIT.
+Pages continue from a (created_at, id) cursor rather than an OFFSET, so a
+deep page costs the same index seek as the first one. Per-query watermarks
+(the newest tweet ID collected) let collectors ask only for newer tweets.
+"""
+import base64
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.config import storage_config
+from src.utils.logger import project_logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    author_id TEXT,
+    author_name TEXT,
+    followers INTEGER,
+    created_at TEXT NOT NULL,
+    retweets INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    replies INTEGER NOT NULL DEFAULT 0,
+    hashtags TEXT,
+    sentiment TEXT,
+    confidence REAL,
+    query TEXT,
+    source TEXT,
+    collected_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tweets_created_at ON tweets (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tweets_sentiment ON tweets (sentiment, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tweets_query ON tweets (query, created_at, id);
+CREATE TABLE IF NOT EXISTS watermarks (
+    query TEXT PRIMARY KEY,
+    newest_id TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+COLUMNS = (
+    "id", "text", "author_id", "author_name", "followers", "created_at", "retweets",
+    "likes", "replies", "hashtags", "sentiment", "confidence", "query", "source", "collected_at"
+)
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """ISO string or datetime as a fixed-width UTC string (naive values are local time)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def encode_cursor(created_at: str, tweet_id: str) -> str:
+    """Opaque page cursor for the position after (created_at, id)"""
+    raw = json.dumps([created_at, tweet_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(created_at, id) from encode_cursor; ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, tweet_id = json.loads(raw)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    if not isinstance(created_at, str) or not isinstance(tweet_id, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, tweet_id
+
+
+class TweetDatabase:
+    """Scored tweets in a WAL-mode SQLite file with indexed filters"""
+
+    def __init__(self, path: str = None):
+        self.logger = project_logger
+        self.path = Path(path or storage_config.TWEET_DB_PATH)
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, reopened after fork; the file is created on first use"""
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._pid = os.getpid()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def to_row(tweet: Dict[str, Any]) -> Tuple:
+        """Column values from a search_tweets dict or an API-style tweet dict"""
+        user = tweet.get("user") or {}
+        hashtags = tweet.get("hashtags")
+        return (
+            str(tweet["id"]),
+            tweet.get("text") or "",
+            str(tweet["author_id"]) if tweet.get("author_id") is not None else user.get("screen_name"),
+            user.get("name"),
+            user.get("followers_count"),
+            normalize_timestamp(tweet.get("created_at")) or normalize_timestamp(datetime.now()),
+            tweet.get("retweets", tweet.get("retweet_count")) or 0,
+            tweet.get("likes", tweet.get("favorite_count")) or 0,
+            tweet.get("replies") or 0,
+            json.dumps(hashtags) if hashtags is not None else None,
+            str(tweet["sentiment"]).lower() if tweet.get("sentiment") else None,
+            tweet.get("confidence"),
+            tweet.get("query"),
+            tweet.get("source"),
+            normalize_timestamp(tweet.get("collected_at")) or normalize_timestamp(datetime.now())
+        )
+
+    @staticmethod
+    def to_api(row: sqlite3.Row) -> Dict[str, Any]:
+        """A stored row in the /api/tweets response shape"""
+        return {
+            "id": row["id"],
+            "text": row["text"],
+            "created_at": row["created_at"],
+            "user": {
+                "name": row["author_name"] or row["author_id"],
+                "screen_name": row["author_id"],
+                "followers_count": row["followers"]
+            },
+            "retweet_count": row["retweets"],
+            "favorite_count": row["likes"],
+            "reply_count": row["replies"],
+            "hashtags": json.loads(row["hashtags"]) if row["hashtags"] else [],
+            "sentiment": row["sentiment"],
+            "confidence": row["confidence"],
+            "query": row["query"],
+            "source": row["source"]
+        }
+
+    def insert_many(self, tweets: Iterable[Dict[str, Any]]) -> int:
+        """Store tweets, skipping ids already present; returns rows inserted"""
+        rows = [self.to_row(tweet) for tweet in tweets]
+        if not rows:
+            return 0
+        conn = self._connection()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO tweets ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+            inserted = conn.total_changes - before
+        self.logger.debug(f"Stored {inserted} of {len(rows)} tweets")
+        return inserted
+
+    @staticmethod
+    def _where(
+        sentiment: str = None,
+        query: str = None,
+        start_date: str = None,
+        end_date: str = None
+    ) -> Tuple[str, List[Any]]:
+        """WHERE clause and parameters for the indexed filters"""
+        clauses, params = [], []
+        if sentiment:
+            clauses.append("sentiment = ?")
+            params.append(sentiment.lower())
+        if query is not None:
+            clauses.append("query = ?")
+            params.append(query)
+        if start_date:
+            clauses.append("created_at >= ?")
+            params.append(normalize_timestamp(start_date))
+        if end_date:
+            clauses.append("created_at <= ?")
+            params.append(normalize_timestamp(end_date))
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def query(
+        self,
+        sentiment: str = None,
+        query: str = None,
+        start_date: str = None,
+        end_date: str = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[sqlite3.Row]:
+        """Matching tweets, newest first"""
+        where, params = self._where(sentiment, query, start_date, end_date)
+        return self._connection().execute(
+            f"SELECT * FROM tweets {where} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+            (*params, limit, offset)
+        ).fetchall()
+
+    def page(
+        self,
+        sentiment: str = None,
+        query: str = None,
+        start_date: str = None,
+        end_date: str = None,
+        limit: int = 20,
+        cursor: str = None
+    ) -> Tuple[List[sqlite3.Row], Optional[str]]:
+        """One page of matching tweets, newest first, and the cursor for the next page
+
+        The cursor is None on the last page. Tweets inserted after the first
+        page was read only appear if they are older than the cursor.
+        """
+        where, params = self._where(sentiment, query, start_date, end_date)
+        if cursor:
+            where = f"{where} AND " if where else "WHERE "
+            where += "(created_at, id) < (?, ?)"
+            params.extend(decode_cursor(cursor))
+        rows = self._connection().execute(
+            f"SELECT * FROM tweets {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit + 1)
+        ).fetchall()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+    def since(self, seq: int, limit: int = 500) -> List[sqlite3.Row]:
+        """Tweets stored after insertion sequence number `seq` (the rowid), oldest first"""
+        return self._connection().execute(
+            "SELECT rowid AS seq, * FROM tweets WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (seq, limit)
+        ).fetchall()
+
+    def iter_created_since(
+        self,
+        start_date: Any,
+        max_seq: int = None,
+        batch: int = 5000
+    ) -> Iterator[sqlite3.Row]:
+        """Tweets created at or after start_date (and stored at or before max_seq), oldest first"""
+        cursor = (normalize_timestamp(start_date), "")
+        seq_clause = "AND rowid <= ?" if max_seq is not None else ""
+        seq_params = (max_seq,) if max_seq is not None else ()
+        while True:
+            rows = self._connection().execute(
+                f"SELECT rowid AS seq, * FROM tweets WHERE (created_at, id) > (?, ?) {seq_clause} "
+                f"ORDER BY created_at, id LIMIT ?",
+                (*cursor, *seq_params, batch)
+            ).fetchall()
+            yield from rows
+            if len(rows) < batch:
+                return
+            cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+    def existing_ids(self, tweet_ids: List[str], chunk: int = 500) -> Set[str]:
+        """The subset of tweet_ids already stored"""
+        found: Set[str] = set()
+        conn = self._connection()
+        for start in range(0, len(tweet_ids), chunk):
+            part = tweet_ids[start:start + chunk]
+            found.update(row[0] for row in conn.execute(
+                f"SELECT id FROM tweets WHERE id IN ({', '.join('?' * len(part))})", part
+            ))
+        return found
+
+    def iter_ids(self, batch: int = 50_000) -> Iterator[str]:
+        """Every stored tweet ID"""
+        cursor = self._connection().execute("SELECT id FROM tweets")
+        while True:
+            rows = cursor.fetchmany(batch)
+            if not rows:
+                return
+            for row in rows:
+                yield row[0]
+
+    def get_watermark(self, query: str) -> Optional[str]:
+        """Newest tweet ID collected for a query, if any"""
+        row = self._connection().execute(
+            "SELECT newest_id FROM watermarks WHERE query = ?", (query,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, query: str, newest_id: str):
+        """Advance a query's watermark (it never moves back)"""
+        conn = self._connection()
+        with conn:
+            current = conn.execute("SELECT newest_id FROM watermarks WHERE query = ?", (query,)).fetchone()
+            # Tweet IDs are numeric strings: compare by length, then lexically
+            if current and (len(current[0]), current[0]) >= (len(newest_id), newest_id):
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO watermarks (query, newest_id, updated_at) VALUES (?, ?, ?)",
+                (query, newest_id, normalize_timestamp(datetime.now()))
+            )
+
+    def watermarks(self) -> Dict[str, str]:
+        """Every query's watermark"""
+        return dict(self._connection().execute("SELECT query, newest_id FROM watermarks").fetchall())
+
+    def latest_seq(self) -> int:
+        """Insertion sequence number of the newest stored tweet (0 when empty)"""
+        return self._connection().execute("SELECT COALESCE(MAX(rowid), 0) FROM tweets").fetchone()[0]
+
+    def count(
+        self,
+        sentiment: str = None,
+        query: str = None,
+        start_date: str = None,
+        end_date: str = None
+    ) -> int:
+        """Number of matching tweets"""
+        where, params = self._where(sentiment, query, start_date, end_date)
+        return self._connection().execute(f"SELECT COUNT(*) FROM tweets {where}", params).fetchone()[0]
+
+    def get(self, tweet_id: str) -> Optional[sqlite3.Row]:
+        """One tweet by id"""
+        return self._connection().execute("SELECT * FROM tweets WHERE id = ?", (tweet_id,)).fetchone()
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count and file size"""
+        return {
+            "path": str(self.path),
+            "rows": self.count(),
+            "file_bytes": self.path.stat().st_size if self.path.exists() else 0
+        }
+
+
+# Singleton instance
+tweet_db = TweetDatabase()
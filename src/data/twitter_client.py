@@ -1,8 +1,10 @@
+import threading
 import tweepy
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import pandas as pd
-from src.config import twitter_config
+from pathlib import Path
+from src.config import storage_config, twitter_config
+from src.data.text_filters import PreInferenceFilter, with_language
 from src.models.sentiment_analyzer import sentiment_analyzer
 from src.utils.logger import project_logger
 
@@ -37,9 +39,10 @@ class TwitterClient:
         self,
         query: str = None,
         max_results: int = 10,
+        store: bool = False,
         **kwargs
     ) -> List[Dict[str, Any]]:
-        """Search tweets and analyze sentiment"""
+        """Search tweets and analyze sentiment; with store, also save them (see save)"""
         try:
             query = query or twitter_config.SEARCH_QUERY
             max_results = min(max_results, twitter_config.MAX_TWEETS)
@@ -48,7 +51,7 @@ class TwitterClient:
             
             # Search tweets
             tweets = self.client.search_recent_tweets(
-                query=query,
+                query=with_language(query),
                 max_results=max_results,
                 tweet_fields=[
                     'created_at',
@@ -65,39 +68,56 @@ class TwitterClient:
                 return []
             
             # Process tweets
-            processed_tweets = []
+            candidates = []
             for tweet in tweets.data:
-                if tweet.lang != twitter_config.LANGUAGE:
-                    continue
-                    
-                sentiment_result = sentiment_analyzer.analyze_text(tweet.text)
-                
-                tweet_data = {
+                candidates.append({
                     "id": str(tweet.id),
                     "text": tweet.text[:500],  # Truncate for storage
+                    "lang": tweet.lang,
                     "author_id": str(tweet.author_id),
                     "created_at": tweet.created_at.isoformat() if tweet.created_at else None,
                     "retweets": tweet.public_metrics["retweet_count"],
                     "likes": tweet.public_metrics["like_count"],
                     "replies": tweet.public_metrics["reply_count"],
-                    "sentiment": sentiment_result["label"],
-                    "confidence": sentiment_result["score"],
                     "query": query,
                     "collected_at": datetime.now().isoformat()
-                }
-                
-                processed_tweets.append(tweet_data)
+                })
+            
+            # Score the tweets that pass the pre-filter in one batch; repeated texts
+            # and cache hits skip inference (a fresh filter: repeats within this response)
+            prefilter = PreInferenceFilter()
+            processed_tweets = prefilter.filter(candidates)
+            sentiment_results = prefilter.score(
+                [tweet["text"] for tweet in processed_tweets], sentiment_analyzer.analyze_batch
+            )
+            for tweet_data, sentiment_result in zip(processed_tweets, sentiment_results):
+                tweet_data.pop("lang")
+                tweet_data["sentiment"] = sentiment_result["label"]
+                tweet_data["confidence"] = sentiment_result["score"]
                 self.logger.debug(f"Tweet analyzed: {sentiment_result['label']}")
             
-            self.logger.info(f"Processed {len(processed_tweets)} tweets")
+            self.logger.info(
+                f"Processed {len(processed_tweets)} tweets "
+                f"({len(candidates) - len(processed_tweets)} dropped before inference)"
+            )
+            if store:
+                self.save(processed_tweets)
             return processed_tweets
             
         except Exception as e:
             self.logger.error(f"Error searching tweets: {e}")
             return []
     
+    def save(self, tweets: List[Dict]) -> int:
+        """Store tweets: the Parquet archive (unless ARCHIVE_ENABLED is off), then SQLite"""
+        if storage_config.ARCHIVE_ENABLED:
+            self.save_to_parquet(tweets)
+        return self.save_to_db(tweets)
+    
     def save_to_csv(self, tweets: List[Dict], filename: str = None):
-        """Save tweets to CSV file"""
+        """Export tweets to a CSV file (storage goes through save)"""
+        import pandas as pd
+        
         if not tweets:
             return None
         
@@ -111,6 +131,36 @@ class TwitterClient:
         df.to_csv(filepath, index=False, encoding='utf-8')
         self.logger.info(f"Saved {len(df)} tweets to {filepath}")
         return filepath
+    
+    def save_to_db(self, tweets: List[Dict]) -> int:
+        """Insert tweets into the SQLite store behind /api/tweets"""
+        from src.data.tweet_db import tweet_db
+        
+        return tweet_db.insert_many(tweets)
+    
+    def save_to_parquet(self, tweets: List[Dict]) -> int:
+        """Append tweets to the partitioned Parquet archive"""
+        from src.data.parquet_store import parquet_store
+        
+        return parquet_store.append(tweets)
+
+# Singleton instance, built and authenticated on first use rather than at import
+_twitter_client: Optional[TwitterClient] = None
+_client_lock = threading.Lock()
+
+
+def get_twitter_client() -> TwitterClient:
+    """The shared TwitterClient, created on the first call (thread-safe)"""
+    global _twitter_client
+    if _twitter_client is None:
+        with _client_lock:
+            if _twitter_client is None:
+                _twitter_client = TwitterClient()
+    return _twitter_client
+
 
-# Singleton instance
-twitter_client = TwitterClient()
\ No newline at end of file
+def __getattr__(name: str):
+    # Keeps `from src.data.twitter_client import twitter_client` working, lazily
+    if name == "twitter_client":
+        return get_twitter_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,107 @@
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoModelForSequenceClassification
+
+from src.utils.logger import project_logger
+
+ONNX_FILENAME = "model.onnx"
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax"""
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+class TorchBackend:
+    """Runs the Hugging Face PyTorch model, optionally dynamically quantized"""
+
+    name = "torch"
+
+    def __init__(self, model_name: str, quantize: str = None):
+        self.logger = project_logger
+        use_cuda = torch.cuda.is_available() and not quantize
+        self.device = torch.device("cuda" if use_cuda else "cpu")
+
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+        if quantize == "dynamic-int8":
+            # int8 weights for every nn.Linear; activations are quantized on the fly (CPU only)
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.model.to(self.device)
+        self.id2label = self.model.config.id2label
+
+    def predict(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Class probabilities for a padded batch"""
+        tensors = {name: torch.from_numpy(array).to(self.device) for name, array in inputs.items()}
+        with torch.no_grad():
+            logits = self.model(**tensors).logits
+        return torch.softmax(logits, dim=-1).cpu().numpy()
+
+
+class OnnxBackend:
+    """Runs an exported ONNX graph with onnxruntime on CPU"""
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str):
+        self.logger = project_logger
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "The onnx backend needs onnxruntime: pip install 'tweet-sentiment-faang[onnx]'"
+            ) from e
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = torch.get_num_threads()
+        self.session = onnxruntime.InferenceSession(
+            str(Path(model_dir) / ONNX_FILENAME),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+        self.id2label = AutoConfig.from_pretrained(model_dir).id2label
+
+    def predict(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Class probabilities for a padded batch"""
+        feed = {
+            name: array.astype(np.int64)
+            for name, array in inputs.items()
+            if name in self.input_names
+        }
+        logits = self.session.run(["logits"], feed)[0]
+        return softmax(logits)
+
+
+def export_onnx(model, tokenizer, output_dir: str, opset: int = 17) -> Path:
+    """Export a PyTorch sequence classifier to output_dir/model.onnx
+
+    Batch and sequence axes are dynamic so the graph accepts any padded
+    micro-batch produced by the analyzer.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    model = model.to("cpu").eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in input_names),
+            str(output_dir / ONNX_FILENAME),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+    return output_dir / ONNX_FILENAME
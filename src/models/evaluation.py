@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Tuple
+
+# Fixed labeled tweets used to check that optimized model variants
+# (quantized, exported) agree with the reference fp32 model
+LABELED_SAMPLES: List[Tuple[str, str]] = [
+    ("AI is revolutionizing healthcare with new diagnostic tools! #ArtificialIntelligence", "positive"),
+    ("Machine learning models are becoming more efficient every day.", "positive"),
+    ("Deep learning algorithms are achieving remarkable results.", "positive"),
+    ("The integration of AI in education shows promising results.", "positive"),
+    ("Just attended a great conference about computer vision. Amazing insights! #AI", "positive"),
+    ("Breakthrough in neural networks could change everything. #DeepLearning", "positive"),
+    ("I absolutely love how AI is transforming healthcare! This is amazing progress.", "positive"),
+    ("Recent advancements in robotics are impressive. #Robotics", "positive"),
+    ("So happy with the new model release, best update this year!", "positive"),
+    ("Great work by the team, the new NLP features are excellent.", "positive"),
+    ("The future of technology depends on advancements in AI research.", "neutral"),
+    ("Natural language processing has improved significantly in recent years.", "neutral"),
+    ("Quantum computing will accelerate AI development exponentially.", "neutral"),
+    ("Tech conference today discussed neural networks and their applications in various industries.", "neutral"),
+    ("How will automation impact our daily lives? #Tech", "neutral"),
+    ("My thoughts on the future of big data. #DataScience", "neutral"),
+    ("New research paper on machine learning algorithms published today.", "neutral"),
+    ("The keynote on AI ethics starts at 3pm in hall B.", "neutral"),
+    ("Apple will announce its quarterly earnings on Thursday.", "neutral"),
+    ("Google released version 2.1 of the SDK this morning.", "neutral"),
+    ("I'm concerned about the ethical implications of artificial intelligence.", "negative"),
+    ("We need more regulation for responsible AI development.", "negative"),
+    ("The new machine learning model shows concerning biases that need to be addressed immediately.", "negative"),
+    ("Concerns about AI ethics need to be addressed by policymakers. #AI", "negative"),
+    ("This chatbot is terrible, worst customer service experience ever.", "negative"),
+    ("Another data breach at a big tech company. I hate this.", "negative"),
+    ("The app keeps crashing after the update, awful.", "negative"),
+    ("Layoffs again across the industry, sad day for tech workers.", "negative"),
+    ("Facial recognition misidentified people again, this is a real problem.", "negative"),
+    ("Netflix raised prices again and the service is getting worse.", "negative"),
+]
+
+
+def compare_models(
+    reference,
+    candidate,
+    samples: List[Tuple[str, str]] = None,
+    batch_size: int = None
+) -> Dict[str, Any]:
+    """Label agreement, accuracy and score drift of candidate vs reference
+
+    Both arguments are SentimentAnalyzer instances. Caches are bypassed so
+    each model's own predictions are compared.
+    """
+    samples = samples or LABELED_SAMPLES
+    texts = [text for text, _ in samples]
+    expected = [label for _, label in samples]
+
+    reference_results = reference._analyze_uncached(texts, batch_size)
+    candidate_results = candidate._analyze_uncached(texts, batch_size)
+
+    reference_labels = [r["label"].lower() for r in reference_results]
+    candidate_labels = [r["label"].lower() for r in candidate_results]
+    score_diffs = [
+        abs(r["score"] - c["score"])
+        for r, c, rl, cl in zip(reference_results, candidate_results, reference_labels, candidate_labels)
+        if rl == cl
+    ]
+
+    return {
+        "samples": len(samples),
+        "agreement": sum(r == c for r, c in zip(reference_labels, candidate_labels)) / len(samples),
+        "reference_accuracy": sum(r == e for r, e in zip(reference_labels, expected)) / len(samples),
+        "candidate_accuracy": sum(c == e for c, e in zip(candidate_labels, expected)) / len(samples),
+        "max_score_diff": max(score_diffs, default=0.0),
+        "mean_score_diff": sum(score_diffs) / len(score_diffs) if score_diffs else 0.0,
+        "disagreements": [
+            {"text": text, "reference": r, "candidate": c}
+            for text, r, c in zip(texts, reference_labels, candidate_labels)
+            if r != c
+        ]
+    }
@@ -0,0 +1,26 @@
+"""Export the sentiment model to ONNX for the onnxruntime backend.
+
+Run from the repository root:
+    python -m src.models.export_onnx --model cardiffnlp/twitter-roberta-base-sentiment-latest --output models/onnx
+
+Then serve it with model_config.BACKEND = "onnx".
+"""
+import argparse
+
+from src.config import model_config
+from src.models.sentiment_analyzer import SentimentAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=model_config.MODEL_NAME, help="Model name or local path")
+    parser.add_argument("--output", default=model_config.ONNX_MODEL_PATH, help="Output directory")
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(args.model, backend="torch")
+    path = analyzer.export_onnx(args.output)
+    print(f"Exported {args.model} to {path}")
+
+
+if __name__ == "__main__":
+    main()
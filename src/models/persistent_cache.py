@@ -0,0 +1,209 @@
+"""SQLite-backed prediction cache shared across processes and restarts.
+
+Maintenance commands, run from the repository root:
+    python -m src.models.persistent_cache stats
+    python -m src.models.persistent_cache compact --max-rows 1000000
+"""
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.config import model_config
+from src.utils.logger import project_logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    score REAL NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_predictions_created_at ON predictions (created_at);
+"""
+
+# Row count kept by triggers, so the size cap never needs a COUNT(*) scan.
+# It lives in the file because every process writes to the same table.
+# Seeded in the same transaction as the triggers, from any existing rows.
+COUNT_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS predictions_count (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    rows INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO predictions_count (id, rows) SELECT 0, COUNT(*) FROM predictions;
+CREATE TRIGGER IF NOT EXISTS predictions_count_insert AFTER INSERT ON predictions
+BEGIN UPDATE predictions_count SET rows = rows + 1 WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS predictions_count_delete AFTER DELETE ON predictions
+BEGIN UPDATE predictions_count SET rows = rows - 1 WHERE id = 0; END;
+COMMIT;
+"""
+
+# SQLite's default limit on bound parameters is 999 on older builds
+_LOOKUP_CHUNK = 500
+
+
+class SQLitePredictionCache:
+    """Persistent key -> prediction store in a WAL-mode SQLite file
+
+    WAL lets any number of processes read while one writes. Hits never
+    write, so lookups stay cheap; the size cap evicts the oldest inserts
+    rather than tracking recency on every read.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        max_rows: int = None,
+        ttl_seconds: float = None,
+        trim_every: int = 1000
+    ):
+        self.logger = project_logger
+        self.path = Path(path or model_config.PERSISTENT_CACHE_PATH)
+        self.max_rows = max_rows or model_config.PERSISTENT_CACHE_MAX_ROWS
+        self.ttl_seconds = ttl_seconds or model_config.CACHE_TTL_SECONDS
+        self.trim_every = trim_every
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._writes_since_trim = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            conn.executescript(COUNT_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, reopened after fork"""
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._pid = os.getpid()
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored predictions for the keys that are present and not expired"""
+        keys = list(keys)
+        oldest = time.time() - self.ttl_seconds
+        found = {}
+        try:
+            conn = self._connection()
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start:start + _LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT key, label, score FROM predictions "
+                    f"WHERE key IN ({','.join('?' * len(chunk))}) AND created_at >= ?",
+                    (*chunk, oldest)
+                )
+                for key, label, score in rows:
+                    found[key] = {"label": label, "score": score}
+        except sqlite3.Error as e:
+            self.logger.error(f"Persistent cache lookup failed: {e}")
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Store predictions, trimming to max_rows every `trim_every` writes"""
+        now = time.time()
+        rows = [(key, value["label"], value["score"], now) for key, value in items]
+        if not rows:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                # An upsert, not INSERT OR REPLACE: REPLACE deletes without firing the count trigger
+                conn.executemany(
+                    "INSERT INTO predictions (key, label, score, created_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET "
+                    "label = excluded.label, score = excluded.score, created_at = excluded.created_at",
+                    rows
+                )
+            self._writes_since_trim += len(rows)
+            if self._writes_since_trim >= self.trim_every:
+                self.trim()
+        except sqlite3.Error as e:
+            self.logger.error(f"Persistent cache write failed: {e}")
+
+    def trim(self) -> int:
+        """Delete expired rows and the oldest rows beyond max_rows"""
+        conn = self._connection()
+        with conn:
+            deleted = conn.execute(
+                "DELETE FROM predictions WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            ).rowcount
+            excess = self.count() - self.max_rows
+            if excess > 0:
+                deleted += conn.execute(
+                    "DELETE FROM predictions WHERE key IN "
+                    "(SELECT key FROM predictions ORDER BY created_at LIMIT ?)",
+                    (excess,)
+                ).rowcount
+        self._writes_since_trim = 0
+        return deleted
+
+    def compact(self) -> Dict[str, Any]:
+        """Trim, then rebuild the file and truncate the WAL to reclaim disk space"""
+        before = self.file_bytes()
+        deleted = self.trim()
+        conn = self._connection()
+        conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        after = self.file_bytes()
+        self.logger.info(
+            f"Compacted {self.path}: deleted {deleted} rows, {before} -> {after} bytes"
+        )
+        return {"deleted_rows": deleted, "bytes_before": before, "bytes_after": after}
+
+    def count(self) -> int:
+        """Number of stored predictions (from the trigger-kept counter, not a table scan)"""
+        return self._connection().execute("SELECT rows FROM predictions_count WHERE id = 0").fetchone()[0]
+
+    def file_bytes(self) -> int:
+        """Size of the database file plus its WAL"""
+        paths = [self.path, self.path.with_name(self.path.name + "-wal")]
+        return sum(p.stat().st_size for p in paths if p.exists())
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count, disk size and this process's hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "rows": self.count(),
+            "max_rows": self.max_rows,
+            "bytes": self.file_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Maintain the persistent prediction cache")
+    parser.add_argument("command", choices=["stats", "compact"])
+    parser.add_argument("--path", default=None, help="Cache database file")
+    parser.add_argument("--max-rows", type=int, default=None, help="Row cap to enforce")
+    args = parser.parse_args(argv)
+
+    cache = SQLitePredictionCache(path=args.path, max_rows=args.max_rows)
+    result = cache.compact() if args.command == "compact" else cache.stats()
+    for name, value in result.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
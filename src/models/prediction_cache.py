@@ -0,0 +1,97 @@
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC unicode, collapsed whitespace
+
+    Case is kept because the sentiment models are case-sensitive.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_key(text: str, model_name: str) -> str:
+    """Content hash of the normalized text, namespaced by model"""
+    payload = f"{model_name}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class PredictionCache:
+    """Thread-safe LRU cache of sentiment predictions with TTL expiry"""
+
+    def __init__(self, max_size: int = 100_000, ttl_seconds: float = 86_400):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached prediction for a key, or None"""
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a prediction"""
+        self.put_many([(key, value)])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached predictions for the keys that are present and fresh"""
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                    continue
+                stored_at, value = entry
+                if now - stored_at > self.ttl_seconds:
+                    del self._entries[key]
+                    self.expirations += 1
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = value
+                self.hits += 1
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]):
+        """Store predictions, evicting least recently used entries past max_size"""
+        now = time.monotonic()
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -1,66 +1,322 @@
-import torch
-from transformers import (
-    AutoTokenizer,
-    AutoModelForSequenceClassification,
-    pipeline
-)
+import threading
+import time
+from bisect import bisect_left
+
 from typing import Dict, List, Any
-import pandas as pd
 from src.config import model_config
+from src.models.persistent_cache import SQLitePredictionCache
+from src.models.prediction_cache import PredictionCache, make_key
 from src.utils.logger import project_logger
+from src.utils.metrics import metrics
+
+QUANTIZE_MODES = (None, "dynamic-int8")
+BACKENDS = ("torch", "onnx")
+
+stage_latency = metrics.histogram(
+    "inference_stage_seconds", "Model inference time per call by stage", ("stage",)
+)
+texts_scored = metrics.counter(
+    "sentiment_texts_total", "Texts scored, by whether the model or a cache answered", ("source",)
+)
 
 class SentimentAnalyzer:
-    """Sentiment analysis model wrapper"""
+    """Sentiment analysis model wrapper
     
-    def __init__(self, model_name: str = None):
+    Construction is cheap: torch, transformers and the weights are only
+    loaded on first inference or an explicit warmup(), so importing this
+    module (and the singleton) costs milliseconds. Cache hits never load
+    the model at all.
+    """
+    
+    def __init__(self, model_name: str = None, quantize: str = None, backend: str = None):
         self.logger = project_logger
-        self.model_name = model_name or model_config.MODEL_NAME
+        self.backend_name = backend or model_config.BACKEND
+        if self.backend_name not in BACKENDS:
+            raise ValueError(f"Unknown backend {self.backend_name!r}, expected one of {BACKENDS}")
         
-        self.logger.info(f"Loading model: {self.model_name}")
-        self._load_model()
+        default_model = model_config.ONNX_MODEL_PATH if self.backend_name == "onnx" else model_config.MODEL_NAME
+        self.model_name = model_name or default_model
+        self.quantize = quantize or model_config.QUANTIZE
+        if self.quantize not in QUANTIZE_MODES:
+            raise ValueError(f"Unknown quantize mode {self.quantize!r}, expected one of {QUANTIZE_MODES}")
+        if self.quantize and self.backend_name != "torch":
+            raise ValueError("Quantization is only supported by the torch backend")
+        
+        # Each backend/quantization variant scores slightly differently,
+        # so they get their own cache entries
+        self.cache_namespace = f"{self.model_name}#{self.backend_name}"
+        if self.quantize:
+            self.cache_namespace += f"#{self.quantize}"
+        
+        self.last_batch_stats: List[Dict[str, Any]] = []
+        # Cumulative seconds per inference stage, updated from every scoring thread
+        self.stage_seconds = {"tokenize": 0.0, "collate": 0.0, "forward": 0.0, "postprocess": 0.0}
+        self._stage_lock = threading.Lock()
+        
+        self.cache = None
+        if model_config.CACHE_ENABLED:
+            self.cache = PredictionCache(
+                max_size=model_config.CACHE_MAX_SIZE,
+                ttl_seconds=model_config.CACHE_TTL_SECONDS
+            )
         
+        # Optional second tier shared by all workers and kept across restarts
+        self.persistent_cache = None
+        if model_config.PERSISTENT_CACHE_ENABLED:
+            self.persistent_cache = SQLitePredictionCache()
+        
+        self.tokenizer = None
+        self.pretokenizer = None
+        self.backend = None
+        self._load_lock = threading.Lock()
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.backend is not None
+    
+    def load(self):
+        """Load the model without running it (safe to call before forking workers)"""
+        self._ensure_loaded()
+    
+    def warmup(self):
+        """Load the model now and run one forward pass to initialize kernels"""
+        self._ensure_loaded()
+        self._analyze_uncached(["warmup"])
+        self.logger.info("Model warmed up")
+    
+    def _ensure_loaded(self):
+        """Load the model if it isn't yet (thread-safe)"""
+        if self.backend is None:
+            with self._load_lock:
+                if self.backend is None:
+                    self._load_model()
+    
     def _load_model(self):
-        """Load model and tokenizer"""
+        """Load tokenizer and inference backend"""
+        from transformers import AutoTokenizer
+        from src.models.backends import OnnxBackend, TorchBackend
+        from src.models.tokenization import PreTokenizer
+        
+        self.logger.info(f"Loading model: {self.model_name}")
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
-            self.pipeline = pipeline(
-                "sentiment-analysis",
-                model=self.model,
-                tokenizer=self.tokenizer,
-                device=0 if torch.cuda.is_available() else -1
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            if self.backend_name == "onnx":
+                backend = OnnxBackend(self.model_name)
+            else:
+                backend = TorchBackend(self.model_name, quantize=self.quantize)
+            self.tokenizer = tokenizer
+            self.pretokenizer = PreTokenizer(
+                tokenizer,
+                max_length=model_config.MAX_LENGTH,
+                cache_size=model_config.TOKEN_CACHE_SIZE
+            )
+            self.backend = backend  # Set last: marks the analyzer as loaded
+            self.logger.info(
+                f"Model loaded successfully (backend={self.backend_name}, quantize={self.quantize})"
             )
-            self.logger.info("Model loaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to load model: {e}")
             raise
     
     def analyze_text(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment of a single text"""
-        try:
-            result = self.pipeline(text[:model_config.MAX_LENGTH])[0]
-            return {
-                "label": result["label"],
-                "score": float(result["score"]),
-                "text": text[:200]  # Truncated for display
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(
+        self,
+        texts: List[str],
+        batch_size: int = None,
+        bucket_by_length: bool = None
+    ) -> List[Dict[str, Any]]:
+        """Analyze multiple texts with one forward pass per micro-batch
+        
+        With bucket_by_length, texts are grouped by token length so each
+        micro-batch is padded only to the longest text of its bucket.
+        Results are always returned in input order. When the result cache
+        is enabled only distinct cache misses are sent to the model.
+        """
+        if not texts:
+            return []
+        if self.cache is None and self.persistent_cache is None:
+            return self._analyze_uncached(texts, batch_size, bucket_by_length)
+        
+        keys = [make_key(text, self.cache_namespace) for text in texts]
+        cached = self._cache_lookup(keys)
+        
+        # First occurrence of each missing key goes to the model
+        miss_index = {}
+        for i, key in enumerate(keys):
+            if key not in cached and key not in miss_index:
+                miss_index[key] = i
+        # Repeats of a missing text within the batch are answered by its first occurrence
+        texts_scored.inc(("cache",), len(texts) - len(miss_index))
+        
+        if miss_index:
+            miss_results = self._analyze_uncached(
+                [texts[i] for i in miss_index.values()], batch_size, bucket_by_length
+            )
+            fresh = {
+                key: {"label": result["label"], "score": result["score"]}
+                for key, result in zip(miss_index, miss_results)
             }
+            self._cache_store(fresh)
+            cached.update(fresh)
+        
+        return [{**cached[key], "text": text[:200]} for key, text in zip(keys, texts)]
+    
+    def _cache_lookup(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look keys up in memory, then on disk, promoting disk hits to memory"""
+        found = self.cache.get_many(keys) if self.cache is not None else {}
+        if self.persistent_cache is not None:
+            missing = [key for key in keys if key not in found]
+            if missing:
+                stored = self.persistent_cache.get_many(missing)
+                if stored and self.cache is not None:
+                    self.cache.put_many(stored.items())
+                found.update(stored)
+        return found
+    
+    def _cache_store(self, predictions: Dict[str, Dict[str, Any]]):
+        """Write successful predictions to every enabled cache tier"""
+        items = [(key, value) for key, value in predictions.items() if value["label"] != "ERROR"]
+        if self.cache is not None:
+            self.cache.put_many(items)
+        if self.persistent_cache is not None:
+            self.persistent_cache.put_many(items)
+    
+    def _analyze_uncached(
+        self,
+        texts: List[str],
+        batch_size: int = None,
+        bucket_by_length: bool = None
+    ) -> List[Dict[str, Any]]:
+        """Run the model over every text, bucketing and micro-batching as configured"""
+        self._ensure_loaded()
+        batch_size = batch_size or model_config.BATCH_SIZE
+        if bucket_by_length is None:
+            bucket_by_length = model_config.BUCKET_BY_LENGTH
+        
+        try:
+            started = time.perf_counter()
+            input_ids = self.pretokenizer.encode(texts)
+            self._record_stages(tokenize=time.perf_counter() - started)
+            texts_scored.inc(("model",), len(texts))
         except Exception as e:
-            self.logger.error(f"Error analyzing text: {e}")
-            return {"label": "ERROR", "score": 0.0, "text": text[:200]}
-    
-    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """Analyze multiple texts in batch"""
-        results = []
-        for text in texts:
-            results.append(self.analyze_text(text))
+            self.logger.error(f"Error tokenizing batch of {len(texts)} texts: {e}")
+            return [{"label": "ERROR", "score": 0.0, "text": text[:200]} for text in texts]
+        
+        if bucket_by_length:
+            groups = self._bucket_by_length(input_ids)
+        else:
+            groups = {"all": list(range(len(texts)))}
+        
+        results = [None] * len(texts)
+        batch_stats = []
+        for bucket, indices in groups.items():
+            stats = {"bucket": bucket, "texts": len(indices), "batches": 0,
+                     "tokens": 0, "padded_tokens": 0, "seconds": 0.0}
+            for start in range(0, len(indices), batch_size):
+                chunk = indices[start:start + batch_size]
+                chunk_ids = [input_ids[i] for i in chunk]
+                longest = max(len(ids) for ids in chunk_ids)
+                
+                started = time.perf_counter()
+                chunk_results = self._predict_batch(chunk_ids, [texts[i] for i in chunk])
+                stats["seconds"] += time.perf_counter() - started
+                stats["batches"] += 1
+                stats["tokens"] += sum(len(ids) for ids in chunk_ids)
+                stats["padded_tokens"] += longest * len(chunk)
+                
+                for i, result in zip(chunk, chunk_results):
+                    results[i] = result
+            
+            stats["padding_ratio"] = 1 - stats["tokens"] / stats["padded_tokens"]
+            stats["tokens_per_sec"] = stats["tokens"] / stats["seconds"] if stats["seconds"] else 0.0
+            batch_stats.append(stats)
+            self.logger.debug(
+                f"Bucket {bucket}: {stats['texts']} texts, "
+                f"padding {stats['padding_ratio']:.1%}, {stats['tokens_per_sec']:.0f} tokens/sec"
+            )
+        self.last_batch_stats = batch_stats
         return results
     
+    def _record_stages(self, **seconds: float):
+        """Add per-stage seconds to the totals and the stage latency histogram"""
+        with self._stage_lock:
+            for stage, elapsed in seconds.items():
+                self.stage_seconds[stage] += elapsed
+        for stage, elapsed in seconds.items():
+            stage_latency.observe(elapsed, (stage,))
+    
+    def _bucket_by_length(self, input_ids: List[List[int]]) -> Dict[str, List[int]]:
+        """Group text indices into token-length buckets, shortest first within each"""
+        boundaries = model_config.BUCKET_BOUNDARIES
+        names = [f"<={boundaries[0]}"]
+        names += [f"{low + 1}-{high}" for low, high in zip(boundaries, boundaries[1:])]
+        names.append(f">{boundaries[-1]}")
+        
+        groups = {}
+        for i in sorted(range(len(input_ids)), key=lambda i: len(input_ids[i])):
+            bucket = names[bisect_left(boundaries, len(input_ids[i]))]
+            groups.setdefault(bucket, []).append(i)
+        return groups
+    
+    def _predict_batch(
+        self,
+        input_ids: List[List[int]],
+        texts: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Pad a micro-batch to its longest item and run one forward pass"""
+        try:
+            started = time.perf_counter()
+            inputs = self.pretokenizer.collate(input_ids)
+            padded = time.perf_counter()
+            probabilities = self.backend.predict(inputs)
+            forwarded = time.perf_counter()
+            
+            scores = probabilities.max(axis=-1)
+            label_ids = probabilities.argmax(axis=-1)
+            id2label = self.backend.id2label
+            results = [
+                {
+                    "label": id2label[label_id],
+                    "score": float(score),
+                    "text": text[:200]  # Truncated for display
+                }
+                for text, score, label_id in zip(texts, scores.tolist(), label_ids.tolist())
+            ]
+            finished = time.perf_counter()
+            self._record_stages(
+                collate=padded - started,
+                forward=forwarded - padded,
+                postprocess=finished - forwarded
+            )
+            return results
+        except Exception as e:
+            self.logger.error(f"Error analyzing batch of {len(texts)} texts: {e}")
+            return [{"label": "ERROR", "score": 0.0, "text": text[:200]} for text in texts]
+    
     def save_model(self, path: str = None):
         """Save model locally"""
+        self._ensure_loaded()
+        if self.backend_name != "torch" or self.quantize:
+            raise ValueError("Only the fp32 torch model can be saved")
         save_path = path or model_config.MODEL_PATH
-        self.model.save_pretrained(save_path)
+        # safetensors loads by memory-mapping, which is faster and shares page cache
+        self.backend.model.save_pretrained(save_path, safe_serialization=True)
         self.tokenizer.save_pretrained(save_path)
         self.logger.info(f"Model saved to {save_path}")
+    
+    def export_onnx(self, path: str = None):
+        """Save the model and tokenizer, then write the ONNX graph next to them"""
+        from src.models.backends import export_onnx
+        
+        save_path = path or model_config.ONNX_MODEL_PATH
+        self.save_model(save_path)
+        onnx_path = export_onnx(self.backend.model, self.tokenizer, save_path)
+        self.backend.model.to(self.backend.device)
+        self.logger.info(f"ONNX graph exported to {onnx_path}")
+        return onnx_path
 
 # Singleton instance
 sentiment_analyzer = SentimentAnalyzer()
\ No newline at end of file
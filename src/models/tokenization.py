@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+
+import numpy as np
+
+from src.models.prediction_cache import normalize_text
+from src.utils.logger import project_logger
+
+
+class PreTokenizer:
+    """Batch tokenization with token-count truncation and a token ID cache
+
+    Texts are normalized the same way as prediction cache keys, encoded in
+    one call to the Rust fast tokenizer, truncated to `max_length` tokens
+    and cached by normalized text. collate() pads straight into numpy
+    arrays for the inference backend.
+    """
+
+    def __init__(self, tokenizer, max_length: int, cache_size: int = 50_000):
+        self.logger = project_logger
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.cache_size = cache_size
+        if not getattr(tokenizer, "is_fast", False):
+            self.logger.warning("Slow (pure Python) tokenizer in use; batch encoding will be slow")
+
+        self.pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
+        self.pad_left = tokenizer.padding_side == "left"
+
+        self._cache: "OrderedDict[str, List[int]]" = OrderedDict()
+        # Fast tokenizers are not safe to call from several threads at once
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, texts: List[str]) -> List[List[int]]:
+        """Token IDs per text, encoding only the texts not already cached"""
+        normalized = [normalize_text(text) for text in texts]
+        with self._lock:
+            found = {}
+            missing = []
+            for text in dict.fromkeys(normalized):
+                token_ids = self._cache.get(text)
+                if token_ids is None:
+                    missing.append(text)
+                else:
+                    self._cache.move_to_end(text)
+                    found[text] = token_ids
+            hits = sum(text in found for text in normalized)
+            self.hits += hits
+            self.misses += len(normalized) - hits
+
+            if missing:
+                encoded = self.tokenizer(
+                    missing,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_attention_mask=False,
+                    return_token_type_ids=False
+                )["input_ids"]
+                found.update(zip(missing, encoded))
+                self._cache.update(zip(missing, encoded))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [found[text] for text in normalized]
+
+    def collate(self, input_ids: List[List[int]]) -> Dict[str, np.ndarray]:
+        """Pad token ID lists to the longest one as int64 arrays"""
+        longest = max(len(ids) for ids in input_ids)
+        batch = np.full((len(input_ids), longest), self.pad_token_id, dtype=np.int64)
+        mask = np.zeros((len(input_ids), longest), dtype=np.int64)
+        for row, ids in enumerate(input_ids):
+            if self.pad_left:
+                batch[row, longest - len(ids):] = ids
+                mask[row, longest - len(ids):] = 1
+            else:
+                batch[row, :len(ids)] = ids
+                mask[row, :len(ids)] = 1
+        return {"input_ids": batch, "attention_mask": mask}
+
+    def stats(self) -> Dict[str, int]:
+        """Token cache size and hit/miss counters"""
+        return {"size": len(self._cache), "max_size": self.cache_size,
+                "hits": self.hits, "misses": self.misses}
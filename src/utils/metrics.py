@@ -0,0 +1,261 @@
+"""In-process counters, gauges and latency histograms with per-thread shards.
+
+Every thread that records into a metric gets its own shard, and only that
+thread ever writes to it, so recording takes no lock and threads never
+contend (the event loop, inference workers and the broadcaster each keep
+their own). Reads sum the shards; they may miss an update that is in
+flight, which is fine for monitoring. Histograms use fixed log-spaced
+buckets, so percentiles are estimated to within one bucket (about 19%).
+
+Metrics are per process: forked workers start from zero and each reports
+its own numbers.
+"""
+import bisect
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# 0.1 ms .. ~100 s, four buckets per doubling
+LATENCY_BUCKETS = tuple(0.0001 * 2 ** (i / 4) for i in range(81))
+QUANTILES = (0.5, 0.95, 0.99)
+
+Labels = Tuple[str, ...]
+
+
+class _Sharded:
+    """A named metric whose per-thread shards are {label values: state}"""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()  # Only taken when a thread creates its shard
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, Any]] = []
+
+    def _shard(self) -> Dict[Labels, Any]:
+        """This thread's shard, created on first use"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _all_shards(self) -> List[Dict[Labels, Any]]:
+        """Snapshot of the shard list; each shard may still be updated by its thread"""
+        with self._lock:
+            return list(self._shards)
+
+    def reset(self):
+        """Drop all recorded values; threads get fresh shards on next use
+
+        Takes no lock, so it is safe in a forked child where another thread
+        of the parent may have held one.
+        """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+
+
+class Counter(_Sharded):
+    """Monotonic count per label set"""
+
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        """Add amount for these label values"""
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> Dict[Labels, float]:
+        """Total per label set across threads"""
+        totals: Dict[Labels, float] = {}
+        for shard in self._all_shards():
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+
+class Gauge(Counter):
+    """Value that goes up and down (e.g. requests in flight)"""
+
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        """Subtract amount for these label values"""
+        self.inc(labels, -amount)
+
+
+class Histogram(_Sharded):
+    """Observation counts per bucket, plus sum and count, per label set"""
+
+    kind = "summary"  # Exposed to Prometheus as quantiles
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, labels: Labels = ()):
+        """Record one observation (seconds, for latencies)"""
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [bucket counts (last one is +Inf), sum, count]
+            state = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def values(self) -> Dict[Labels, Tuple[List[int], float, int]]:
+        """Merged (bucket counts, sum, count) per label set across threads"""
+        merged: Dict[Labels, Tuple[List[int], float, int]] = {}
+        for shard in self._all_shards():
+            for labels, (counts, total, count) in list(shard.items()):
+                if labels not in merged:
+                    merged[labels] = ([0] * len(counts), 0.0, 0)
+                buckets, merged_total, merged_count = merged[labels]
+                for i, n in enumerate(counts):
+                    buckets[i] += n
+                merged[labels] = (buckets, merged_total + total, merged_count + count)
+        return merged
+
+    def quantile(self, counts: List[int], q: float) -> float:
+        """Estimate a quantile by interpolating inside the bucket that holds it"""
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, n in enumerate(counts):
+            if n and seen + n >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+    def summary(self, labels: Labels = ()) -> Dict[str, float]:
+        """Count, mean and p50/p95/p99 in milliseconds for one label set"""
+        counts, total, count = self.values().get(labels, ([], 0.0, 0))
+        return self.summarize(counts, total, count)
+
+    def summarize(self, counts: List[int], total: float, count: int) -> Dict[str, float]:
+        """Count, mean and p50/p95/p99 in milliseconds from merged values"""
+        result = {"count": count, "mean_ms": round(total / count * 1000, 3) if count else 0.0}
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}_ms"] = round(self.quantile(counts, q) * 1000, 3)
+        return result
+
+
+def _escape(value: Any) -> str:
+    """Label value with backslashes, quotes and newlines escaped"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Labels, extra: str = "") -> str:
+    """Prometheus label block, e.g. {method="GET",path="/api/tweets"}"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Sample value as Prometheus text"""
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that report other components' counters at read time"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Sharded] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Iterable[str], **kwargs):
+        """The metric registered under name, created on first request"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Counter registered under name"""
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Gauge registered under name"""
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        """Histogram registered under name"""
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]):
+        """Register collector() -> [(name, type, help, labels, value)], called on every render"""
+        self._collectors.append(collector)
+
+    def reset(self):
+        """Zero every metric; lock-free like _Sharded.reset, for forked children"""
+        self._lock = threading.Lock()
+        for metric in list(self._metrics.values()):
+            metric.reset()
+        self.started_at = time.time()
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                for labels, (counts, total, count) in sorted(metric.values().items()):
+                    for q in QUANTILES:
+                        label_block = _format_labels(metric.labelnames, labels, f'quantile="{q}"')
+                        lines.append(f"{metric.name}{label_block} {_format_value(metric.quantile(counts, q))}")
+                    label_block = _format_labels(metric.labelnames, labels)
+                    lines.append(f"{metric.name}_sum{label_block} {_format_value(total)}")
+                    lines.append(f"{metric.name}_count{label_block} {count}")
+            else:
+                for labels, value in sorted(metric.values().items()):
+                    lines.append(f"{metric.name}{_format_labels(metric.labelnames, labels)} {_format_value(value)}")
+
+        # Samples of one name must be contiguous, whichever collector reported them
+        collected: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception:
+                continue
+            for name, kind, help, labels, value in samples:
+                label_block = _format_labels(tuple(labels), tuple(labels.values()))
+                collected.setdefault(name, (kind, help, []))[2].append(
+                    f"{name}{label_block} {_format_value(value)}"
+                )
+        for name, (kind, help, samples) in collected.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+# Singleton instance
+metrics = MetricsRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=metrics.reset)
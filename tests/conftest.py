@@ -0,0 +1,42 @@
+"""Shared fixtures: a tiny randomly initialized sentiment model built offline."""
+import re
+
+import pytest
+
+from src.config import twitter_config
+from src.models.evaluation import LABELED_SAMPLES
+
+LABELS = {0: "negative", 1: "neutral", 2: "positive"}
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """Directory with a 2-layer BERT classifier and a word-level tokenizer, loadable by SentimentAnalyzer"""
+    torch = pytest.importorskip("torch")
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+    from transformers import BertConfig, BertForSequenceClassification, PreTrainedTokenizerFast
+
+    path = tmp_path_factory.mktemp("tiny-model")
+    texts = [text for text, _ in LABELED_SAMPLES] + list(twitter_config.MOCK_TWEETS)
+    words = sorted({word for text in texts for word in re.findall(r"\w+|[^\w\s]", text)})
+    vocab = {token: i for i, token in enumerate(["[PAD]", "[UNK]", "[CLS]", "[SEP]", *words])}
+
+    backend = Tokenizer(models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)]
+    )
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, pad_token="[PAD]", unk_token="[UNK]", cls_token="[CLS]", sep_token="[SEP]",
+        model_input_names=["input_ids", "attention_mask"]
+    )
+    tokenizer.save_pretrained(path)
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=64, intermediate_size=128, num_hidden_layers=2,
+        num_attention_heads=2, max_position_embeddings=512, num_labels=3,
+        id2label=LABELS, label2id={label: i for i, label in LABELS.items()}
+    )
+    BertForSequenceClassification(config).eval().save_pretrained(path)
+    return str(path)
@@ -0,0 +1,191 @@
+"""AsyncTwitterCollector against the replay server, in process through httpx.ASGITransport."""
+import asyncio
+
+import httpx
+import pytest
+
+from src.config import twitter_config
+from src.data.async_collector import SEARCH_RECENT, AsyncTwitterCollector, FetchRetriesExhausted
+from src.data.parquet_store import ParquetTweetStore
+from src.data.replay_server import build_synthetic_fixture, create_app
+from src.data.tweet_db import TweetDatabase
+from src.models.sentiment_analyzer import sentiment_analyzer
+
+QUERY = "AI"
+PAGES = 3
+PER_PAGE = 10
+
+
+@pytest.fixture(autouse=True)
+def fake_scores(monkeypatch):
+    """Score without loading a model; the collector, not the model, is under test"""
+    monkeypatch.setattr(
+        sentiment_analyzer, "analyze_batch",
+        lambda texts, *args, **kwargs: [{"label": "neutral", "score": 0.9, "text": text} for text in texts]
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    return TweetDatabase(str(tmp_path / "tweets.sqlite"))
+
+
+def collector_for(app, db, **kwargs) -> AsyncTwitterCollector:
+    return AsyncTwitterCollector(
+        base_url="http://replay", bearer_token="test", transport=httpx.ASGITransport(app), db=db, **kwargs
+    )
+
+
+def run_search(app, db, **kwargs):
+    """All pages of QUERY and the collector that fetched them"""
+    async def search():
+        async with collector_for(app, db, **kwargs) as collector:
+            return [page async for page in collector.search(QUERY)], collector
+    return asyncio.run(search())
+
+
+def run_collect(app, db, sink=None, **kwargs):
+    async def collect():
+        async with collector_for(app, db, **kwargs) as collector:
+            return await collector.collect([QUERY], sink)
+    return asyncio.run(collect())
+
+
+def test_search_follows_pagination_through_injected_429s(db):
+    app = create_app(build_synthetic_fixture([QUERY], PAGES, PER_PAGE), limit=100, window_seconds=60, inject_429=2)
+    pages, collector = run_search(app, db)
+
+    assert len(pages) == PAGES
+    ids = [tweet["id"] for page in pages for tweet in page]
+    assert len(set(ids)) == PAGES * PER_PAGE
+    assert all(tweet["query"] == QUERY for page in pages for tweet in page)
+
+    assert collector.pages == PAGES
+    assert collector.rate_limited == 2
+    assert collector.retries == 2
+    assert collector.requests == PAGES + 2
+    assert app.state.stats == {"requests": PAGES + 2, "served": PAGES, "rate_limited": 2, "misses": 0}
+
+    # The bucket follows the server's headers: its limit, and what is left of the window
+    bucket = collector.buckets[SEARCH_RECENT].stats()
+    assert bucket["capacity"] == 100
+    assert bucket["tokens"] == 100 - (PAGES + 2)
+    assert bucket["waited_seconds"] > 0  # Parked until the injected 429s' reset
+
+
+def test_search_waits_for_the_window_instead_of_hitting_429(db):
+    app = create_app(build_synthetic_fixture([QUERY], 6, PER_PAGE), limit=3, window_seconds=1)
+    pages, collector = run_search(app, db)
+
+    assert len(pages) == 6
+    assert collector.rate_limited == 0
+    assert app.state.stats["rate_limited"] == 0
+    assert collector.buckets[SEARCH_RECENT].stats()["waited_seconds"] > 0
+
+
+def test_collect_advances_watermark_and_fetches_only_newer_tweets(db):
+    app = create_app(build_synthetic_fixture([QUERY], PAGES, PER_PAGE), limit=100, window_seconds=60)
+    first = run_collect(app, db, db.insert_many)
+
+    assert first["tweets_scored"] == PAGES * PER_PAGE
+    assert db.count() == PAGES * PER_PAGE
+    newest = max((tweet["id"] for tweet in db.query(limit=100)), key=int)
+    assert db.get_watermark(QUERY) == newest
+    assert first["watermarks"] == {QUERY: newest}
+
+    second = run_collect(app, db, db.insert_many)
+    assert second["tweets_fetched"] == 0
+    assert second["pages"] == 1
+
+
+def test_watermark_holds_when_max_pages_cuts_pagination_short(db):
+    app = create_app(build_synthetic_fixture([QUERY], PAGES, PER_PAGE), limit=100, window_seconds=60)
+    capped = run_collect(app, db, db.insert_many, max_pages=PAGES - 1)
+
+    assert capped["pages"] == PAGES - 1
+    assert db.count() == (PAGES - 1) * PER_PAGE
+    # Advancing here would skip the unfetched last page on every later run
+    assert db.get_watermark(QUERY) is None
+    assert capped["watermarks"] == {}
+
+    full = run_collect(app, db, db.insert_many)
+    assert db.count() == PAGES * PER_PAGE
+    assert full["duplicates_skipped"] == (PAGES - 1) * PER_PAGE
+    assert db.get_watermark(QUERY) is not None
+
+
+def test_watermark_holds_when_persisting_fails(db):
+    app = create_app(build_synthetic_fixture([QUERY], PAGES, PER_PAGE), limit=100, window_seconds=60)
+
+    def failing_sink(tweets):
+        raise OSError("disk full")
+
+    summary = run_collect(app, db, failing_sink)
+    assert summary["failed_queries"] == [QUERY]
+    assert summary["pipeline"]["stages"]["persist"]["errors"] > 0
+    assert db.get_watermark(QUERY) is None
+
+
+def test_same_text_tweets_are_all_stored_with_one_sentiment(db, monkeypatch):
+    fixture = build_synthetic_fixture([QUERY], PAGES, PER_PAGE)
+    pages = fixture["endpoints"][SEARCH_RECENT]
+    repeated = pages[0]["body"]["data"][0]["text"]
+    for page in pages:
+        page["body"]["data"][-1]["text"] = repeated  # Retweets: same text, their own ids
+    scored_texts = []
+
+    def analyze_batch(texts, *args, **kwargs):
+        scored_texts.extend(texts)
+        return [{"label": "positive" if i % 2 else "negative", "score": 0.9} for i, _ in enumerate(texts)]
+
+    monkeypatch.setattr(sentiment_analyzer, "analyze_batch", analyze_batch)
+    app = create_app(fixture, limit=100, window_seconds=60)
+    summary = run_collect(app, db, db.insert_many)
+
+    assert db.count() == PAGES * PER_PAGE
+    copies = [tweet for tweet in db.query(limit=100) if tweet["text"] == repeated]
+    assert len(copies) == PAGES + 1
+    assert len({tweet["id"] for tweet in copies}) == PAGES + 1
+    assert len({tweet["sentiment"] for tweet in copies}) == 1
+    assert scored_texts.count(repeated) == 1
+    assert summary["repeats_reused"] == PAGES
+    assert summary["dropped_before_inference"] == 0
+
+
+def test_collect_stores_to_the_archive_and_newest_reads_it_back(db, tmp_path):
+    app = create_app(build_synthetic_fixture([QUERY], PAGES, PER_PAGE), limit=100, window_seconds=60)
+    archive = ParquetTweetStore(str(tmp_path / "archive"))
+
+    async def collect():
+        async with collector_for(app, db, archive=archive) as collector:
+            return await collector.collect([QUERY], collector.store)
+    summary = asyncio.run(collect())
+
+    assert summary["tweets_scored"] == PAGES * PER_PAGE
+    assert db.count() == PAGES * PER_PAGE
+    # Everything stored was archived once, under its query's partition
+    archived, counts = archive.newest(100, columns=["id", "query"])
+    assert sorted(archived.column("id").to_pylist()) == sorted(tweet["id"] for tweet in db.query(limit=100))
+    assert set(archived.column("query").to_pylist()) == {QUERY}
+    assert counts == {"neutral": PAGES * PER_PAGE}
+
+    newest, _ = archive.newest(5, columns=["created_at"])
+    created = newest.column("created_at").to_pylist()
+    assert len(created) == 5
+    assert created == sorted(created, reverse=True)
+    assert created[0] == max(archived_row["created_at"] for archived_row in archive.newest(100)[0].to_pylist())
+    assert db.get_watermark(QUERY) is not None
+
+
+def test_retries_exhausted_on_server_errors_names_the_last_failure(db, monkeypatch):
+    monkeypatch.setattr(twitter_config, "COLLECTOR_MAX_RETRIES", 1)
+    monkeypatch.setattr("src.data.async_collector.random.uniform", lambda low, high: 0.0)  # No backoff sleeps
+    always_503 = httpx.MockTransport(lambda request: httpx.Response(503))
+    collector = AsyncTwitterCollector(base_url="http://replay", bearer_token="test", transport=always_503, db=db)
+
+    async def search():
+        async with collector:
+            return [page async for page in collector.search(QUERY)]
+
+    with pytest.raises(FetchRetriesExhausted, match="HTTP 503"):
+        asyncio.run(search())
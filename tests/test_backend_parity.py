@@ -0,0 +1,40 @@
+"""The onnx backend must predict what the torch backend predicts."""
+import pytest
+
+from src.models.evaluation import compare_models
+from src.models.sentiment_analyzer import SentimentAnalyzer
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+pytest.importorskip("onnxscript")
+
+TOLERANCE = 1e-4
+
+
+@pytest.fixture(scope="module")
+def analyzers(tiny_model_dir, tmp_path_factory):
+    """Torch analyzer on the tiny model and onnx analyzer on its export"""
+    torch_analyzer = SentimentAnalyzer(tiny_model_dir, backend="torch")
+    onnx_dir = tmp_path_factory.mktemp("tiny-onnx")
+    torch_analyzer.export_onnx(str(onnx_dir))
+
+    onnx_analyzer = SentimentAnalyzer(str(onnx_dir), backend="onnx")
+    onnx_analyzer.load()
+    return torch_analyzer, onnx_analyzer
+
+
+def test_labels_and_scores_match(analyzers):
+    parity = compare_models(*analyzers)
+    assert parity["agreement"] == 1.0, parity["disagreements"]
+    assert parity["max_score_diff"] <= TOLERANCE
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 32])
+def test_parity_holds_across_padded_batch_sizes(analyzers, batch_size):
+    torch_analyzer, onnx_analyzer = analyzers
+    texts = ["ok", "This is a much longer text about machine learning models and AI research."] * 3
+    expected = torch_analyzer._analyze_uncached(texts, batch_size)
+    actual = onnx_analyzer._analyze_uncached(texts, batch_size)
+    assert [r["label"] for r in actual] == [r["label"] for r in expected]
+    for e, a in zip(expected, actual):
+        assert a["score"] == pytest.approx(e["score"], abs=TOLERANCE)
@@ -0,0 +1,44 @@
+"""MicroBatcher failure handling: pool saturation is backpressure, not an error."""
+import asyncio
+import logging
+
+from src.api.batcher import MicroBatcher
+from src.api.inference_pool import PoolSaturatedError
+
+
+def run_batch(process_batch):
+    """Submit two texts as one batch; returns the batcher and each submit's outcome"""
+    async def run():
+        batcher = MicroBatcher(process_batch, max_batch_size=2, max_wait_ms=50)
+        await batcher.start()
+        try:
+            outcomes = await asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True)
+        finally:
+            await batcher.stop()
+        return batcher, outcomes
+    return asyncio.run(run())
+
+
+def test_saturated_pool_is_counted_and_not_logged_as_an_error(caplog):
+    async def saturated(texts):
+        raise PoolSaturatedError("8 inference jobs already pending")
+
+    with caplog.at_level(logging.DEBUG):
+        batcher, outcomes = run_batch(saturated)
+
+    assert all(isinstance(outcome, PoolSaturatedError) for outcome in outcomes)
+    assert batcher.stats()["saturated_batches"] == 1
+    assert not [record for record in caplog.records if record.levelno >= logging.WARNING]
+
+
+def test_inference_failures_are_still_errors(caplog):
+    error = RuntimeError("model crashed")
+
+    async def failing(texts):
+        raise error
+
+    batcher, outcomes = run_batch(failing)
+
+    assert outcomes == [error, error]
+    assert batcher.stats()["saturated_batches"] == 0
+    assert any(record.levelno == logging.ERROR for record in caplog.records)
@@ -0,0 +1,82 @@
+"""ParquetTweetStore: newest-first reads, the empty-query partition and compaction recovery."""
+import json
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib.parse import unquote
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.data.parquet_store import NO_QUERY, TWEET_SCHEMA, ParquetTweetStore
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc)
+    return [{
+        "id": str(i),
+        "text": "t",
+        "author_id": "1",
+        "created_at": now - timedelta(seconds=rng.randint(0, 10**6)),
+        "sentiment": rng.choice(["positive", "neutral", "negative"]),
+        "confidence": 0.5,
+        "query": rng.choice(["AI", ""]),
+        "retweets": 1,
+        "likes": 2,
+        "replies": 0
+    } for i in range(3000)]
+
+
+@pytest.fixture
+def store(tmp_path, rows):
+    store = ParquetTweetStore(str(tmp_path / "archive"))
+    for start in range(0, len(rows), 500):
+        store.append(rows[start:start + 500])
+    return store
+
+
+def newest_ids(rows, limit):
+    return [row["id"] for row in sorted(rows, key=lambda row: row["created_at"], reverse=True)[:limit]]
+
+
+def test_newest_returns_top_rows_and_counts_in_one_scan(store, rows):
+    table, counts = store.newest(7)
+    assert table.column("id").to_pylist() == newest_ids(rows, 7)
+    assert counts == dict(Counter(row["sentiment"] for row in rows))
+
+
+def test_empty_query_lands_in_an_explicit_partition(store, rows):
+    assert f"query={NO_QUERY}" in {unquote(part.name) for part in store.partitions()}
+
+    table, _ = store.newest(5, columns=["id"], filter=store.build_filter(query=""))
+    assert table.column_names == ["id"]
+    assert table.column("id").to_pylist() == newest_ids([row for row in rows if not row["query"]], 5)
+
+
+def test_compact_finishes_a_run_interrupted_after_the_rename(store, rows):
+    # Crash after os.replace, before the sources were unlinked: their rows are stored twice
+    part = store.partitions()[0]
+    sources = sorted(part.glob("*.parquet"))
+    pq.write_table(
+        pa.concat_tables([pq.read_table(source, schema=TWEET_SCHEMA) for source in sources]),
+        part / "compacted-x.parquet"
+    )
+    (part / ".compact-x.json").write_text(json.dumps({
+        "target": "compacted-x.parquet",
+        "temp": ".compacted-x.parquet.tmp",
+        "sources": [source.name for source in sources]
+    }))
+
+    store.compact()
+    assert store.stats()["rows"] == len(rows)
+    assert not list(part.glob(".compact-*.json"))
+    assert store.newest(7)[0].column("id").to_pylist() == newest_ids(rows, 7)
+
+
+def test_newest_on_an_empty_store(tmp_path):
+    table, counts = ParquetTweetStore(str(tmp_path / "none")).newest(3, columns=["id"])
+    assert table.num_rows == 0
+    assert counts == {}
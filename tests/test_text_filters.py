@@ -0,0 +1,74 @@
+"""Query language operators and the pre-inference filter rules."""
+from src.data.text_filters import PreInferenceFilter, with_language
+
+
+def test_with_language_wraps_or_queries_and_keeps_existing_operators():
+    assert with_language("AI OR ML", "en") == "(AI OR ML) lang:en"
+    assert with_language("AI lang:fr", "en") == "AI lang:fr"
+    assert with_language("AI", "") == "AI"
+
+
+def test_each_rule_drops_and_counts():
+    prefilter = PreInferenceFilter(language="en", min_chars=5)
+    tweets = [
+        {"text": "Machine learning is great", "lang": "en"},
+        {"text": "Aprendizaje automático", "lang": "es"},
+        {"text": "   "},
+        {"text": "https://t.co/abc"},
+        {"text": "@bob ok"},
+        {"text": "Machine  learning is great"},  # A repeat is a tweet of its own, so it is kept
+    ]
+    kept = prefilter.filter(tweets)
+
+    assert kept == [tweets[0], tweets[5]]
+    stats = prefilter.stats()
+    assert stats["checked"] == 6
+    assert {rule: counts["dropped"] for rule, counts in stats["rules"].items()} == {
+        "language": 1, "empty": 1, "url_only": 1, "too_short": 1
+    }
+
+
+def fake_analyzer(calls):
+    """analyze_batch stand-in giving each text it sees a new label, so reuse is visible"""
+    def analyze(texts):
+        calls.append(list(texts))
+        return [{"label": f"label-{sum(map(len, calls))}-{i}", "score": 0.9} for i in range(len(texts))]
+    return analyze
+
+
+def test_same_text_tweets_are_both_kept_with_the_first_result():
+    prefilter = PreInferenceFilter(language="en")
+    tweets = [
+        {"id": "1", "text": "Deep learning models keep improving"},
+        {"id": "2", "text": "Something else entirely"},
+        {"id": "3", "text": "Deep learning  models keep improving"},  # Retweet of 1
+    ]
+    calls = []
+    kept = prefilter.filter(tweets)
+    results = prefilter.score([tweet["text"] for tweet in kept], fake_analyzer(calls))
+
+    assert [tweet["id"] for tweet in kept] == ["1", "2", "3"]
+    assert results[0] == results[2] != results[1]
+    assert calls == [[tweets[0]["text"], tweets[1]["text"]]]
+
+    # A later batch of the same run reuses the result too
+    assert prefilter.score([tweets[2]["text"]], fake_analyzer(calls)) == [results[0]]
+    assert len(calls) == 1
+    stats = prefilter.stats()
+    assert stats["dropped"] == 0
+    assert stats["duplicates"]["reused"] == 2
+    assert stats["inference_saved"] == 2
+
+
+def test_results_are_reused_within_a_run_only_and_errors_are_retried():
+    prefilter = PreInferenceFilter(language="en")
+    text = "Deep learning models keep improving"
+    calls = []
+    assert prefilter.score([text], lambda texts: [{"label": "ERROR", "score": 0.0} for _ in texts])
+    prefilter.score([text], fake_analyzer(calls))
+    assert len(calls) == 1
+
+    prefilter.reset_run()
+    prefilter.score([text], fake_analyzer(calls))
+    assert len(calls) == 2
+    assert prefilter.stats()["duplicates"]["reused"] == 0
@@ -0,0 +1,28 @@
+"""The shared TwitterClient is built on first use, not when the module is imported."""
+import importlib
+
+import pytest
+
+import src.data.twitter_client as twitter_client_module
+from src.config import twitter_config
+
+
+@pytest.fixture
+def fresh_module(monkeypatch):
+    monkeypatch.setattr(twitter_config, "BEARER_TOKEN", None)
+    module = importlib.reload(twitter_client_module)
+    yield module
+    module._twitter_client = None
+
+
+def test_import_does_not_authenticate(fresh_module):
+    assert fresh_module._twitter_client is None
+    with pytest.raises(ValueError, match="TWITTER_BEARER_TOKEN"):
+        fresh_module.get_twitter_client()
+
+
+def test_client_is_created_once(fresh_module, monkeypatch):
+    monkeypatch.setattr(twitter_config, "BEARER_TOKEN", "test")
+    client = fresh_module.get_twitter_client()
+    assert fresh_module.get_twitter_client() is client
+    assert fresh_module.twitter_client is client